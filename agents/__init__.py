@@ -1,5 +1,27 @@
-from .planner import planner_node
-from .retriever import retriever_node
-from .assemble2 import assembler_node
-from .reviewer import reviewer_node
-from .state import AgentState
+# Node modules are imported on first attribute access so that `import agents` (or just
+# agents.state / agents.config) does not pull in every node and its dependencies.
+import importlib
+
+_EXPORTS = {
+    "planner_node": ".planner",
+    "retriever_node": ".retriever",
+    "assembler_node": ".assemble2",
+    "reviewer_node": ".reviewer",
+    "dispatch_node": ".fanout",
+    "fan_out_slides": ".fanout",
+    "retrieve_node": ".fanout",
+    "allocate_node": ".fanout",
+    "slide_node": ".fanout",
+    "navbar_node": ".fanout",
+    "render_node": ".fanout",
+    "AgentState": ".state",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,70 @@
+import json
+
+def _claim_set(candidate):
+    claim_ids = candidate.get('claim_ids') or []
+    if isinstance(claim_ids, str): # stringified JSON in some index metadata
+        claim_ids = json.loads(claim_ids)
+    return frozenset(claim_ids)
+
+def allocate(slide_candidates, used_groups=(), used_claims=(), per_slide=3, preferred=None):
+    """Assign content groups to every slide at once. Returns one ordered group-id list per slide.
+
+    slide_candidates: per slide, the retrieved candidates ({group_id, score, claim_ids}).
+    preferred: optional per slide group-id list (judge or pre-judge picks). When given for a
+        slide, only those groups are considered for it, in that order of preference.
+
+    A group is assignable while it is unused and still brings at least one claim ID not
+    already on another slide; overlap is tracked in sets of group and claim IDs. Two passes:
+    1. coverage: the most constrained slides (fewest assignable options) pick first, so a
+       slide with a single good group is not starved by a slide that had alternatives;
+    2. fill: remaining slots go to the highest-scoring (slide, group) pairs deck-wide.
+    Slide order only breaks exact ties.
+    """
+    used_groups = set(used_groups)
+    used_claims = set(used_claims)
+    preferred = preferred or [None] * len(slide_candidates)
+
+    options = []
+    for i, candidates in enumerate(slide_candidates):
+        by_id = {c['group_id']: c for c in candidates}
+        if preferred[i] is not None:
+            ranked = [by_id[gid] for gid in dict.fromkeys(preferred[i]) if gid in by_id]
+        else:
+            ranked = sorted(candidates, key=lambda c: (-(c.get('score') or 0.0), c['group_id']))[:per_slide * 3]
+        options.append(ranked)
+    limits = [min(per_slide, len(o)) if preferred[i] is None else len(o) for i, o in enumerate(options)]
+    selected = [[] for _ in slide_candidates]
+
+    def assignable(candidate):
+        claims = _claim_set(candidate)
+        return candidate['group_id'] not in used_groups and (not claims or not claims <= used_claims)
+
+    def assign(i, candidate):
+        selected[i].append(candidate['group_id'])
+        used_groups.add(candidate['group_id'])
+        used_claims.update(_claim_set(candidate))
+
+    # 1. Coverage: one group per slide, most constrained slide first
+    pending = [i for i, o in enumerate(options) if o]
+    while pending:
+        counts = {i: sum(assignable(c) for c in options[i]) for i in pending}
+        i = min(pending, key=lambda i: (counts[i] == 0, counts[i], i))
+        pending.remove(i)
+        best = next((c for c in options[i] if assignable(c)), None)
+        if best is not None:
+            assign(i, best)
+
+    # 2. Fill: best remaining pairs across the deck (preference rank first, then score)
+    pairs = sorted(
+        ((rank, -(c.get('score') or 0.0), i, c) for i, o in enumerate(options) for rank, c in enumerate(o)),
+        key=lambda p: (p[0] if preferred[p[2]] is not None else 0, p[1], p[2], p[3]['group_id'])
+    )
+    for _, _, i, c in pairs:
+        if len(selected[i]) < limits[i] and assignable(c):
+            assign(i, c)
+
+    # Present each slide's groups in its own preference order
+    for i, o in enumerate(options):
+        order = {c['group_id']: n for n, c in enumerate(o)}
+        selected[i].sort(key=order.get)
+    return selected
@@ -0,0 +1,198 @@
+"""Content-addressed artifact store for the payloads pipeline state only references.
+
+Claim metadata, message histories, structured layouts and rendered HTML are written once
+to ARTIFACT_DIR under the SHA-256 of their bytes; state carries the key (plus claim IDs
+and spec hashes), so LangGraph passes around a few hundred bytes per slide instead of
+the payloads themselves. Identical content from another slide, revision or deck maps to
+the same file.
+
+Writes and disk reads refresh a file's mtime, so it doubles as the last-use time: sweep()
+deletes artifacts unused for ARTIFACT_TTL, then the least recently used ones past
+ARTIFACT_MAX_MB. service.py calls maybe_sweep() between decks; main.py and batch.py sweep
+once per run, main.py keeping whatever an interrupted run's checkpoint still references.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from langchain_core.messages import messages_from_dict, messages_to_dict
+from .config import ARTIFACT_DIR, ARTIFACT_MEMORY_ENTRIES, ARTIFACT_TTL, ARTIFACT_MAX_MB, ARTIFACT_SWEEP_INTERVAL
+from .state import ContentRef
+
+class ArtifactStore:
+    """Files named by content hash, two-level fan-out, with a small in-memory LRU of recent reads/writes."""
+
+    def __init__(self, root, memory_entries=ARTIFACT_MEMORY_ENTRIES, ttl=ARTIFACT_TTL,
+                 max_bytes=ARTIFACT_MAX_MB * 1024 * 1024, min_age=600):
+        self.root = root
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.min_age = min_age # the size cap never evicts artifacts used this recently (runs in flight)
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = None
+        self.writes = 0
+        self.dedup_writes = 0
+        self.disk_reads = 0
+        self.swept = 0
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key[2:])
+
+    def _remember(self, key, data):
+        with self._lock:
+            self._memory[key] = data
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def put_bytes(self, data):
+        key = hashlib.sha256(data).hexdigest()
+        path = self.path(key)
+        try:
+            os.utime(path) # in use again: keeps it from the sweep
+            with self._lock:
+                self.dedup_writes += 1
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path) # atomic: readers never see a partial artifact
+            with self._lock:
+                self.writes += 1
+        self._remember(key, data)
+        return key
+
+    def get_bytes(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        with open(self.path(key), "rb") as f:
+            data = f.read()
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+        with self._lock:
+            self.disk_reads += 1
+        self._remember(key, data)
+        return data
+
+    def put_json(self, obj):
+        return self.put_bytes(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode("utf-8"))
+
+    def get_json(self, key):
+        """Decoded fresh on every call, so callers may mutate the result."""
+        return json.loads(self.get_bytes(key))
+
+    def put_text(self, text):
+        return self.put_bytes(text.encode("utf-8"))
+
+    def get_text(self, key):
+        return self.get_bytes(key).decode("utf-8")
+
+    def sweep(self, now=None, keep=()):
+        """Delete artifacts unused for ttl seconds, then the least recently used past max_bytes.
+        Keys in keep (e.g. those a resumable checkpoint references) are never deleted.
+        Returns {"removed", "kept", "bytes"} (bytes still on disk)."""
+        now = time.time() if now is None else now
+        keep = {self.path(key) for key in keep}
+        files = []
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(dirpath, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+        files.sort() # least recently used first
+        total = sum(size for _, size, _ in files)
+        removed = 0
+        for mtime, size, path in files:
+            expired = self.ttl and now - mtime > self.ttl
+            over = self.max_bytes and total > self.max_bytes and now - mtime > self.min_age
+            if not (expired or over):
+                break # every later file was used more recently
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            removed += 1
+            key = os.path.basename(os.path.dirname(path)) + os.path.basename(path)
+            with self._lock:
+                self._memory.pop(key, None)
+        with self._lock:
+            self.swept += removed
+            self._last_sweep = time.monotonic()
+        return {"removed": removed, "kept": len(files) - removed, "bytes": total}
+
+    def maybe_sweep(self, interval=ARTIFACT_SWEEP_INTERVAL):
+        """sweep() unless this store swept less than interval seconds ago. Returns its result or None."""
+        with self._lock:
+            if self._last_sweep is not None and time.monotonic() - self._last_sweep < interval:
+                return None
+            self._last_sweep = time.monotonic() # claimed: concurrent callers skip
+        return self.sweep()
+
+    def stats(self):
+        return {"writes": self.writes, "dedup_writes": self.dedup_writes, "disk_reads": self.disk_reads,
+                "in_memory": len(self._memory), "swept": self.swept}
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ArtifactStore(ARTIFACT_DIR)
+    return _store
+
+def use_store(store):
+    """Replace the process-wide store (tests, or a per-run directory). None resets to ARTIFACT_DIR."""
+    global _store
+    with _store_lock:
+        _store = store
+
+def put_messages(messages):
+    return get_store().put_json(messages_to_dict(messages))
+
+def load_messages(ref):
+    """Message history behind a *_messages_ref (empty for a missing ref)."""
+    return messages_from_dict(get_store().get_json(ref)) if ref else []
+
+def content_ref(group_id, claim_ids, claims):
+    return ContentRef(group_id, tuple(claim_ids), get_store().put_json(claims))
+
+def load_groups(selected_content):
+    """selected_content as {"group_id", "claim_ids", "claims"} dicts (plain dicts pass through)."""
+    groups = []
+    for grp in selected_content or []:
+        if isinstance(grp, ContentRef):
+            grp = {"group_id": grp.group_id, "claim_ids": list(grp.claim_ids),
+                   "claims": get_store().get_json(grp.claims_key)}
+        groups.append(grp)
+    return groups
+
+def load_structured(state):
+    """Structured slides behind state['structured_refs'], in slide order."""
+    return [get_store().get_json(ref) for ref in state.get('structured_refs') or []]
+
+def load_html(state):
+    """Rendered deck: from the artifact store, or from output_path when the assembler streamed to disk."""
+    if state.get('html_ref'):
+        return get_store().get_text(state['html_ref'])
+    if state.get('output_path') and os.path.exists(state['output_path']):
+        with open(state['output_path']) as f:
+            return f.read()
+    return ""
@@ -1,11 +1,20 @@
+import hashlib
 import json
 import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from jinja2 import Environment, FileSystemLoader
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .state import AgentState
+from .config import ASSEMBLER_MAX_WORKERS, DECK_RENDER_MODE
+from .memo import add_savings
+from .artifacts import get_store, load_groups, put_messages
+from .providers import get_llm
+from .tracing import span, bind_context
+from .deck_css import CSS_MARKER, inline_css
 
-llm = ChatOpenAI(model="gpt-5.2", temperature=0)
 
 NAVBAR_GENERATOR_PROMPT = """You are a UX copywriter designed to create concise navigation tabs for a presentation.
 Task: Summarize each of the following slide topics into a SHORT, 1-2 WORD navigation label.
@@ -69,13 +78,84 @@ def generate_navbar_labels(topics, llm):
     except Exception:
         return [t.strip().upper()[:20] for t in topics]
 
-def assembler_node(state: AgentState):
-    print("--- ASSEMBLER 2.0 (Template-Based) ---")
-    plan = state['deck_plan']
-    assembler_history = []
+def structure_slide(index, slide):
+    """Structure one slide's content with the LLM. Returns (slide_data, messages); the nav label is attached later."""
+    topic = slide['page_topic']
+    content_groups = load_groups(slide.get('selected_content'))
     
-    # 1. Load Theme
-    theme_file = "theme.json"
+    print(f"Structuring Slide {index+1}: {topic}")
+    
+    # Flatten Content for LLM
+    raw_content = []
+    for grp in content_groups:
+        for c in grp['claims']:
+            raw_content.append(c)
+            
+    if not raw_content:
+        # Empty slide fallback
+        return {
+            "headline": "No Content Available",
+            "subhead": topic,
+            "layout_class": "grid-cols-1",
+            "content_blocks": []
+        }, []
+
+    # Invoke LLM Structurer
+    msg = f"""
+    Topic: {topic}
+    Raw Content:
+    {json.dumps(raw_content, indent=2)}
+    """
+    
+    messages = [
+        SystemMessage(content=STRUCTURER_PROMPT),
+        HumanMessage(content=msg)
+    ]
+    
+    try:
+        response = get_llm("structurer").invoke(messages)
+        
+        json_str = response.content.replace("```json", "").replace("```", "").strip()
+        # Robust parsing
+        json_start = json_str.find('{')
+        json_end = json_str.rfind('}') + 1
+        if json_start != -1 and json_end != -1:
+            json_str = json_str[json_start:json_end]
+            
+        return json.loads(json_str), messages + [response]
+        
+    except Exception as e:
+        print(f"Error structuring slide {index+1}: {e}")
+        # Fallback
+        return {
+            "headline": "Error Generating Slide",
+            "subhead": topic,
+            "layout_class": "grid-cols-1",
+            "content_blocks": [{"type": "text", "col_span_class": "col-span-1", "content": f"An error occurred: {e}"}]
+        }, []
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DECK_TEMPLATES = {
+    "cdn": "templates/slide_template.html", # Tailwind JIT from cdn.tailwindcss.com, styled in the browser
+    "bundle": "templates/slide_bundle.html", # offline: inline CSS for the used classes, one shared navbar
+}
+
+@lru_cache(maxsize=None)
+def template_environment():
+    """One Jinja environment per process: templates are compiled once, not on every render."""
+    return Environment(loader=FileSystemLoader(ROOT), auto_reload=False)
+
+def get_template(mode=None):
+    return template_environment().get_template(DECK_TEMPLATES[mode or DECK_RENDER_MODE])
+
+def load_theme(theme_file="theme.json"):
+    """Brand theme from theme.json, or the default FRUZAQLA colors."""
     theme = {
         "primary_color": "#00723B",
         "secondary_color": "#0A2342",
@@ -87,98 +167,173 @@ def assembler_node(state: AgentState):
                 theme = json.load(f)
         except Exception:
             pass
+    return theme
 
-    # 2. Navbar Labels
-    topics = [s['page_topic'] for s in plan]
-    navbar_labels = generate_navbar_labels(topics, llm)
-    
-    # 3. Structure Content Per Slide
-    structured_slides = []
-    
-    for i, slide in enumerate(plan):
-        topic = slide['page_topic']
-        content_groups = slide.get('selected_content', [])
-        nav_label = navbar_labels[i]
-        
-        print(f"Structuring Slide {i+1}: {topic}")
-        
-        # Flatten Content for LLM
-        raw_content = []
-        for grp in content_groups:
-            for c in grp['claims']:
-                raw_content.append(c)
-                
-        if not raw_content:
-            # Empty slide fallback
-            structured_slides.append({
-                "nav_label": nav_label,
-                "headline": "No Content Available",
-                "subhead": topic,
-                "layout_class": "grid-cols-1",
-                "content_blocks": []
-            })
-            continue
-
-        # Invoke LLM Structurer
-        msg = f"""
-        Topic: {topic}
-        Raw Content:
-        {json.dumps(raw_content, indent=2)}
-        """
-        
-        messages = [
-            SystemMessage(content=STRUCTURER_PROMPT),
-            HumanMessage(content=msg)
-        ]
-        
-        try:
-            response = llm.invoke(messages)
-            assembler_history.extend(messages + [response])
-            
-            json_str = response.content.replace("```json", "").replace("```", "").strip()
-            # Robust parsing
-            json_start = json_str.find('{')
-            json_end = json_str.rfind('}') + 1
-            if json_start != -1 and json_end != -1:
-                json_str = json_str[json_start:json_end]
-                
-            slide_data = json.loads(json_str)
-            
-            # Enrich with nav data
-            slide_data['nav_label'] = nav_label
-            structured_slides.append(slide_data)
-            
-        except Exception as e:
-            print(f"Error structuring slide {i+1}: {e}")
-            # Fallback
-            structured_slides.append({
-                "nav_label": nav_label,
-                "headline": "Error Generating Slide",
-                "subhead": topic,
-                "layout_class": "grid-cols-1",
-                "content_blocks": [{"type": "text", "col_span_class": "col-span-1", "content": f"An error occurred: {e}"}]
-            })
-
-    # 4. Render with Jinja2
-    print("Rendering HTML with Jinja2...")
-    env = Environment(loader=FileSystemLoader('.'))
-    template = env.get_template('templates/slide_template.html')
-    
-    # Unique Navbar Tabs
+def navbar_memo_key(topics):
+    """slide_memo key of the navbar labels generated for these topics."""
+    return "navbar:" + hashlib.sha256(json.dumps(topics).encode("utf-8")).hexdigest()[:16]
+
+def unique_navbar_tabs(navbar_labels):
+    """Navbar tabs in first-seen order."""
     unique_tabs = []
     seen = set()
     for lbl in navbar_labels:
         if lbl not in seen:
             unique_tabs.append(lbl)
             seen.add(lbl)
+    return unique_tabs
+
+def open_partial(output_path):
+    """A temp file of our own next to output_path, so concurrent renders to one path never share it."""
+    fd, partial_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or ".",
+                                        prefix=f"{os.path.basename(output_path)}.", suffix=".partial")
+    os.chmod(partial_path, 0o644) # mkstemp is owner-only; the deck is swapped in with these bits
+    return os.fdopen(fd, "w"), partial_path
+
+def stream_deck(template, output_path, slides, started_at=None, **context):
+    """Render slides into a '.partial' file as they arrive, then swap it in at output_path atomically."""
+    f, partial_path = open_partial(output_path)
+    flush_times = []
+
+    def flushed(slides, f):
+        # Everything rendered so far hits disk before we block on the next slide
+        slides = iter(slides)
+        while True:
+            f.flush()
+            flush_times.append(time.perf_counter())
+            try:
+                slide = next(slides)
+            except StopIteration:
+                return
+            yield slide
+
+    try:
+        with f:
+            for chunk in template.generate(slides=flushed(slides, f), **context):
+                f.write(chunk)
+        os.replace(partial_path, output_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    if started_at is not None and len(flush_times) > 1:
+        # The flush before slide 2 is waited on is the moment slide 1 is fully on disk
+        print(f"First slide on disk after {flush_times[1] - started_at:.2f}s")
+
+def write_atomically(output_path, text):
+    f, partial_path = open_partial(output_path)
+    try:
+        with f:
+            f.write(text)
+        os.replace(partial_path, output_path)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+def render_bundle(slides, **context):
+    """The offline deck: rendered once, then the CSS for the classes it actually uses is inlined."""
+    html, unknown = inline_css(get_template("bundle").render(slides=slides, css=CSS_MARKER, **context))
+    if unknown:
+        print(f"   No bundled CSS for {len(unknown)} classes: {', '.join(unknown)}")
+    return html
+
+def render_deck(slides, output_path=None, started_at=None, **context):
+    """Render the deck in DECK_RENDER_MODE to output_path (html_ref "") or the artifact store. Returns html_ref."""
+    if DECK_RENDER_MODE == "bundle":
+        # The CSS depends on every slide, so the bundle is rendered whole and written once
+        print(f"Rendering offline HTML bundle{f' to {output_path}' if output_path else ''}...")
+        with span("assembler.render", streamed=False, mode="bundle") as s:
+            html = render_bundle(list(slides), **context)
+            s.set(payload_bytes=len(html))
+            if output_path:
+                write_atomically(output_path, html)
+                return ""
+        return get_store().put_text(html)
+    if output_path:
+        # Streaming mode: slides are flushed to disk in order while later ones are still structuring
+        print(f"Streaming HTML to {output_path}...")
+        with span("assembler.render", streamed=True):
+            stream_deck(get_template(), output_path, slides, started_at=started_at, **context)
+        return ""
+    print("Rendering HTML with Jinja2...")
+    with span("assembler.render", streamed=False) as s:
+        html = get_template().render(slides=list(slides), **context)
+        s.set(payload_bytes=len(html))
+    return get_store().put_text(html)
+
+def assembler_node(state: AgentState):
+    print("--- ASSEMBLER 2.0 (Template-Based) ---")
+    plan = state['deck_plan']
+    assembler_history = []
+    
+    # 1. Load Theme
+    theme = load_theme()
+
+    # 2-3. Navbar labels + per-slide structuring are independent LLM calls: run them together
+    t0 = time.perf_counter()
+    topics = [s['page_topic'] for s in plan]
+    max_workers = max(1, state.get('assembler_max_workers') or ASSEMBLER_MAX_WORKERS)
+    output_path = state.get('output_path')
+    call_times = []
+    structured_refs = [] # the slides themselves are only held while they render
+    memo = dict(state.get('slide_memo') or {})
+    reused = {"llm_calls": 0}
+    store = get_store()
+    navbar_key = navbar_memo_key(topics)
+
+    def structure_or_reuse(i, slide):
+        # Slides unchanged since the last revision keep their structured layout (messages=None marks reuse)
+        entry = memo.get(slide.get('spec_hash') or "", {})
+        if 'structured' in entry:
+            return store.get_json(entry['structured']), None
+        return structure_slide(i, slide)
+
+    def iter_structured_slides(slide_futures, navbar_labels):
+        """Yield structured slides in slide order as soon as each one (and all before it) is done."""
+        for i, future in enumerate(slide_futures):
+            (slide_data, messages), elapsed = future.result()
+            slide_futures[i] = None # the future would keep the slide alive until the pool shuts down
+            spec_hash = plan[i].get('spec_hash')
+            if messages is None:
+                reused['llm_calls'] += 1
+            else:
+                assembler_history.extend(messages)
+                call_times.append(elapsed)
+                if messages and spec_hash:
+                    # Only successful LLM layouts are memoized, never the error fallback
+                    memo[spec_hash] = {**memo.get(spec_hash, {}), 'structured': store.put_json(slide_data)}
+            slide_data['nav_label'] = navbar_labels[i]
+            structured_refs.append(store.put_json(slide_data))
+            yield slide_data
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        if navbar_key in memo:
+            navbar_future = None
+            navbar_labels = memo[navbar_key]
+            reused['llm_calls'] += 1
+        else:
+            navbar_future = pool.submit(bind_context(timed), generate_navbar_labels, topics, get_llm("navbar"))
+        slide_futures = [pool.submit(bind_context(timed), structure_or_reuse, i, slide) for i, slide in enumerate(plan)]
+        if navbar_future is not None:
+            navbar_labels, navbar_time = navbar_future.result()
+            memo[navbar_key] = navbar_labels
+            call_times.append(navbar_time)
+
+        context = {"theme": theme, "navbar_tabs": unique_navbar_tabs(navbar_labels)}
+        slides = iter_structured_slides(slide_futures, navbar_labels)
+
+        # 4. Render with Jinja2
+        html_ref = render_deck(slides, output_path, started_at=t0, **context)
 
-    final_html = template.render(
-        slides=structured_slides,
-        theme=theme,
-        navbar_tabs=unique_tabs
-    )
+    print(f"Assembled {len(plan)} slides in {time.perf_counter() - t0:.2f}s "
+          f"(slowest call {max(call_times, default=0.0):.2f}s, workers={max_workers}, "
+          f"reused {reused['llm_calls']} LLM calls)")
     
     return {
-        "html_output": final_html,
-        "assembler_messages": assembler_history
+        "html_ref": html_ref,
+        "structured_refs": structured_refs,
+        "assembler_messages_ref": put_messages(assembler_history),
+        "slide_memo": memo,
+        "revision_savings": add_savings(state.get('revision_savings'), llm_calls=reused['llm_calls'])
     }
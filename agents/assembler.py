@@ -1,10 +1,15 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .state import AgentState
+from .config import IMAGE_VETTING_MAX_WORKERS, VERDICT_CACHE_PATH
+from .verdict_cache import VerdictCache, image_content_hash
+from .providers import get_llm
+from .artifacts import get_store, load_groups, put_messages
+from .tracing import span, bind_context
+from concurrent.futures import ThreadPoolExecutor
 import json
 import os
 
-llm = ChatOpenAI(model="gpt-5.2", temperature=0)
+verdict_cache = VerdictCache(VERDICT_CACHE_PATH)
 
 
 ASSEMBLER_SYSTEM_PROMPT = """Role: Front-End Developer.
@@ -78,55 +83,68 @@ def generate_navbar_html(active_tab, tabs, theme):
     html += '</div>'
     return html
 
+def vet_image(url):
+    """Vision check for one image URL, answered from the persistent verdict cache when the bytes are unchanged."""
+    with span("image.content_hash", "http", url=url[-60:]):
+        content_hash = image_content_hash(url)
+    cached = verdict_cache.get(url, content_hash)
+    if cached is not None:
+        print(f"    [CACHED] {'Useful' if cached else 'Low-value'} image: {url[-15:]}")
+        return cached
+
+    # 1. Intactness Check (Is URL valid?)
+    # The download above doubles as a HEAD-style check; we still vet on failure
+    # and keep the image by default (Intactness priority).
+    
+    # 2. Permissive Vetting
+    try:
+        msg = HumanMessage(
+            content=[
+                {"type": "text", "text": "Evaluate this image."},
+                {"type": "image_url", "image_url": {"url": url}}
+            ]
+        )
+        messages = [
+            SystemMessage(content=IMAGE_VETTING_PROMPT),
+            msg
+        ]
+        response = get_llm("image_vetter").invoke(messages)
+        content = response.content.replace("```json", "").replace("```", "").strip()
+        result = json.loads(content)
+        is_useful = result.get('useful', False) # Default to False if unclear to respect user wish for exclusion
+    except Exception as e:
+        print(f"    [ERROR] vetting image {url[-15:]}: {e}")
+        # Keep by default on error (Intactness priority), but don't persist the guess
+        return True
+
+    verdict_cache.put(url, content_hash, is_useful)
+    if not is_useful:
+        print(f"    [REJECT] Low-value image (Simple/Banners): {url[-15:]}")
+    else:
+        print(f"    [KEEP] Useful/Intact image: {url[-15:]}")
+    return is_useful
+
 def filter_images(content_groups):
     """Filter out broken/low-value images. Prioritize intactness."""
     print("  - Vetting images (Intactness + Permissive Check)...")
-    checked_urls = {} # Cache URL -> useful (bool)
-    
+    urls = list(dict.fromkeys(
+        claim.get('image_url')
+        for grp in content_groups
+        for claim in grp.get('claims', [])
+        if claim.get('image_url')
+    ))
+    if not urls:
+        return
+
+    # Each URL is vetted once, with bounded concurrency
+    with ThreadPoolExecutor(max_workers=max(1, min(IMAGE_VETTING_MAX_WORKERS, len(urls)))) as pool:
+        checked_urls = dict(zip(urls, pool.map(bind_context(vet_image), urls))) # Cache URL -> useful (bool)
+
     for grp in content_groups:
         for claim in grp.get('claims', []):
             url = claim.get('image_url')
-            if not url:
-                continue
-                
-            if url in checked_urls:
-                if not checked_urls[url]:
-                    claim['image_url'] = None
-                continue
-            
-            # 1. Intactness Check (Is URL valid?)
-            # In a real scenario, we might HEAD request it. 
-            # For now, we assume if it's in Pinecone it's likely valid, 
-            # but let's blindly trust existence implies intactness potential.
-            
-            # 2. Permissive Vetting
-            try:
-                msg = HumanMessage(
-                    content=[
-                        {"type": "text", "text": "Evaluate this image."},
-                        {"type": "image_url", "image_url": {"url": url}}
-                    ]
-                )
-                messages = [
-                    SystemMessage(content=IMAGE_VETTING_PROMPT),
-                    msg
-                ]
-                response = llm.invoke(messages)
-                content = response.content.replace("```json", "").replace("```", "").strip()
-                result = json.loads(content)
-                is_useful = result.get('useful', False) # Default to False if unclear to respect user wish for exclusion
-                
-                checked_urls[url] = is_useful
-                if not is_useful:
-                    print(f"    [REJECT] Low-value image (Simple/Banners): {url[-15:]}")
-                    claim['image_url'] = None
-                else:
-                    print(f"    [KEEP] Useful/Intact image: {url[-15:]}")
-                    
-            except Exception as e:
-                print(f"    [ERROR] vetting image {url[-15:]}: {e}")
-                # Keep by default on error (Intactness priority)
-                checked_urls[url] = True
+            if url and not checked_urls[url]:
+                claim['image_url'] = None
 
 def assembler_node(state: AgentState):
     print("--- ASSEMBLER AGENT (Custom Style & Exact Claims) ---")
@@ -165,7 +183,7 @@ def assembler_node(state: AgentState):
     
     print("Generating concise navbar labels...")
     try:
-        nav_response = llm.invoke(nav_messages)
+        nav_response = get_llm("navbar").invoke(nav_messages)
         content = nav_response.content.replace("```json", "").replace("```", "").strip()
         short_labels = json.loads(content)
         # Ensure length matches
@@ -203,7 +221,7 @@ def assembler_node(state: AgentState):
     for i, slide in enumerate(plan):
         slide_id = slide['slide_id']
         topic = slide['page_topic']
-        content_groups = slide.get('selected_content') 
+        content_groups = load_groups(slide.get('selected_content'))
         
         # Use corresponding short label as active tab
         active_tab = short_labels[i]
@@ -239,7 +257,7 @@ def assembler_node(state: AgentState):
             HumanMessage(content=msg)
         ]
         
-        response = llm.invoke(current_messages)
+        response = get_llm("structurer").invoke(current_messages)
         assembler_history.extend(current_messages + [response])
         
         body_html = response.content.replace("```html", "").replace("```", "").strip()
@@ -257,6 +275,6 @@ def assembler_node(state: AgentState):
     final_output = f"<style>{base_css}</style>\n{full_output_html}"
     
     return {
-        "html_output": final_output,
-        "assembler_messages": assembler_history
+        "html_ref": get_store().put_text(final_output),
+        "assembler_messages_ref": put_messages(assembler_history)
     }
@@ -0,0 +1,77 @@
+import json
+import math
+import re
+from collections import Counter, defaultdict
+
+# Keeps hyphenated / dotted entities whole, so "FRESCO-2" never matches a query for "FRESCO"
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-.][a-z0-9]+)*")
+
+def tokenize(text):
+    return TOKEN_RE.findall((text or "").lower())
+
+class BM25Index:
+    """Okapi BM25 over an in-memory inverted index."""
+
+    def __init__(self, docs, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_ids = list(docs)
+        self.postings = defaultdict(list) # term -> [(doc_idx, tf)]
+        self.doc_lengths = []
+        for idx, doc_id in enumerate(self.doc_ids):
+            terms = tokenize(docs[doc_id])
+            self.doc_lengths.append(len(terms))
+            for term, tf in Counter(terms).items():
+                self.postings[term].append((idx, tf))
+        self.avg_length = (sum(self.doc_lengths) / len(self.doc_lengths)) if self.doc_lengths else 0.0
+
+    def idf(self, term):
+        n = len(self.postings.get(term, ()))
+        return math.log(1 + (len(self.doc_ids) - n + 0.5) / (n + 0.5))
+
+    def search(self, query, top_k=10):
+        """Return [(doc_id, score)] for a keyword string or list of keywords."""
+        if isinstance(query, (list, tuple)):
+            query = " ".join(query)
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            idf = self.idf(term)
+            for idx, tf in self.postings.get(term, ()):
+                norm = 1 - self.b + self.b * self.doc_lengths[idx] / (self.avg_length or 1)
+                scores[idx] += idf * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+        ranked = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:top_k]
+        return [(self.doc_ids[idx], score) for idx, score in ranked]
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse several ranked ID lists. Returns IDs ordered by sum(1 / (k + rank))."""
+    scores = defaultdict(float)
+    first_seen = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (k + rank)
+            first_seen.setdefault(doc_id, len(first_seen))
+    return sorted(scores, key=lambda d: (-scores[d], first_seen[d]))
+
+def build_group_bm25(group_index, claim_store=None):
+    """BM25 over group descriptions (+ claim text when a claim store is available).
+
+    Returns the index and a group_id -> candidate dict map in the retriever's candidate format.
+    """
+    docs, groups = {}, {}
+    for metadata in group_index.metadata:
+        gid = metadata["group_id"]
+        claim_ids = metadata.get("claims", [])
+        if isinstance(claim_ids, str):
+            claim_ids = json.loads(claim_ids)
+        text = metadata.get("group_description") or ""
+        if claim_store is not None and claim_ids:
+            records = claim_store.get_many(claim_ids)
+            text += " " + " ".join(r.claim_text for r in records.values())
+        docs[gid] = text
+        groups[gid] = {
+            "group_id": gid,
+            "description": metadata.get("group_description"),
+            "claim_ids": claim_ids,
+            "score": None # a lexical-only hit has no vector similarity; the pre-judge sends it to the judge
+        }
+    return BM25Index(docs), groups
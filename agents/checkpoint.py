@@ -0,0 +1,73 @@
+"""SQLite checkpointer so an interrupted deck run can resume from its last completed node.
+
+LangGraph saves a checkpoint after every super-step and the pending writes as each node
+finishes, so a crash in the reviewer (or one structurer call) leaves the planner,
+retriever and assembler results on disk. Resuming re-invokes the graph with the same
+thread_id (the run id) and no input; only the unfinished node runs again. Large payloads
+already live in the artifact store (see artifacts.py), so each checkpoint is a few KiB of
+references. A run that finishes has nothing left to resume: main.py deletes its thread;
+the artifacts of those that did not are kept from the sweep (see live_artifact_keys).
+"""
+import dataclasses
+import os
+import re
+import sqlite3
+import time
+import uuid
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+from langgraph.types import Send
+
+# Custom records that may appear in checkpointed state
+STATE_TYPES = [("agents.state", "ContentRef")]
+ARTIFACT_KEY = re.compile(r"[0-9a-f]{64}")
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+def run_config(run_id):
+    return {"configurable": {"thread_id": run_id}}
+
+class SqliteCheckpointer(SqliteSaver):
+    """LangGraph's SQLite saver on a file path, shared by the graph's worker threads."""
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        super().__init__(sqlite3.connect(path, check_same_thread=False),
+                         serde=JsonPlusSerializer(allowed_msgpack_modules=STATE_TYPES))
+        self.path = path
+
+def _collect_keys(value, keys):
+    if isinstance(value, str):
+        if ARTIFACT_KEY.fullmatch(value):
+            keys.add(value)
+    elif isinstance(value, dict):
+        for v in value.values():
+            _collect_keys(v, keys)
+    elif isinstance(value, (list, tuple, set)):
+        for v in value:
+            _collect_keys(v, keys)
+    elif isinstance(value, Send):
+        _collect_keys(value.arg, keys)
+    elif dataclasses.is_dataclass(value):
+        for field in dataclasses.fields(value):
+            _collect_keys(getattr(value, field.name), keys)
+
+def live_artifact_keys(path):
+    """Artifact keys a resume could still read: those in the latest checkpoint of every thread
+    left in the database at path, and in its pending writes."""
+    if not os.path.exists(path):
+        return set()
+    keys, seen = set(), set()
+    saver = SqliteCheckpointer(path)
+    try:
+        for saved in saver.list(None): # newest first within each thread
+            thread = (saved.config["configurable"]["thread_id"], saved.config["configurable"].get("checkpoint_ns", ""))
+            if thread in seen:
+                continue
+            seen.add(thread)
+            _collect_keys(saved.checkpoint["channel_values"], keys)
+            _collect_keys([value for _, _, value in saved.pending_writes or ()], keys)
+    finally:
+        saver.conn.close()
+    return keys
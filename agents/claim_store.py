@@ -0,0 +1,118 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from .local_index import _field, list_index_ids
+
+class ClaimRecord:
+    """Compact claim metadata. Image URLs are interned since many claims share the same figure."""
+    __slots__ = ("claim_id", "claim_text", "image_url", "extra")
+
+    def __init__(self, claim_id, claim_text, image_url=None, extra=None):
+        self.claim_id = claim_id
+        self.claim_text = claim_text
+        self.image_url = sys.intern(image_url) if image_url else None
+        self.extra = extra or None
+
+    @classmethod
+    def from_metadata(cls, claim_id, metadata):
+        metadata = dict(metadata or {})
+        return cls(
+            claim_id,
+            metadata.pop("claim_text", ""),
+            metadata.pop("image_url", None),
+            metadata
+        )
+
+    def to_dict(self):
+        """Same shape as the Pinecone metadata dict the assemblers consume (a fresh copy each call)."""
+        data = dict(self.extra) if self.extra else {}
+        data["claim_text"] = self.claim_text
+        if self.image_url:
+            data["image_url"] = self.image_url
+        return data
+
+class ClaimStore:
+    """Local SQLite snapshot of content-gen-claim-index with write-through on Pinecone misses.
+
+    The database is opened on first use and records are loaded into memory only as they
+    are requested.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._records = {}
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS claims (claim_id TEXT PRIMARY KEY, claim_text TEXT, "
+                "image_url TEXT, extra TEXT, fetched_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get_many(self, claim_ids):
+        """Return {claim_id: ClaimRecord} for the IDs present locally."""
+        with self._lock:
+            found = {cid: self._records[cid] for cid in claim_ids if cid in self._records}
+            missing = [cid for cid in dict.fromkeys(claim_ids) if cid not in found]
+            if missing:
+                rows = self._db().execute(
+                    f"SELECT claim_id, claim_text, image_url, extra FROM claims "
+                    f"WHERE claim_id IN ({','.join('?' * len(missing))})", missing
+                ).fetchall()
+                for cid, text, url, extra in rows:
+                    record = ClaimRecord(cid, text, url, json.loads(extra) if extra else None)
+                    self._records[cid] = found[cid] = record
+        return found
+
+    def put_many(self, metadata_by_id):
+        """Insert/replace claims from Pinecone metadata dicts."""
+        records = [ClaimRecord.from_metadata(cid, meta) for cid, meta in metadata_by_id.items()]
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                "INSERT OR REPLACE INTO claims VALUES (?, ?, ?, ?, ?)",
+                [(r.claim_id, r.claim_text, r.image_url, json.dumps(r.extra) if r.extra else None, now)
+                 for r in records]
+            )
+            db.commit()
+            for r in records:
+                self._records[r.claim_id] = r
+        return records
+
+    def fetch_from_index(self, index, claim_ids, batch_size=100):
+        """Fetch claims from Pinecone and write them through to the store."""
+        fetched = {}
+        for i in range(0, len(claim_ids), batch_size):
+            response = index.fetch(ids=claim_ids[i:i + batch_size])
+            for cid, vec in (_field(response, "vectors") or {}).items():
+                fetched[cid] = _field(vec, "metadata")
+        return {r.claim_id: r for r in self.put_many(fetched)}
+
+    def refresh(self, index, max_age=None):
+        """Incremental sync: fetch new (or older than max_age seconds) claims, drop deleted ones."""
+        remote_ids = set(list_index_ids(index))
+        with self._lock:
+            rows = self._db().execute("SELECT claim_id, fetched_at FROM claims").fetchall()
+        local = dict(rows)
+        cutoff = time.time() - max_age if max_age is not None else None
+        to_fetch = [cid for cid in remote_ids if cid not in local or (cutoff and local[cid] < cutoff)]
+        removed = [cid for cid in local if cid not in remote_ids]
+
+        self.fetch_from_index(index, sorted(to_fetch))
+        if removed:
+            with self._lock:
+                db = self._db()
+                db.executemany("DELETE FROM claims WHERE claim_id = ?", [(cid,) for cid in removed])
+                db.commit()
+                for cid in removed:
+                    self._records.pop(cid, None)
+        return {"fetched": len(to_fetch), "removed": len(removed), "total": len(remote_ids)}
@@ -0,0 +1,98 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def env_flag(name, default):
+    """Read a boolean setting ("1"/"true"/"yes" are truthy)."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+def env_int(name, default):
+    """Read an integer setting from the environment."""
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+# Graph
+# Run each slide through its own retrieve -> dedup -> structure branch (LangGraph Send) instead of
+# deck-wide retriever and assembler stages
+SLIDE_FANOUT = env_flag("SLIDE_FANOUT", False)
+FANOUT_MAX_BRANCHES = env_int("FANOUT_MAX_BRANCHES", 16) # Slide branches running at once
+
+# Planner
+# Stream the plan and start each slide's retrieval as soon as its JSON object is complete.
+# Streamed calls bypass the LLM response cache.
+PLANNER_STREAMING = env_flag("PLANNER_STREAMING", False)
+
+# Retriever
+RETRIEVER_MAX_WORKERS = env_int("RETRIEVER_MAX_WORKERS", 4) # 1 = serial retrieval
+EMBED_BATCH_SIZE = env_int("EMBED_BATCH_SIZE", 64) # Max texts per embed_documents call
+GROUP_SEARCH_TOP_K = env_int("GROUP_SEARCH_TOP_K", 5) # Group candidates per candidate query
+GROUP_INDEX_BACKEND = os.getenv("GROUP_INDEX_BACKEND", "pinecone") # "pinecone" | "local"
+CLAIM_STORE_BACKEND = os.getenv("CLAIM_STORE_BACKEND", "pinecone") # "pinecone" | "local"
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "vector") # "vector" | "hybrid" (vector + BM25_keywords)
+HYBRID_MAX_CANDIDATES = env_int("HYBRID_MAX_CANDIDATES", 6) # Candidates sent to the judge after fusion
+BM25_TOP_K = env_int("BM25_TOP_K", 10)
+RRF_K = env_int("RRF_K", 60)
+# How judged groups are assigned to slides:
+# "deck_judge" (one judge call for all ambiguous slides, then a deck-wide assignment pass),
+# "optimizer" (deck-wide assignment over retrieval scores, no judge LLM) or
+# "slide" (one judge call per slide, deduplicated greedily in slide order)
+ALLOCATION_MODE = os.getenv("ALLOCATION_MODE", "deck_judge")
+GROUPS_PER_SLIDE = env_int("GROUPS_PER_SLIDE", 3)
+# Deterministic pre-judge: accept candidates without the judge LLM when the choice is clear.
+# "on" | "off" | "shadow" (always call the judge, but record what the pre-judge would have done)
+PREJUDGE_MODE = os.getenv("PREJUDGE_MODE", "on")
+PREJUDGE_MAX_CANDIDATES = env_int("PREJUDGE_MAX_CANDIDATES", 3) # Accept all when at most this many pass
+PREJUDGE_PICK = env_int("PREJUDGE_PICK", 3) # Groups taken on a clear margin (the judge's "top 3")
+PREJUDGE_MIN_MARGIN = float(os.getenv("PREJUDGE_MIN_MARGIN", "0.1")) # Score gap after the PICK-th candidate
+JUDGE_RECORD_PATH = os.getenv("JUDGE_RECORD_PATH", "") # Append judge decisions as JSONL (for bench_prejudge)
+
+# Assembler
+ASSEMBLER_MAX_WORKERS = env_int("ASSEMBLER_MAX_WORKERS", 6) # Navbar + structurer calls in flight; 1 = serial
+IMAGE_VETTING_MAX_WORKERS = env_int("IMAGE_VETTING_MAX_WORKERS", 4)
+DECK_RENDER_MODE = os.getenv("DECK_RENDER_MODE", "cdn") # "cdn" | "bundle" (offline HTML, CSS for the used classes only)
+
+# Reviewer
+REVIEWER_INPUT = os.getenv("REVIEWER_INPUT", "digest") # "digest" | "html"
+REVIEW_DIGEST_MAX_TOKENS = env_int("REVIEW_DIGEST_MAX_TOKENS", 4000)
+
+# LLM transport: one pooled HTTP client and one limiter shared by every agent
+LLM_RPM = env_int("LLM_RPM", 500) # Provider requests-per-minute limit
+LLM_TPM = env_int("LLM_TPM", 200000) # Provider tokens-per-minute limit (prompt + expected completion)
+LLM_EXPECTED_OUTPUT_TOKENS = env_int("LLM_EXPECTED_OUTPUT_TOKENS", 1000) # Reserved per call, settled after
+LLM_MAX_CONCURRENCY = env_int("LLM_MAX_CONCURRENCY", 16) # Adaptive in-flight ceiling; halves on 429
+LLM_MIN_CONCURRENCY = env_int("LLM_MIN_CONCURRENCY", 1)
+LLM_MAX_RETRIES = env_int("LLM_MAX_RETRIES", 5) # Retries after 429 before giving up
+LLM_POOL_CONNECTIONS = env_int("LLM_POOL_CONNECTIONS", 20) # Keep-alive connections in the shared pool
+
+# Caches
+CACHE_DIR = os.getenv("SLIDE_BUILDER_CACHE_DIR", ".cache")
+EMBED_CACHE_ENABLED = env_flag("EMBED_CACHE_ENABLED", True)
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", os.path.join(CACHE_DIR, "embeddings.sqlite"))
+EMBED_CACHE_MAX_ENTRIES = env_int("EMBED_CACHE_MAX_ENTRIES", 20000) # ~120 MB at 3072 float16 dims
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_responses.sqlite"))
+# Agents whose ChatOpenAI responses are cached: "all", "none" or a comma list of
+# planner, judge, navbar, structurer, reviewer (image_vetter never: its verdicts are cached by image content)
+LLM_CACHE_AGENTS = {a.strip() for a in os.getenv("LLM_CACHE_AGENTS", "all").split(",") if a.strip()} - {"none"}
+LLM_CACHE_TTL = env_int("LLM_CACHE_TTL", 7 * 24 * 3600) # seconds; 0 = never expire
+LLM_CACHE_MAX_ENTRIES = env_int("LLM_CACHE_MAX_ENTRIES", 5000)
+VERDICT_CACHE_PATH = os.getenv("VERDICT_CACHE_PATH", os.path.join(CACHE_DIR, "image_verdicts.sqlite"))
+# Content-addressed payloads (claims, message histories, layouts, HTML) that pipeline state only references
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(CACHE_DIR, "artifacts"))
+ARTIFACT_MEMORY_ENTRIES = env_int("ARTIFACT_MEMORY_ENTRIES", 256) # Recently used artifacts kept in memory
+ARTIFACT_TTL = env_int("ARTIFACT_TTL", 3 * 24 * 3600) # seconds since last use; 0 = never expire
+ARTIFACT_MAX_MB = env_int("ARTIFACT_MAX_MB", 2048) # least recently used artifacts go first past this; 0 = no cap
+ARTIFACT_SWEEP_INTERVAL = env_int("ARTIFACT_SWEEP_INTERVAL", 3600) # seconds between sweeps in long-lived processes
+
+# Checkpoints of main.py runs (resume with --resume <run-id>)
+CHECKPOINT_ENABLED = env_flag("CHECKPOINT_ENABLED", True)
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(CACHE_DIR, "checkpoints.sqlite"))
+
+# Local snapshots (see scripts/snapshot_indexes.py)
+GROUP_INDEX_SNAPSHOT = os.getenv("GROUP_INDEX_SNAPSHOT", os.path.join(CACHE_DIR, "group_index"))
+CLAIM_STORE_PATH = os.getenv("CLAIM_STORE_PATH", os.path.join(CACHE_DIR, "claims.sqlite"))
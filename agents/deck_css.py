@@ -0,0 +1,168 @@
+"""Minimal inline CSS for the Tailwind utility classes a rendered deck actually uses.
+
+The CDN build of Tailwind ships a JIT compiler to every viewer and styles the page in the
+browser. For the offline bundle (DECK_RENDER_MODE=bundle) the deck's class attributes are
+scanned after rendering and only the matching rules are emitted, from the subset of
+Tailwind below: the classes the templates use plus the layout / spacing / type utilities
+the structurer writes into its HTML. Anything else is reported as unknown (and stays
+unstyled, as it would with the CDN for classes from plugins it does not load, e.g. prose).
+"""
+import re
+
+CSS_MARKER = "/* deck-css */"
+
+# Tailwind's preflight, reduced to what the deck markup relies on
+PREFLIGHT = (
+    "*,::before,::after{box-sizing:border-box;border:0 solid #e5e7eb}"
+    "html{line-height:1.5;-webkit-text-size-adjust:100%}"
+    "h1,h2,h3,h4,p,ul,ol,figure{margin:0}"
+    "h1,h2,h3,h4{font-size:inherit;font-weight:inherit}"
+    "ul,ol{list-style:none;padding:0}"
+    "img{display:block;max-width:100%;height:auto}"
+    "b,strong{font-weight:bolder}"
+)
+
+COLORS = {
+    "white": "#fff", "black": "#000",
+    "gray-50": "#f9fafb", "gray-100": "#f3f4f6", "gray-200": "#e5e7eb", "gray-300": "#d1d5db",
+    "gray-400": "#9ca3af", "gray-500": "#6b7280", "gray-600": "#4b5563", "gray-700": "#374151",
+    "gray-800": "#1f2937", "gray-900": "#111827",
+    "primary": "var(--primary)", "secondary": "var(--secondary)", # tailwind.config colors of the template
+}
+
+FONT_SIZES = {
+    "xs": ("0.75rem", "1rem"), "sm": ("0.875rem", "1.25rem"), "base": ("1rem", "1.5rem"),
+    "lg": ("1.125rem", "1.75rem"), "xl": ("1.25rem", "1.75rem"), "2xl": ("1.5rem", "2rem"),
+    "3xl": ("1.875rem", "2.25rem"), "4xl": ("2.25rem", "2.5rem"), "5xl": ("3rem", "1"),
+}
+
+STATIC = {
+    "flex": "display:flex", "grid": "display:grid", "block": "display:block", "inline-block": "display:inline-block",
+    "hidden": "display:none", "flex-col": "flex-direction:column", "flex-row": "flex-direction:row",
+    "flex-wrap": "flex-wrap:wrap", "flex-1": "flex:1 1 0%", "shrink-0": "flex-shrink:0",
+    "items-center": "align-items:center", "items-start": "align-items:flex-start", "items-end": "align-items:flex-end",
+    "justify-between": "justify-content:space-between", "justify-center": "justify-content:center",
+    "justify-start": "justify-content:flex-start", "justify-end": "justify-content:flex-end",
+    "relative": "position:relative", "absolute": "position:absolute",
+    "overflow-hidden": "overflow:hidden", "overflow-x-auto": "overflow-x:auto",
+    "w-full": "width:100%", "h-full": "height:100%", "max-w-full": "max-width:100%", "max-h-full": "max-height:100%",
+    "object-contain": "object-fit:contain", "object-cover": "object-fit:cover",
+    "mt-auto": "margin-top:auto", "mx-auto": "margin-left:auto;margin-right:auto",
+    "uppercase": "text-transform:uppercase", "italic": "font-style:italic", "underline": "text-decoration-line:underline",
+    "text-left": "text-align:left", "text-center": "text-align:center", "text-right": "text-align:right",
+    "whitespace-nowrap": "white-space:nowrap", "cursor-pointer": "cursor:pointer",
+    "font-base": "font-family:var(--font-base)",
+    "font-mono": "font-family:ui-monospace,SFMono-Regular,Menlo,Monaco,Consolas,monospace",
+    "font-normal": "font-weight:400", "font-medium": "font-weight:500", "font-semibold": "font-weight:600",
+    "font-bold": "font-weight:700", "font-extrabold": "font-weight:800",
+    "tracking-wide": "letter-spacing:0.025em", "tracking-wider": "letter-spacing:0.05em",
+    "tracking-widest": "letter-spacing:0.1em",
+    "leading-none": "line-height:1", "leading-tight": "line-height:1.25", "leading-snug": "line-height:1.375",
+    "leading-normal": "line-height:1.5", "leading-relaxed": "line-height:1.625",
+    "rounded": "border-radius:0.25rem", "rounded-md": "border-radius:0.375rem", "rounded-lg": "border-radius:0.5rem",
+    "rounded-xl": "border-radius:0.75rem", "rounded-full": "border-radius:9999px",
+    "border": "border-width:1px", "border-t": "border-top-width:1px", "border-b": "border-bottom-width:1px",
+    "border-l-4": "border-left-width:4px",
+    "shadow-sm": "box-shadow:0 1px 2px 0 rgb(0 0 0 / 0.05)",
+    "shadow": "box-shadow:0 1px 3px 0 rgb(0 0 0 / 0.1),0 1px 2px -1px rgb(0 0 0 / 0.1)",
+    "shadow-md": "box-shadow:0 4px 6px -1px rgb(0 0 0 / 0.1),0 2px 4px -2px rgb(0 0 0 / 0.1)",
+    "list-disc": "list-style-type:disc", "list-inside": "list-style-position:inside",
+}
+
+SPACING_PROPS = {
+    "p": ("padding",), "px": ("padding-left", "padding-right"), "py": ("padding-top", "padding-bottom"),
+    "pt": ("padding-top",), "pb": ("padding-bottom",), "pl": ("padding-left",), "pr": ("padding-right",),
+    "m": ("margin",), "mx": ("margin-left", "margin-right"), "my": ("margin-top", "margin-bottom"),
+    "mt": ("margin-top",), "mb": ("margin-bottom",), "ml": ("margin-left",), "mr": ("margin-right",),
+    "gap": ("gap",), "gap-x": ("column-gap",), "gap-y": ("row-gap",),
+    "w": ("width",), "h": ("height",),
+}
+
+VARIANTS = {"hover": ":hover", "focus": ":focus"}
+
+# Unstyled with the CDN too (it loads no typography plugin and the template defines no no-scrollbar rule);
+# they stay in the markup as hooks, e.g. the digest parser finds text blocks by "prose"
+UNSTYLED = {"prose", "prose-lg", "no-scrollbar"}
+
+_SPACING = re.compile(r"^(gap-x|gap-y|p[xytblr]?|m[xytblr]?|gap|w|h)-(\d+(?:\.5)?|px)$")
+_FRACTION = re.compile(r"^([wh])-(\d+)/(\d+)$")
+_ARBITRARY = re.compile(r"^(text|w|h|p|m|mt|mb|gap)-\[(\d+(?:\.\d+)?(?:px|rem|em|%))\]$")
+_CLASS_ATTR = re.compile(r'\bclass\s*=\s*"([^"]*)"')
+_STYLE_BLOCK = re.compile(r"<style[^>]*>(.*?)</style>", re.S)
+_CLASS_SELECTOR = re.compile(r"\.(-?[A-Za-z_][\w-]*)")
+
+def _spacing(value):
+    return "1px" if value == "px" else ("0px" if value == "0" else f"{float(value) * 0.25:g}rem")
+
+def declarations(utility):
+    """CSS declarations of one (variant-free) utility class, or None if it is not supported."""
+    if utility in STATIC:
+        return STATIC[utility]
+    if m := _SPACING.match(utility):
+        return ";".join(f"{prop}:{_spacing(m.group(2))}" for prop in SPACING_PROPS[m.group(1)])
+    if m := _FRACTION.match(utility):
+        prop = "width" if m.group(1) == "w" else "height"
+        return f"{prop}:{int(m.group(2)) / int(m.group(3)) * 100:g}%"
+    if m := _ARBITRARY.match(utility):
+        prop = {"text": "font-size", "w": "width", "h": "height", "p": "padding", "m": "margin",
+                "mt": "margin-top", "mb": "margin-bottom", "gap": "gap"}[m.group(1)]
+        return f"{prop}:{m.group(2)}"
+    if utility.startswith("text-"):
+        key = utility[5:]
+        if key in FONT_SIZES:
+            size, line_height = FONT_SIZES[key]
+            return f"font-size:{size};line-height:{line_height}"
+        if key in COLORS:
+            return f"color:{COLORS[key]}"
+    for prefix, prop in (("bg-", "background-color"), ("border-", "border-color")):
+        if utility.startswith(prefix) and utility[len(prefix):] in COLORS:
+            return f"{prop}:{COLORS[utility[len(prefix):]]}"
+    if m := re.match(r"^(grid-cols|col-span)-(\d+|full)$", utility):
+        if m.group(1) == "grid-cols":
+            return f"grid-template-columns:repeat({m.group(2)},minmax(0,1fr))"
+        return "grid-column:1/-1" if m.group(2) == "full" else f"grid-column:span {m.group(2)}/span {m.group(2)}"
+    if m := re.match(r"^opacity-(\d+)$", utility):
+        return f"opacity:{int(m.group(1)) / 100:g}"
+    return None
+
+def _selector(cls):
+    return "." + re.sub(r"([:/\[\].%])", r"\\\1", cls)
+
+def rule(cls):
+    """The CSS rule for a class (with hover:/focus: variants), or None if unsupported."""
+    *variants, utility = cls.split(":")
+    if any(v not in VARIANTS for v in variants):
+        return None
+    if utility.startswith("space-y-") and (m := _SPACING.match("m" + utility[7:])):
+        body = f"margin-top:{_spacing(m.group(2))}"
+        return f"{_selector(cls)}>:not([hidden])~:not([hidden]){{{body}}}"
+    body = declarations(utility)
+    if body is None:
+        return None
+    return f"{_selector(cls)}{''.join(VARIANTS[v] for v in variants)}{{{body}}}"
+
+def used_classes(html):
+    """Class names in the document's class attributes, in first-seen order."""
+    return list(dict.fromkeys(c for attr in _CLASS_ATTR.findall(html) for c in attr.split()))
+
+def styled_classes(html):
+    """Classes the document's own <style> blocks already have rules for (slide-container, nav-active, ...)."""
+    return {c for block in _STYLE_BLOCK.findall(html) for c in _CLASS_SELECTOR.findall(block)}
+
+def build_css(classes, known=()):
+    """(css, unknown classes) for the given classes. known: classes styled elsewhere (the template's own rules)."""
+    rules, unknown = [], []
+    for cls in classes:
+        css = rule(cls)
+        if css is not None:
+            rules.append(css)
+        elif cls not in known and cls not in UNSTYLED:
+            unknown.append(cls)
+    # Hover / focus rules after the base ones, so they win like in Tailwind's layer order
+    rules.sort(key=lambda r: ":hover{" in r or ":focus{" in r)
+    return PREFLIGHT + "".join(rules), unknown
+
+def inline_css(html):
+    """Replace CSS_MARKER in a rendered deck with the rules for the classes it uses. Returns (html, unknown)."""
+    css, unknown = build_css(used_classes(html), styled_classes(html))
+    return html.replace(CSS_MARKER, css, 1), unknown
@@ -0,0 +1,153 @@
+import re
+from html.parser import HTMLParser
+from .tokens import count_tokens
+from .artifacts import load_groups
+
+VOID_TAGS = {"img", "br", "hr", "meta", "link", "input", "source", "wbr"}
+
+def _plain(html_text):
+    text = re.sub(r"<[^>]+>", " ", html_text or "")
+    return re.sub(r"\s+", " ", text).strip()
+
+def _clip(text, limit):
+    if limit is None or len(text) <= limit:
+        return text
+    return text[:max(limit - 3, 0)].rstrip() + "..." if limit else ""
+
+class _DeckParser(HTMLParser):
+    """Recovers the structured slides from a deck rendered with templates/slide_template.html or slide_bundle.html."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.slides = []
+        self.stack = [] # (tag, role)
+        self.capture = None # (slide field or block field, buffer)
+
+    @property
+    def slide(self):
+        return self.slides[-1] if self.slides else None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = (attrs.get("class") or "").split()
+        role = None
+
+        if tag == "div" and "slide-container" in classes:
+            # The bundle's navbar is stamped in by script, so its slides carry their tab in data-nav
+            self.slides.append({"nav_label": attrs.get("data-nav") or "", "subhead": "", "headline": "", "layout_class": "",
+                                "references": "", "content_blocks": []})
+            role = "slide"
+        elif self.slide is None:
+            pass
+        elif tag == "div" and "nav-active" in classes:
+            role = "nav_label"
+        elif tag == "h3":
+            role = "subhead"
+        elif tag == "h1":
+            role = "headline"
+        elif tag == "div" and "grid" in classes:
+            self.slide["layout_class"] = " ".join(c for c in classes if c.startswith("grid-cols"))
+        elif tag == "div" and any(c.startswith("col-span") for c in classes):
+            span = next(c for c in classes if c.startswith("col-span"))
+            self.slide["content_blocks"].append({"type": "text", "col_span_class": span})
+        elif tag == "div" and "prose" in classes:
+            role = "content"
+        elif tag == "ul" and self.slide["content_blocks"]:
+            self.slide["content_blocks"][-1].update(type="list", items=[])
+        elif tag == "span" and "text-gray-800" in classes:
+            role = "item"
+        elif tag == "img" and attrs.get("alt") == "Visual" and self.slide["content_blocks"]:
+            self.slide["content_blocks"][-1].update(type="image", url=attrs.get("src"))
+        elif tag == "p" and "italic" in classes:
+            role = "caption"
+        elif tag == "p" and "text-gray-400" in classes:
+            role = "references"
+
+        if role and role != "slide":
+            self.capture = (role, [])
+        if self.capture:
+            self.capture[1].append(" ")
+        if tag not in VOID_TAGS:
+            self.stack.append((tag, role))
+
+    def handle_endtag(self, tag):
+        if self.capture:
+            self.capture[1].append(" ")
+        while self.stack:
+            open_tag, role = self.stack.pop()
+            if self.capture and role == self.capture[0]:
+                self._finish_capture()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self.capture:
+            self.capture[1].append(data)
+
+    def _finish_capture(self):
+        role, buffer = self.capture
+        self.capture = None
+        text = re.sub(r"\s+", " ", "".join(buffer)).strip()
+        block = self.slide["content_blocks"][-1] if self.slide["content_blocks"] else None
+        if role == "references":
+            self.slide["references"] = re.sub(r"^References:\s*", "", text)
+        elif role in ("nav_label", "subhead", "headline"):
+            self.slide[role] = text
+        elif block is not None and role == "item":
+            block.setdefault("items", []).append(text)
+        elif block is not None:
+            block[role] = text
+
+def slides_from_html(html):
+    """Structured slides (headline, subhead, nav_label, layout, blocks) parsed back out of rendered HTML."""
+    parser = _DeckParser()
+    parser.feed(html or "")
+    parser.close()
+    return parser.slides
+
+def _render_digest(plan, structured_slides, text_limit):
+    lines = []
+    for i, slide in enumerate(structured_slides):
+        spec = plan[i] if i < len(plan) else {}
+        lines.append(f"## Slide {i + 1} [nav: {slide.get('nav_label', '')}]")
+        if spec.get("page_topic"):
+            lines.append(f"Planned topic: {_clip(spec['page_topic'], text_limit)}")
+        lines.append(f"Headline: {slide.get('headline', '')}")
+        lines.append(f"Subhead: {slide.get('subhead', '')}")
+
+        blocks = slide.get("content_blocks") or []
+        layout = ", ".join(f"{b.get('type')}({b.get('col_span_class', '')})" for b in blocks) or "empty"
+        lines.append(f"Layout: {slide.get('layout_class', '')} | {layout}")
+
+        claims = []
+        for grp in load_groups(spec.get("selected_content")):
+            ids = grp.get("claim_ids") or []
+            if len(ids) != len(grp.get("claims", [])):
+                ids = [grp.get("group_id")] * len(grp.get("claims", [])) # some claims missing upstream
+            claims.extend((cid, claim.get("claim_text", "")) for cid, claim in zip(ids, grp.get("claims", [])))
+        if claims:
+            lines.append("Source claims:")
+            lines.extend(f"- [{cid}] {_clip(_plain(text), text_limit)}" for cid, text in claims)
+
+        for b in blocks:
+            if b.get("type") == "image":
+                lines.append(f"Image: {b.get('url')}" + (f" ({_clip(b['caption'], text_limit)})" if b.get("caption") else ""))
+            elif b.get("type") == "list":
+                lines.extend(f"* {_clip(_plain(item), text_limit)}" for item in b.get("items") or [])
+            elif text_limit:
+                lines.append(f"Text: {_clip(_plain(b.get('content', '')), text_limit)}")
+        if slide.get("references"):
+            lines.append(f"References: {_clip(slide['references'], text_limit)}")
+        lines.append("")
+    return "\n".join(lines)
+
+def build_deck_digest(plan, structured_slides, max_tokens):
+    """Compact per-slide summary for the reviewer, shrunk until it fits max_tokens."""
+    digest = ""
+    for text_limit in (400, 200, 100, 50, 0):
+        digest = _render_digest(plan, structured_slides, text_limit)
+        if count_tokens(digest) <= max_tokens:
+            return digest
+    # Still over budget at headline level: cut proportionally, leaving room for the marker
+    keep = int(len(digest) * (max_tokens - 10) / count_tokens(digest))
+    return digest[:max(keep, 0)] + "\n[digest truncated]"
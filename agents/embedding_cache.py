@@ -0,0 +1,104 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import numpy as np
+
+def normalize_text(text):
+    """Canonical form used for cache keys: NFC, collapsed whitespace. Case is kept (FRESCO != fresco)."""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip()
+
+def cache_key(model, text):
+    return hashlib.sha256(f"{model}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+class CachedEmbeddings:
+    """Content-addressed, on-disk embedding cache in front of an Embeddings client.
+
+    Vectors are stored as float16 blobs in SQLite (6 KB per text-embedding-3-large vector)
+    and evicted least-recently-used once max_entries is exceeded.
+    """
+
+    def __init__(self, embedder, path, max_entries=20000, model=None):
+        self.embedder = embedder
+        self.path = path
+        self.max_entries = max_entries
+        self.model = model or getattr(embedder, "model", type(embedder).__name__)
+        self.hits = 0
+        self.misses = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        # Opened lazily so importing the retriever never touches the disk
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+            )
+        return self._conn
+
+    def embed_documents(self, texts):
+        keys = [cache_key(self.model, t) for t in texts]
+        found = {}
+        with self._lock:
+            db = self._db()
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i + 500]
+                rows = db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update((k, np.frombuffer(v, dtype=np.float16).astype(np.float32).tolist()) for k, v in rows)
+            if found:
+                now = time.time()
+                db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(now, k) for k in found])
+                db.commit()
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        miss_count = sum(1 for k in keys if k in missing)
+        with self._lock:
+            self.hits += len(keys) - miss_count
+            self.misses += miss_count
+
+        if missing:
+            new_vectors = self.embedder.embed_documents(list(missing.values()))
+            now = time.time()
+            rows = []
+            for key, vector in zip(missing, new_vectors):
+                found[key] = vector
+                rows.append((key, np.asarray(vector, dtype=np.float16).tobytes(), now))
+            with self._lock:
+                db = self._db()
+                db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+                self._evict(db)
+                db.commit()
+
+        return [found[k] for k in keys]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    def _evict(self, db):
+        count = db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count > self.max_entries:
+            db.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
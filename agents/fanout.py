@@ -0,0 +1,388 @@
+"""Per-slide fan-out: every slide runs retrieve -> dedup -> structure in its own LangGraph branch.
+
+    planner -> dispatch -> Send("slide") per slide + Send("navbar") -> render (join) -> reviewer
+
+The dispatch node embeds every fresh slide's queries in one batched call (as retriever_node
+does) and each branch gets its vectors by artifact ref. Deck allocation modes (ALLOCATION_MODE
+deck_judge / optimizer) need every slide's candidates before any slide can be deduplicated, so
+there the retrieval runs as its own fan-out first:
+
+    dispatch -> Send("retrieve") per slide -> allocate (one deck judge call) -> Send("slide") ...
+
+Claim deduplication runs in slide order inside the slide branches (see SlideLedger): slide N
+only waits for slides 1..N-1 to reserve their groups, not for the whole deck. render_node
+joins the branch results in slide order and checks the deduplication again; a slide that
+overlaps an earlier one (only possible when a branch ran without its ledger, e.g. after a
+resume) is re-deduplicated and re-structured there.
+"""
+import threading
+import time
+import uuid
+from functools import partial
+from langgraph.types import Command, Send
+from .state import AgentState
+from .config import ALLOCATION_MODE, ASSEMBLER_MAX_WORKERS
+from .memo import slide_spec_hash, add_savings
+from .artifacts import content_ref, get_store, load_messages, put_messages
+from .providers import get_llm
+from .retriever import (
+    embed_queries, search_slide, search_and_judge, allocate_deck, prefetch_claims, reserve_reused, reserve_group,
+    reserve_content, take_prefetch, print_timings, map_slides
+)
+from .assemble2 import (
+    generate_navbar_labels, structure_slide, load_theme, navbar_memo_key, unique_navbar_tabs, render_deck
+)
+
+class SlideLedger:
+    """Claim reservations shared by the slide branches of one fan-out pass.
+
+    Branches reserve in slide order. A branch only ever waits for lower-numbered slides, which
+    were sent (and so started) before it, so the waits cannot starve the graph's worker pool.
+    """
+
+    def __init__(self, fresh, used_groups, used_claims, prefetch=None):
+        self.id = uuid.uuid4().hex
+        self.order = list(fresh) # indices of the slides being retrieved, in reservation order
+        self.used_groups = used_groups
+        self.used_claims = used_claims
+        self.prefetch = prefetch # streaming planner results (see retriever.SlidePrefetch)
+        self._turn = 0
+        self._reserved = set()
+        self._failed = None
+        self._cond = threading.Condition()
+
+    def prefetched(self, slide):
+        return self.prefetch.take(slide['spec_hash']) if self.prefetch is not None else None
+
+    def reserve(self, index, fn):
+        """fn(used_groups, used_claims) once every earlier fresh slide has reserved its content."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._failed is not None or self.order[self._turn] == index)
+            if self._failed is not None:
+                raise RuntimeError(f"Slide {self._failed + 1} failed before reserving its content")
+            try:
+                reserved = fn(self.used_groups, self.used_claims)
+                self._reserved.add(index)
+                return reserved
+            finally:
+                self._turn += 1
+                self._cond.notify_all()
+
+    def abort(self, index):
+        """A branch failed: release the branches waiting on it (they fail too) unless it had already reserved."""
+        with self._cond:
+            if index in self._reserved:
+                return
+            self._failed = index
+            self._cond.notify_all()
+        close_ledger(self.id)
+
+_ledgers = {}
+_ledger_lock = threading.Lock()
+
+def open_ledger(fresh, used_groups, used_claims, prefetch=None):
+    ledger = SlideLedger(fresh, used_groups, used_claims, prefetch)
+    with _ledger_lock:
+        _ledgers[ledger.id] = ledger
+    return ledger
+
+def get_ledger(fanout_id):
+    """The ledger behind a state's fanout_id (None after a resume or restart)."""
+    with _ledger_lock:
+        return _ledgers.get(fanout_id) if fanout_id else None
+
+def close_ledger(fanout_id):
+    with _ledger_lock:
+        ledger = _ledgers.pop(fanout_id, None) if fanout_id else None
+    if ledger is not None and ledger.prefetch is not None:
+        ledger.prefetch.close()
+
+def reused_hashes(plan, memo):
+    """Spec hashes of the slides reused from the memo, in slide order."""
+    return [slide['spec_hash'] for slide in plan if 'selected_content' in memo.get(slide['spec_hash'], {})]
+
+def embed_slides(plan, indices):
+    """Embed the queries of plan[indices] in batched calls. Returns a vectors artifact ref per slide ("" if none)."""
+    store = get_store()
+    t0 = time.perf_counter()
+    vectors = embed_queries([q for i in indices for q in plan[i].get('candidate_queries', [])])
+    print(f"   Embedded {len(vectors)} unique queries in {time.perf_counter() - t0:.2f}s")
+    refs = [""] * len(plan)
+    for i in indices:
+        refs[i] = store.put_json({q: vectors[q] for q in plan[i].get('candidate_queries', []) if q in vectors})
+    return refs
+
+def dispatch_node(state: AgentState):
+    print("--- SLIDE FAN-OUT (retrieve -> dedup -> structure per slide) ---")
+    memo = state.get('slide_memo') or {}
+    plan = [{**slide, 'spec_hash': slide_spec_hash(slide)} for slide in state['deck_plan']]
+    reused = reused_hashes(plan, memo)
+    fresh = [i for i, slide in enumerate(plan) if slide['spec_hash'] not in reused]
+
+    # Reused slides keep their groups, so they are reserved before any branch deduplicates
+    used_groups, used_claims = reserve_reused(memo, reused, list(state.get('global_used_claims') or []))
+    prefetch = take_prefetch(state.get('prefetch_id'))
+    ledger = open_ledger(fresh, used_groups, used_claims, prefetch)
+    # One batched embedding call for the deck; slides the streaming planner already retrieved need none
+    pending = [i for i in fresh if prefetch is None or not prefetch.covers(plan[i]['spec_hash'])]
+    vectors_refs = embed_slides(plan, pending) if pending else [""] * len(plan)
+    print(f"   {len(plan)} slide branches: {len(fresh)} to retrieve, {len(plan) - len(fresh)} reused")
+    return {"deck_plan": plan, "fanout_id": ledger.id, "vectors_refs": vectors_refs, "slide_candidates": [],
+            "slide_results": [], "navbar_labels": [], "retriever_messages_ref": ""}
+
+def send_slides(state, retrieved=None):
+    """One Send("slide") per slide; retrieved maps slide index -> (allocated retrieval result ref, started)."""
+    memo = state.get('slide_memo') or {}
+    retrieved = retrieved or {}
+    return [Send("slide", {"index": i, "slide": slide, "memo": memo.get(slide['spec_hash'], {}),
+                           "fanout_id": state['fanout_id'], "vectors_ref": vectors_ref(state, i),
+                           "retrieved": retrieved.get(i)})
+            for i, slide in enumerate(state['deck_plan'])]
+
+def vectors_ref(state, index):
+    refs = state.get('vectors_refs') or []
+    return refs[index] if index < len(refs) else ""
+
+def fan_out_slides(state: AgentState):
+    """Conditional edge after dispatch: the navbar labels plus either the slide branches or, in deck
+    allocation modes, their retrieval."""
+    memo = state.get('slide_memo') or {}
+    topics = [s['page_topic'] for s in state['deck_plan']]
+    navbar = Send("navbar", {"topics": topics, "labels": memo.get(navbar_memo_key(topics))})
+    reused = reused_hashes(state['deck_plan'], memo)
+    fresh = [(i, slide) for i, slide in enumerate(state['deck_plan']) if slide['spec_hash'] not in reused]
+    if ALLOCATION_MODE == "slide" or not fresh:
+        return [navbar] + send_slides(state)
+    return [navbar] + [Send("retrieve", {"index": i, "slide": slide, "fanout_id": state['fanout_id'],
+                                         "vectors_ref": vectors_ref(state, i)})
+                       for i, slide in fresh]
+
+def navbar_node(branch):
+    if branch['labels'] is not None:
+        return {"navbar_labels": branch['labels']}
+    return {"navbar_labels": generate_navbar_labels(branch['topics'], get_llm("navbar"))}
+
+def retrieve_slide(slide, ledger, judge, vectors_ref=""):
+    """The streaming planner's result for the slide, else search (+ judge) it here with the vectors
+    dispatch embedded for it (embedding them now only if there are none)."""
+    result = ledger.prefetched(slide) if ledger is not None else None
+    if result is None:
+        queries = slide.get('candidate_queries', [])
+        vectors = get_store().get_json(vectors_ref) if vectors_ref else embed_queries(queries)
+        result = search_and_judge(slide, vectors) if judge else search_slide(slide, vectors)
+    return result
+
+def retrieve_node(branch):
+    """Deck allocation modes: one slide's search, before the deck-wide allocation."""
+    started = time.time()
+    result = retrieve_slide(branch['slide'], get_ledger(branch['fanout_id']), judge=False,
+                            vectors_ref=branch['vectors_ref'])
+    return {"slide_candidates": [{"index": branch['index'], "result_ref": get_store().put_json(result),
+                                  "started": started}]}
+
+def allocate_node(state: AgentState):
+    """Deck allocation modes: assign groups across the deck (one judge call), then send the slide branches."""
+    store = get_store()
+    memo = state.get('slide_memo') or {}
+    plan = state['deck_plan']
+    entries = sorted(state.get('slide_candidates') or [], key=lambda e: e['index'])
+    results = [store.get_json(e['result_ref']) for e in entries]
+
+    used_groups, used_claims = reserve_reused(memo, reused_hashes(plan, memo),
+                                              list(state.get('global_used_claims') or []))
+    deck_messages, deck_stats = allocate_deck([plan[e['index']] for e in entries], results, used_groups, used_claims)
+    calls_made = 1 if deck_stats['judged_slides'] else 0
+    print(f"   Deck allocation ({ALLOCATION_MODE}): {calls_made} judge call for {deck_stats['judged_slides']} "
+          f"ambiguous slides, {deck_stats['judge']:.2f}s, {deck_stats['judge_tokens']} prompt tokens")
+
+    retrieved = {e['index']: (store.put_json(result), e['started']) for e, result in zip(entries, results)}
+    return Command(update={"slide_candidates": [], "retriever_messages_ref": put_messages(deck_messages)},
+                   goto=send_slides(state, retrieved))
+
+def retrieve_and_dedup(index, slide, ledger, retrieved, vectors_ref, timing, out):
+    """Retrieve one slide (unless the deck allocation already did), fetch its claims and
+    deduplicate them against the earlier slides. Returns (selection, calls) like the memo entry."""
+    if retrieved is not None:
+        result = get_store().get_json(retrieved[0]) # searched and allocated across the deck
+    else:
+        result = retrieve_slide(slide, ledger, judge=True, vectors_ref=vectors_ref)
+        out['retriever_messages_ref'] = put_messages(result['messages'])
+    timing.update(result['timings'])
+    timing['prejudge'] = result['prejudge']
+
+    calls = {"llm_calls": 0, "vector_calls": len(slide.get('candidate_queries', []))}
+    if result['candidates'] and not result['prejudge'] and retrieved is None:
+        calls['llm_calls'] += 1 # the deck judge call is not counted per slide
+    fetched = prefetch_claims([result], 1)
+    t0 = time.perf_counter()
+    if ledger is not None:
+        selection, timing['fetch'], fetches = ledger.reserve(index, partial(reserve_content, result, fetched))
+    else:
+        # No ledger (resumed in a new process): render_node deduplicates against the earlier slides
+        selection, timing['fetch'], fetches = reserve_content(result, fetched, set(), set())
+    timing['wait'] = time.perf_counter() - t0
+    calls['vector_calls'] += fetches
+    timing['total'] = timing['search'] + timing['judge'] + timing['fetch']
+    if not result['candidates']:
+        return slide.get('selected_content'), calls
+    return selection, calls
+
+def slide_node(branch):
+    """One slide's branch: retrieve (search + judge), dedup (claim fetch, deduplication against the
+    earlier slides) and structure."""
+    index, slide, entry, retrieved = branch['index'], branch['slide'], branch['memo'], branch['retrieved']
+    ledger = get_ledger(branch['fanout_id'])
+    started = retrieved[1] if retrieved else time.time()
+    timing = {"slide_id": slide.get('slide_id'), "search": 0.0, "judge": 0.0, "fetch": 0.0, "total": 0.0,
+              "judge_tokens": 0, "wait": 0.0, "structure": 0.0}
+    out = {"index": index, "reused": 'selected_content' in entry, "retriever_messages_ref": ""}
+    try:
+        if out['reused']:
+            selection, calls = entry['selected_content'], entry['calls']
+            timing['reused'] = True
+        else:
+            selection, calls = retrieve_and_dedup(index, slide, ledger, retrieved, branch['vectors_ref'], timing, out)
+    except BaseException:
+        if ledger is not None:
+            ledger.abort(index)
+        raise
+
+    slide = {**slide, 'selected_content': selection}
+    store = get_store()
+    if out['reused'] and 'structured' in entry:
+        slide_data, messages = store.get_json(entry['structured']), None
+    else:
+        t0 = time.perf_counter()
+        slide_data, messages = structure_slide(index, slide)
+        timing['structure'] = time.perf_counter() - t0
+    return {"slide_results": [{
+        **out,
+        "slide": slide,
+        "calls": calls,
+        "structured_ref": store.put_json(slide_data),
+        "structure_reused": messages is None,
+        "structure_ok": bool(messages), # only successful LLM layouts are memoized, never the error fallback
+        "assembler_messages_ref": put_messages(messages or []),
+        "timing": timing,
+        "started": started,
+        "finished": time.time(),
+    }]}
+
+def reserve_refs(selection, used_groups, used_claims):
+    """The part of a branch's selection not already used on an earlier slide, reserving it."""
+    kept = []
+    for grp in selection:
+        if grp.group_id not in used_groups and used_claims.isdisjoint(grp.claim_ids):
+            used_groups.add(grp.group_id)
+            used_claims.update(grp.claim_ids)
+            kept.append(grp)
+            continue
+        claims = get_store().get_json(grp.claims_key)
+        reserved = reserve_group(grp.group_id, list(grp.claim_ids), claims, used_groups, used_claims)
+        if reserved:
+            kept.append(content_ref(grp.group_id, *reserved))
+    return kept
+
+def print_branches(results):
+    """Per-branch latency and the critical path: first branch start to last branch end."""
+    if not results:
+        return
+    print("   Slide branches (s):")
+    print("   slide | retrieve |   wait | structure | branch")
+    for r in results:
+        t = r['timing']
+        print(f"   {t['slide_id']!s:>5} | {t['total']:8.2f} | {t['wait']:6.2f} | {t['structure']:9.2f} | "
+              f"{r['finished'] - r['started']:6.2f}")
+    critical_path = max(r['finished'] for r in results) - min(r['started'] for r in results)
+    last = max(results, key=lambda r: r['finished'])['timing']
+    print(f"   Critical path: {critical_path:.2f}s, ending with slide {last['slide_id']} ({last['total']:.2f}s "
+          f"retrieve, {last['wait']:.2f}s waiting on earlier slides, {last['structure']:.2f}s structure)")
+
+def render_node(state: AgentState):
+    print("--- RENDER (join of the slide branches) ---")
+    t0 = time.perf_counter()
+    close_ledger(state.get('fanout_id'))
+    results = sorted(state.get('slide_results') or [], key=lambda r: r['index'])
+    store = get_store()
+    memo = dict(state.get('slide_memo') or {})
+    savings = state.get('revision_savings') or {}
+    global_used_claims = list(state.get('global_used_claims') or [])
+    used_groups, used_claims = reserve_reused(
+        memo, [r['slide']['spec_hash'] for r in results if r['reused']], global_used_claims)
+
+    plan, repair = [], []
+    reused_llm_calls = 0
+    retriever_history = load_messages(state.get('retriever_messages_ref')) # the deck judge call, if any
+    assembler_history = []
+    for r in results:
+        slide = r['slide']
+        spec_hash = slide['spec_hash']
+        retriever_history.extend(load_messages(r['retriever_messages_ref']))
+        if r['reused']:
+            savings = add_savings(savings, slides_reused=1, **r['calls'])
+        else:
+            if slide['selected_content'] is not None:
+                # Branches reserve in slide order already; this only trims one that ran without its ledger
+                selection = reserve_refs(slide['selected_content'], used_groups, used_claims)
+                if selection != list(slide['selected_content']):
+                    slide = {**slide, 'selected_content': selection}
+                    repair.append(len(plan))
+                global_used_claims.extend(grp.group_id for grp in selection)
+            memo[spec_hash] = {"selected_content": slide['selected_content'], "calls": r['calls']}
+        if r['structure_reused']:
+            reused_llm_calls += 1
+        else:
+            assembler_history.extend(load_messages(r['assembler_messages_ref']))
+            if r['structure_ok'] and len(plan) not in repair:
+                memo[spec_hash] = {**memo.get(spec_hash, {}), 'structured': r['structured_ref']}
+        plan.append(slide)
+
+    structured_refs = [r['structured_ref'] for r in results]
+    if repair:
+        print(f"   Re-structuring {len(repair)} slides that overlapped earlier ones")
+        restructured = map_slides(lambda i: structure_slide(i, plan[i]), repair, ASSEMBLER_MAX_WORKERS)
+        for i, (slide_data, messages) in zip(repair, restructured):
+            structured_refs[i] = store.put_json(slide_data)
+            assembler_history.extend(messages)
+            if messages:
+                memo[plan[i]['spec_hash']]['structured'] = structured_refs[i]
+
+    topics = [s['page_topic'] for s in plan]
+    navbar_labels = state.get('navbar_labels') or []
+    navbar_key = navbar_memo_key(topics)
+    if navbar_key in memo:
+        reused_llm_calls += 1
+    else:
+        memo[navbar_key] = navbar_labels
+
+    labeled_refs = []
+
+    def labeled_slides():
+        # Loaded one at a time as the deck renders; state keeps only the refs
+        for ref, label in zip(structured_refs, navbar_labels):
+            slide_data = store.get_json(ref)
+            slide_data['nav_label'] = label
+            labeled_refs.append(store.put_json(slide_data))
+            yield slide_data
+
+    context = {"theme": load_theme(), "navbar_tabs": unique_navbar_tabs(navbar_labels)}
+    html_ref = render_deck(labeled_slides(), state.get('output_path'), **context)
+
+    timings = [r['timing'] for r in results]
+    print_timings(timings)
+    print_branches([r for r in results if not r['reused']])
+    print(f"Joined {len(plan)} slides in {time.perf_counter() - t0:.2f}s (reused {reused_llm_calls} LLM calls)")
+
+    return {
+        "deck_plan": plan,
+        "global_used_claims": global_used_claims,
+        "retriever_messages_ref": put_messages(retriever_history),
+        "retriever_timings": timings,
+        "html_ref": html_ref,
+        "structured_refs": labeled_refs,
+        "assembler_messages_ref": put_messages(assembler_history),
+        "slide_memo": memo,
+        "revision_savings": add_savings(savings, llm_calls=reused_llm_calls),
+        "slide_results": [], # joined; keep them out of later checkpoints
+        "fanout_id": ""
+    }
@@ -0,0 +1,66 @@
+import json
+import re
+
+class JsonArrayStream:
+    """Incremental parser for the objects of one named JSON array in streamed LLM text.
+
+    feed() takes the next chunk and returns the array items completed by it, so a caller
+    can act on item 1 while the model is still writing item 2. Only the array's own
+    brackets are tracked (strings and escapes aware); anything before the first
+    `"<key>": [`, such as the planner's analysis or a ```json fence, is skipped.
+    """
+
+    def __init__(self, key):
+        self._opening = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+        self.buffer = ""
+        self.items = 0
+        self.done = False
+        self._pos = None # scan offset inside the array; None until it opens
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    def feed(self, text):
+        self.buffer += text
+        if self.done:
+            return []
+        if self._pos is None:
+            match = self._opening.search(self.buffer)
+            if not match:
+                return []
+            self._pos = match.end()
+
+        items = []
+        buf, i = self.buffer, self._pos
+        while i < len(buf):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0: # the array itself closed
+                    self.done = True
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        items.append(json.loads(buf[self._item_start:i + 1]))
+                    except ValueError:
+                        pass # malformed item: the full-response parse decides what to do with it
+                    self._item_start = None
+            i += 1
+        self._pos = i
+        items = [item for item in items if isinstance(item, dict)]
+        self.items += len(items)
+        return items
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from .config import LLM_CACHE_AGENTS, LLM_CACHE_PATH, LLM_CACHE_TTL, LLM_CACHE_MAX_ENTRIES
+
+def response_key(prompt, llm_string):
+    """LangChain passes the serialized message list as prompt and the model + params as llm_string."""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+def encode_generations(generations):
+    return json.dumps([
+        {
+            "content": g.message.content,
+            "usage_metadata": g.message.usage_metadata,
+            "response_metadata": g.message.response_metadata
+        }
+        for g in generations
+    ])
+
+def decode_generations(payload):
+    return [
+        ChatGeneration(message=AIMessage(
+            content=g["content"],
+            usage_metadata=g.get("usage_metadata"),
+            response_metadata={**(g.get("response_metadata") or {}), "cache_hit": True}
+        ))
+        for g in json.loads(payload)
+    ]
+
+class ResponseStore:
+    """SQLite table of LLM responses with a TTL and least-recently-used size eviction."""
+
+    def __init__(self, path, ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, agent TEXT, payload TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT payload, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl and now - row[1] > self.ttl:
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                db.commit()
+                return None
+            db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            db.commit()
+        return row[0]
+
+    def put(self, key, agent, payload):
+        now = time.time()
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, agent, payload, now, now))
+            if self.ttl:
+                db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+            count = db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            if count > self.max_entries:
+                db.execute(
+                    "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            db.commit()
+
+    def clear(self, agent=None):
+        with self._lock:
+            db = self._db()
+            if agent:
+                db.execute("DELETE FROM responses WHERE agent = ?", (agent,))
+            else:
+                db.execute("DELETE FROM responses")
+            db.commit()
+
+class AgentResponseCache(BaseCache):
+    """Per-agent view of the shared ResponseStore, plugged into ChatOpenAI(cache=...)."""
+
+    def __init__(self, store, agent):
+        self.store = store
+        self.agent = agent
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt, llm_string):
+        payload = self.store.get(response_key(prompt, llm_string))
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return decode_generations(payload) if payload is not None else None
+
+    def update(self, prompt, llm_string, return_val):
+        self.store.put(response_key(prompt, llm_string), self.agent, encode_generations(return_val))
+
+    def clear(self, **kwargs):
+        self.store.clear(agent=self.agent)
+
+# The image vetter's prompt holds only the image URL, so a cached reply would outlive a change to the bytes
+# behind it. Its verdicts are cached by content hash in VerdictCache instead.
+UNCACHED_AGENTS = {"image_vetter"}
+
+_store = None
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_llm_cache(agent):
+    """Cache for an agent's ChatOpenAI, or None when the agent is not listed in LLM_CACHE_AGENTS."""
+    global _store
+    if agent in UNCACHED_AGENTS or ("all" not in LLM_CACHE_AGENTS and agent not in LLM_CACHE_AGENTS):
+        return None
+    with _caches_lock:
+        if _store is None:
+            _store = ResponseStore(LLM_CACHE_PATH)
+        if agent not in _caches:
+            _caches[agent] = AgentResponseCache(_store, agent)
+        return _caches[agent]
+
+def llm_cache_stats():
+    """{agent: {"hits", "misses"}} for every cache handed out in this process."""
+    return {agent: {"hits": c.hits, "misses": c.misses} for agent, c in _caches.items()}
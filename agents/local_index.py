@@ -0,0 +1,87 @@
+import json
+import os
+import shutil
+from types import SimpleNamespace
+import numpy as np
+
+VECTORS_FILE = "vectors.npy"
+METADATA_FILE = "metadata.json"
+
+def _field(obj, key):
+    """Pinecone responses support both attribute and item access depending on client version."""
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+def list_index_ids(index):
+    """All vector IDs in a Pinecone index (index.list() yields pages of IDs)."""
+    ids = []
+    for page in index.list():
+        ids.extend(page)
+    return ids
+
+def snapshot_index(index, path, batch_size=100):
+    """Copy every vector + metadata of a Pinecone index into a local snapshot directory."""
+    ids = list_index_ids(index)
+    rows, metadata = [], []
+    for i in range(0, len(ids), batch_size):
+        response = index.fetch(ids=ids[i:i + batch_size])
+        for vid, vec in _field(response, "vectors").items():
+            rows.append(_field(vec, "values"))
+            metadata.append({"id": vid, "metadata": dict(_field(vec, "metadata") or {})})
+    write_snapshot(path, np.asarray(rows, dtype=np.float32), metadata)
+    return len(metadata)
+
+def write_snapshot(path, vectors, metadata):
+    """Write L2-normalized vectors + metadata, swapping the directory in atomically."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True) if len(vectors) else 1.0
+    vectors = vectors / np.maximum(norms, 1e-12)
+
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    np.save(os.path.join(tmp_path, VECTORS_FILE), vectors)
+    with open(os.path.join(tmp_path, METADATA_FILE), "w") as f:
+        json.dump(metadata, f)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+class LocalGroupIndex:
+    """In-process replica of a Pinecone index answering query() with vectorized cosine similarity.
+
+    The vector matrix is memory-mapped, so the snapshot is shared through the page cache
+    instead of being copied into every process.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+        with open(os.path.join(path, METADATA_FILE)) as f:
+            entries = json.load(f)
+        self.ids = [e["id"] for e in entries]
+        self.metadata = [e["metadata"] for e in entries]
+
+    @staticmethod
+    def exists(path):
+        return os.path.exists(os.path.join(path, VECTORS_FILE))
+
+    def query(self, vector, top_k=5, include_metadata=True):
+        if not self.ids:
+            return SimpleNamespace(matches=[])
+        q = np.asarray(vector, dtype=np.float32)
+        q = q / max(float(np.linalg.norm(q)), 1e-12)
+        scores = self.vectors @ q
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        matches = [
+            SimpleNamespace(
+                id=self.ids[i],
+                score=float(scores[i]),
+                metadata=self.metadata[i] if include_metadata else None
+            )
+            for i in top
+        ]
+        return SimpleNamespace(matches=matches)
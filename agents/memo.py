@@ -0,0 +1,16 @@
+import hashlib
+import json
+
+# Everything retrieval and structuring depend on; a change in any of them invalidates the slide
+SPEC_FIELDS = ("page_topic", "candidate_queries", "BM25_keywords", "action_headline", "active_nav_tab")
+
+def slide_spec_hash(slide):
+    spec = {field: slide.get(field) for field in SPEC_FIELDS}
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def add_savings(savings, **counts):
+    """Return a new savings dict with counts added (state values are never mutated in place)."""
+    savings = dict(savings or {})
+    for key, value in counts.items():
+        savings[key] = savings.get(key, 0) + value
+    return savings
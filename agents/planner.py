@@ -1,15 +1,14 @@
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import AIMessage, SystemMessage, HumanMessage
 from .state import AgentState
+from .config import PLANNER_STREAMING
+from .providers import get_llm
+from .artifacts import put_messages
+from .json_stream import JsonArrayStream
+from .tracing import span
 import json
 import os
 import re
-from dotenv import load_dotenv
-
-load_dotenv()
-
-# User requested GPT-5.2
-llm = ChatOpenAI(model="gpt-5.2", temperature=0)
+import time
 
 PLANNER_SYSTEM_PROMPT = """
 Role: Senior Medical Content Strategist & Deck Architect.
@@ -53,6 +52,62 @@ Output your analysis first, then a JSON object following this strict schema:
 ```
 """
 
+def to_planner_schema(plan):
+    """Inverse of the slide mapping below, so an unchanged slide round-trips to the same spec."""
+    return [
+        {
+            "slide_id": slide.get("slide_id"),
+            "navigation_tab": slide.get("active_nav_tab"),
+            "action_headline": slide.get("action_headline"),
+            "page_topic": slide.get("page_topic"),
+            "retrieval_strategy": {
+                "candidate_queries": slide.get("candidate_queries", []),
+                "BM25_keywords": slide.get("BM25_keywords", [])
+            }
+        }
+        for slide in plan
+    ]
+
+def to_slide_metadata(slide):
+    """Map one planner slide object onto SlideMetadata."""
+    # Flatten retrieval strategy if present
+    retrieval = slide.get("retrieval_strategy", {})
+    return {
+        "slide_id": slide.get("slide_id"),
+        "page_number": slide.get("slide_id"), # Assume 1-to-1
+        "page_topic": slide.get("page_topic"),
+        "candidate_queries": retrieval.get("candidate_queries", slide.get("candidate_queries", [])),
+        "BM25_keywords": retrieval.get("BM25_keywords", slide.get("BM25_keywords", [])),
+        "active_nav_tab": slide.get("navigation_tab", "HOME"), # Map navigation_tab -> active_nav_tab
+        "action_headline": slide.get("action_headline", ""),
+        "selected_content": None,
+        "html_content": ""
+    }
+
+def stream_plan(messages, state):
+    """Stream the planner response, starting retrieval for each slide as soon as its JSON object closes.
+
+    Returns (response message, prefetch id for the retriever).
+    """
+    from .retriever import start_prefetch, discard_prefetch
+
+    # Slides the retriever will reuse from the memo need no prefetch
+    memo = state.get('slide_memo') or {}
+    prefetcher = start_prefetch(skip={h for h, entry in memo.items() if 'selected_content' in entry})
+    slides = JsonArrayStream("slides")
+    t0 = time.perf_counter()
+    try:
+        for chunk in get_llm("planner").stream(messages):
+            for slide in slides.feed(chunk.content):
+                if slide.get("page_topic"):
+                    prefetcher.submit(to_slide_metadata(slide))
+                    print(f"   Slide {slide.get('slide_id')} planned after {time.perf_counter() - t0:.2f}s, retrieving")
+    except BaseException:
+        discard_prefetch(prefetcher.id)
+        raise
+    print(f"   Plan streamed in {time.perf_counter() - t0:.2f}s ({slides.items} slides parsed incrementally)")
+    return AIMessage(content=slides.buffer), prefetcher.id
+
 def planner_node(state: AgentState):
     print("\n--- PLANNER AGENT (Content Strategist) ---")
     query = state['query']
@@ -61,9 +116,21 @@ def planner_node(state: AgentState):
     messages = [SystemMessage(content=PLANNER_SYSTEM_PROMPT)]
     if feedback:
         messages.append(HumanMessage(content=f"Previous plan feedback: {feedback}"))
+        previous_plan = state.get('deck_plan') or []
+        flagged = state.get('flagged_slides') or []
+        if previous_plan and flagged:
+            # Unchanged slides keep their spec hash, so retrieval/structuring for them is reused
+            messages.append(HumanMessage(content=(
+                f"Previous slides:\n{json.dumps(to_planner_schema(previous_plan), indent=2)}\n\n"
+                f"Revise ONLY slides {flagged}. Copy every other slide object exactly as it is."
+            )))
     messages.append(HumanMessage(content=f"User Query: {query}"))
     
-    response = llm.invoke(messages)
+    prefetch_id = None
+    if PLANNER_STREAMING:
+        response, prefetch_id = stream_plan(messages, state)
+    else:
+        response = get_llm("planner").invoke(messages)
     
     try:
         content = response.content
@@ -80,7 +147,8 @@ def planner_node(state: AgentState):
             else:
                 raise ValueError("No JSON object found in response")
                 
-        data = json.loads(json_str)
+        with span("planner.parse", payload_bytes=len(content)):
+            data = json.loads(json_str)
         
         # 1. Print Analysis & Plan Outline
         print("\n--- PLANNER AGENT OUTPUT ---")
@@ -103,23 +171,7 @@ def planner_node(state: AgentState):
         
         processed_plan = []
         for slide in raw_slides:
-            # Flatten retrieval strategy if present
-            retrieval = slide.get("retrieval_strategy", {})
-            cands = retrieval.get("candidate_queries", slide.get("candidate_queries", []))
-            bm25 = retrieval.get("BM25_keywords", slide.get("BM25_keywords", []))
-            
-            # Map keys to SlideMetadata
-            new_slide = {
-                "slide_id": slide.get("slide_id"),
-                "page_number": slide.get("slide_id"), # Assume 1-to-1
-                "page_topic": slide.get("page_topic"),
-                "candidate_queries": cands,
-                "BM25_keywords": bm25,
-                "active_nav_tab": slide.get("navigation_tab", "HOME"), # Map navigation_tab -> active_nav_tab
-                "action_headline": slide.get("action_headline", ""),
-                "selected_content": None,
-                "html_content": ""
-            }
+            new_slide = to_slide_metadata(slide)
             processed_plan.append(new_slide)
 
             print(f"Slide {new_slide['slide_id']}: {new_slide['page_topic']}")
@@ -133,8 +185,12 @@ def planner_node(state: AgentState):
             "total_slides": total_slides_val,
             "revision_count": state.get("revision_count", 0) + 1,
             "global_used_claims": [], # Reset claims for fresh generation cycle
-            "planner_messages": messages + [response] # Save history
+            "planner_messages_ref": put_messages(messages + [response]), # Save history
+            "prefetch_id": prefetch_id
         }
     except Exception as e:
         print(f"Error parsing planner output: {e}")
+        if prefetch_id:
+            from .retriever import discard_prefetch
+            discard_prefetch(prefetch_id)
         return {}
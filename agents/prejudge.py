@@ -0,0 +1,47 @@
+import json
+import os
+import threading
+from .config import PREJUDGE_MAX_CANDIDATES, PREJUDGE_PICK, PREJUDGE_MIN_MARGIN
+
+def prejudge(candidates, max_candidates=PREJUDGE_MAX_CANDIDATES, pick=PREJUDGE_PICK, min_margin=PREJUDGE_MIN_MARGIN):
+    """(selected_ids, rule) when the selection is unambiguous, else (None, None).
+
+    "count": no more than max_candidates passed retrieval, so take them all (best first).
+    "margin": the pick-th best score leads the next one by at least min_margin, so take the top pick.
+    Candidates without a score (BM25-only hits in hybrid mode) always go to the judge past the count rule:
+    a score gap among the vector hits says nothing about how they compare.
+    """
+    ranked = sorted(candidates, key=lambda c: -(c.get('score') or 0.0))
+    if len(ranked) <= max_candidates:
+        return [c['group_id'] for c in ranked], "count"
+    if pick < 1 or len(ranked) <= pick or any(c.get('score') is None for c in ranked):
+        return None, None
+    scores = [c['score'] for c in ranked[:pick + 1]]
+    if scores[pick - 1] - scores[pick] >= min_margin:
+        return [c['group_id'] for c in ranked[:pick]], "margin"
+    return None, None
+
+def agreement(a, b):
+    """Jaccard overlap of two selections (1.0 when both are empty)."""
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a | b else 1.0
+
+class JudgeRecorder:
+    """Appends one JSON line per judged slide: topic, scored candidates, judge and pre-judge picks."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, topic, candidates, judge_ids, prejudge_ids, rule):
+        line = json.dumps({
+            "topic": topic,
+            "candidates": [{"group_id": c['group_id'], "score": c.get('score')} for c in candidates],
+            "judge": judge_ids,
+            "prejudge": prejudge_ids,
+            "rule": rule,
+        })
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
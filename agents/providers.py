@@ -0,0 +1,105 @@
+"""Lazily built, process-wide API clients.
+
+Nodes ask for clients here instead of constructing them at import time, so importing
+`agents` stays cheap and every node shares one Pinecone / embeddings client. The heavy
+SDK imports (langchain_openai, pinecone) happen on first use.
+
+Tests and benchmarks swap clients through `overrides`, e.g.
+    monkeypatch.setitem(providers.overrides, "judge", FakeLLM())
+Keys are agent names ("planner", "judge", "navbar", "structurer", "image_vetter",
+"reviewer"), "llm" for every chat agent at once, "embeddings" and "pinecone".
+
+While tracing is on (see tracing.py) every client is handed out behind a span-recording
+proxy. Real chat clients share one pooled httpx client whose transport applies the
+request/token rate limiter (see rate_limit.py).
+"""
+import os
+import threading
+from .config import (
+    EMBED_CACHE_ENABLED, EMBED_CACHE_PATH, EMBED_CACHE_MAX_ENTRIES,
+    LLM_RPM, LLM_TPM, LLM_EXPECTED_OUTPUT_TOKENS, LLM_MAX_CONCURRENCY, LLM_MIN_CONCURRENCY,
+    LLM_MAX_RETRIES, LLM_POOL_CONNECTIONS
+)
+from .llm_cache import get_llm_cache
+from . import tracing
+
+CHAT_MODEL = "gpt-5.2" # User requested GPT-5.2
+EMBEDDING_MODEL = "text-embedding-3-large"
+
+overrides = {}
+_instances = {}
+_lock = threading.RLock() # factories may resolve other shared clients
+
+def _rate_limiter():
+    from .rate_limit import LLMRateLimiter
+    return LLMRateLimiter(LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY, LLM_MIN_CONCURRENCY)
+
+def _http_client():
+    import httpx
+    from .rate_limit import RateLimitedTransport
+    pool = httpx.HTTPTransport(limits=httpx.Limits(
+        max_connections=LLM_POOL_CONNECTIONS, max_keepalive_connections=LLM_POOL_CONNECTIONS
+    ))
+    transport = RateLimitedTransport(pool, get_rate_limiter(), LLM_MAX_RETRIES, LLM_EXPECTED_OUTPUT_TOKENS)
+    return httpx.Client(transport=transport, timeout=httpx.Timeout(600.0, connect=10.0))
+
+def _chat_client(agent):
+    from langchain_openai import ChatOpenAI
+    # Retries live in the shared transport so 429s feed the adaptive limiter
+    return ChatOpenAI(model=CHAT_MODEL, temperature=0, cache=get_llm_cache(agent),
+                      http_client=get_http_client(), max_retries=0)
+
+def _embeddings_client():
+    from langchain_openai import OpenAIEmbeddings
+    embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+    if EMBED_CACHE_ENABLED:
+        from .embedding_cache import CachedEmbeddings
+        embeddings = CachedEmbeddings(embeddings, EMBED_CACHE_PATH, max_entries=EMBED_CACHE_MAX_ENTRIES)
+    return embeddings
+
+def _pinecone_client():
+    from pinecone import Pinecone
+    return Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+
+def _shared(key, factory, *args):
+    instance = _instances.get(key)
+    if instance is None:
+        with _lock:
+            instance = _instances.get(key)
+            if instance is None:
+                instance = _instances[key] = factory(*args)
+    return instance
+
+def get_llm(agent):
+    """Chat model for one agent; each agent keeps its own response cache namespace."""
+    override = overrides.get(agent, overrides.get("llm"))
+    llm = override if override is not None else _shared(("llm", agent), _chat_client, agent)
+    return tracing.TracedLLM(llm, agent) if tracing.enabled() else llm
+
+def get_rate_limiter():
+    """The process-wide LLMRateLimiter behind every chat agent."""
+    return _shared("rate_limiter", _rate_limiter)
+
+def get_http_client():
+    """Connection-pooled httpx client shared by every ChatOpenAI instance."""
+    return _shared("http_client", _http_client)
+
+def llm_transport_stats():
+    """Limiter metrics, or None before the first chat client was built."""
+    limiter = _instances.get("rate_limiter")
+    return limiter.metrics() if limiter is not None else None
+
+def get_embeddings():
+    override = overrides.get("embeddings")
+    embeddings = override if override is not None else _shared("embeddings", _embeddings_client)
+    return tracing.TracedEmbeddings(embeddings) if tracing.enabled() else embeddings
+
+def get_pinecone():
+    override = overrides.get("pinecone")
+    client = override if override is not None else _shared("pinecone", _pinecone_client)
+    return tracing.TracedPinecone(client) if tracing.enabled() else client
+
+def reset():
+    """Drop every constructed client (overrides are left alone)."""
+    with _lock:
+        _instances.clear()
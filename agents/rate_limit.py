@@ -0,0 +1,204 @@
+import json
+import random
+import threading
+import time
+from collections import deque
+import httpx
+from .tokens import count_tokens
+
+class TokenBucket:
+    """Refills `limit` units every `period` seconds. Withdrawals may overdraw on settle()."""
+
+    def __init__(self, limit, period=60.0):
+        self.capacity = float(limit)
+        self.rate = limit / period
+        self.level = float(limit)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount):
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self.level >= amount:
+                    self.level -= amount
+                    return
+                shortfall = (amount - self.level) / self.rate
+            time.sleep(min(shortfall, 0.5))
+
+    def settle(self, delta):
+        """Return (delta > 0) or charge (delta < 0) the difference between reserved and actual use."""
+        with self._lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + delta)
+
+class AdaptiveConcurrency:
+    """AIMD in-flight limit: +1/limit per success, halved on a 429 (at most once per cooldown)."""
+
+    def __init__(self, maximum, minimum=1, cooldown=1.0):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.cooldown = cooldown
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled=False):
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if throttled:
+                if now - self._last_decrease >= self.cooldown:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._last_decrease = now
+                    self.decreases += 1
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+class LLMRateLimiter:
+    """Request + token buckets in front of adaptive concurrency, with wait / service metrics."""
+
+    def __init__(self, rpm, tpm, max_concurrency=16, min_concurrency=1, period=60.0, cooldown=1.0):
+        self.requests = TokenBucket(rpm, period)
+        self.tokens = TokenBucket(tpm, period)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, min_concurrency, cooldown)
+        self.queue_waits = deque(maxlen=10000)
+        self.service_times = deque(maxlen=10000)
+        self.counts = {"requests": 0, "throttled": 0, "errors": 0, "tokens": 0}
+        self._lock = threading.Lock()
+
+    def acquire(self, reserved_tokens):
+        """Block until a request may be sent. Returns the time spent waiting."""
+        t0 = time.perf_counter()
+        self.concurrency.acquire()
+        self.requests.acquire(1)
+        self.tokens.acquire(reserved_tokens)
+        wait = time.perf_counter() - t0
+        with self._lock:
+            self.queue_waits.append(wait)
+        return wait
+
+    def release(self, service_time, reserved_tokens, used_tokens=None, throttled=False, error=False):
+        self.concurrency.release(throttled)
+        if used_tokens is not None:
+            self.tokens.settle(reserved_tokens - used_tokens)
+        with self._lock:
+            self.service_times.append(service_time)
+            self.counts["requests"] += 1
+            self.counts["throttled"] += throttled
+            self.counts["errors"] += error
+            self.counts["tokens"] += used_tokens if used_tokens is not None else reserved_tokens
+
+    def metrics(self):
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return {"mean": 0.0, "p50": 0.0, "p95": 0.0}
+            return {"mean": sum(values) / len(values), "p50": values[len(values) // 2],
+                    "p95": values[int(0.95 * (len(values) - 1))]}
+        with self._lock:
+            return {**self.counts, "concurrency_limit": round(self.concurrency.limit, 2),
+                    "backoffs": self.concurrency.decreases,
+                    "queue_wait": summary(self.queue_waits), "service_time": summary(self.service_times)}
+
+def estimate_request_tokens(body, expected_output_tokens):
+    """Prompt tokens of a chat completions request body plus the completion budget."""
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        return expected_output_tokens
+    text = []
+    for message in payload.get("messages") or []:
+        content = message.get("content")
+        if isinstance(content, list): # multimodal parts
+            content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+        text.append(content or "")
+    output = payload.get("max_completion_tokens") or payload.get("max_tokens") or expected_output_tokens
+    return count_tokens("\n".join(text)) + output
+
+RETRY_STATUSES = {408, 409, 429} # plus every 5xx, as the OpenAI SDK retries them
+
+def should_retry(status_code):
+    return status_code in RETRY_STATUSES or status_code >= 500
+
+def retry_delay(response, attempt):
+    """Exponential backoff with jitter, never shorter than the server's retry-after (if there was a response)."""
+    backoff = min(30.0, 0.25 * 2 ** attempt) * random.uniform(0.5, 1.0)
+    if response is None:
+        return backoff
+    try:
+        return max(backoff, float(response.headers.get("retry-after", 0)))
+    except ValueError:
+        return backoff
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """httpx transport that paces requests through an LLMRateLimiter and does the retrying itself.
+
+    Sits below the OpenAI SDK (created with max_retries=0), so cached LangChain responses
+    never touch the limiter and every agent shares one connection pool. Retries what the SDK
+    would have: 408 / 409 / 429, 5xx and connection-level errors, with the same backoff;
+    only 429s shrink the adaptive concurrency limit.
+    """
+
+    def __init__(self, transport, limiter, max_retries=5, expected_output_tokens=1000):
+        self.transport = transport
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.expected_output_tokens = expected_output_tokens
+
+    def handle_request(self, request):
+        body = request.read()
+        reserved = estimate_request_tokens(body, self.expected_output_tokens)
+        streaming = b'"stream": true' in body or b'"stream":true' in body
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(reserved)
+            t0 = time.perf_counter()
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                self.limiter.release(time.perf_counter() - t0, reserved, used_tokens=0, error=True)
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(retry_delay(None, attempt))
+                continue
+            except Exception:
+                self.limiter.release(time.perf_counter() - t0, reserved, error=True)
+                raise
+
+            if should_retry(response.status_code) and attempt < self.max_retries:
+                response.read()
+                response.close()
+                throttled = response.status_code == 429
+                self.limiter.release(time.perf_counter() - t0, reserved, used_tokens=0, throttled=throttled,
+                                     error=not throttled)
+                time.sleep(retry_delay(response, attempt))
+                continue
+
+            used = None
+            if not streaming: # streamed bodies are settled at the reserved estimate
+                response.read()
+                try:
+                    used = json.loads(response.content).get("usage", {}).get("total_tokens")
+                except (ValueError, AttributeError):
+                    pass
+            self.limiter.release(time.perf_counter() - t0, reserved, used_tokens=used,
+                                 throttled=response.status_code == 429, error=response.status_code >= 500)
+            return response
+
+    def close(self):
+        self.transport.close()
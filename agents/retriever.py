@@ -1,16 +1,29 @@
-from pinecone import Pinecone
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .state import AgentState
+from .config import (
+    RETRIEVER_MAX_WORKERS, EMBED_BATCH_SIZE, GROUP_SEARCH_TOP_K, GROUP_INDEX_BACKEND, GROUP_INDEX_SNAPSHOT,
+    CLAIM_STORE_BACKEND, CLAIM_STORE_PATH,
+    RETRIEVAL_MODE, HYBRID_MAX_CANDIDATES, BM25_TOP_K, RRF_K, PREJUDGE_MODE, JUDGE_RECORD_PATH,
+    ALLOCATION_MODE, GROUPS_PER_SLIDE
+)
+from .local_index import LocalGroupIndex
+from .claim_store import ClaimStore
+from .bm25 import build_group_bm25, reciprocal_rank_fusion
+from .tokens import count_message_tokens
+from .prejudge import prejudge, JudgeRecorder
+from .allocation import allocate
+from .artifacts import content_ref, put_messages
+from .memo import slide_spec_hash, add_savings
+from .providers import get_llm, get_embeddings, get_pinecone
+from .tracing import span, bind_context, enabled as tracing_enabled, TracedIndex
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import copy
+import threading
 import os
 import json
-from dotenv import load_dotenv
-
-load_dotenv()
-
-pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
-embeddings = OpenAIEmbeddings(model="text-embedding-3-large") 
-llm = ChatOpenAI(model="gpt-5.2", temperature=0)
+import time
+import uuid
 
 JUDGE_SYSTEM_PROMPT = """Role: Content Relevance Judge.
 Task: Select the most relevant content groups for a presentation slide.
@@ -29,14 +42,94 @@ Output Format:
 ["group-id-1", "group-id-2"]
 """
 
-def get_group_candidates(queries):
-    """Embed queries and search group index."""
-    index = pc.Index("content-gen-group-index")
+DECK_JUDGE_SYSTEM_PROMPT = """Role: Deck Allocation Judge.
+Task: Assign approved content groups to the slides of one presentation.
+
+Input:
+1. Groups (ID + Description), listed once
+2. Slides (Slide key + Topic + candidate Group IDs with retrieval scores)
+
+Instructions:
+- For each slide, select up to 3 of its candidate groups that best cover its topic.
+- Use each group on at most one slide; give it to the slide it serves best.
+- Avoid redundant groups if they cover the exact same thing (prefer the one with more detailed description).
+- Return ONLY a JSON object mapping every slide key to its list of Group IDs.
+
+Output Format:
+{"S1": ["group-id-1", "group-id-2"], "S2": ["group-id-3"]}
+"""
+
+claim_store = ClaimStore(CLAIM_STORE_PATH) if CLAIM_STORE_BACKEND == "local" else None
+_local_group_index = None
+_bm25 = None
+_local_lock = threading.Lock()
+judge_recorder = JudgeRecorder(JUDGE_RECORD_PATH) if JUDGE_RECORD_PATH else None
+shared_lookups = None # SingleFlight shared by concurrent decks (see batch.py); None = no sharing
+
+def share_lookups(flight):
+    """Route group searches and claim fetches through flight (a SingleFlight), or stop sharing with None."""
+    global shared_lookups
+    shared_lookups = flight
+
+def _lookup(key, fn):
+    return fn() if shared_lookups is None else shared_lookups.do(key, fn)
+
+def load_local_group_index():
+    """Memory-mapped group snapshot, loaded once per process. None if no snapshot exists."""
+    global _local_group_index
+    with _local_lock:
+        if _local_group_index is None and LocalGroupIndex.exists(GROUP_INDEX_SNAPSHOT):
+            _local_group_index = LocalGroupIndex(GROUP_INDEX_SNAPSHOT)
+            print(f"   Loaded local group index ({len(_local_group_index.ids)} groups)")
+    return _local_group_index
+
+def get_group_index():
+    """Group index backend selected by GROUP_INDEX_BACKEND (local snapshot or Pinecone)."""
+    if GROUP_INDEX_BACKEND == "local":
+        local_index = load_local_group_index()
+        if local_index is not None:
+            return TracedIndex(local_index, "local-group-index") if tracing_enabled() else local_index
+        print(f"   Warning: no group snapshot at {GROUP_INDEX_SNAPSHOT}, using Pinecone.")
+    return get_pinecone().Index("content-gen-group-index")
+
+def get_bm25_index():
+    """Lexical index over the group snapshot (+ local claim text). None when no snapshot exists."""
+    global _bm25
+    if _bm25 is None:
+        group_index = load_local_group_index()
+        if group_index is None:
+            print(f"   Warning: hybrid retrieval needs a group snapshot at {GROUP_INDEX_SNAPSHOT}; using vector only.")
+            _bm25 = False
+        else:
+            store = claim_store
+            if store is None and os.path.exists(CLAIM_STORE_PATH):
+                store = ClaimStore(CLAIM_STORE_PATH)
+            with _local_lock:
+                if _bm25 is None:
+                    _bm25 = build_group_bm25(group_index, store)
+    return _bm25 or None
+
+def embed_queries(queries, embedder=None, batch_size=None):
+    """Embed unique queries with as few embed_documents calls as batch_size allows. Returns query -> vector."""
+    embedder = embedder or get_embeddings()
+    batch_size = max(1, batch_size or EMBED_BATCH_SIZE)
+    unique = list(dict.fromkeys(q for q in queries if q))
+    vectors = {}
+    for i in range(0, len(unique), batch_size):
+        batch = unique[i:i + batch_size]
+        vectors.update(zip(batch, embedder.embed_documents(batch)))
+    return vectors
+
+def get_group_candidates(queries, vectors=None):
+    """Embed queries (unless pre-embedded in vectors) and search group index."""
+    index = get_group_index()
     candidates = {} # map id -> metadata
+    vectors = vectors or {}
     
     for q in queries:
-        vector = embeddings.embed_query(q)
-        results = index.query(vector=vector, top_k=5, include_metadata=True)
+        vector = vectors[q] if q in vectors else get_embeddings().embed_query(q)
+        results = _lookup(("group_query", GROUP_INDEX_BACKEND, GROUP_SEARCH_TOP_K, q),
+                          lambda: index.query(vector=vector, top_k=GROUP_SEARCH_TOP_K, include_metadata=True))
         for match in results.matches:
             if match.score > 0.5: # threshold
                 candidates[match.metadata['group_id']] = {
@@ -47,100 +140,437 @@ def get_group_candidates(queries):
                 }
     return list(candidates.values())
 
+def get_hybrid_candidates(queries, keywords, vectors=None):
+    """Vector candidates fused with BM25 keyword hits (reciprocal rank fusion), capped to the best few."""
+    vector_candidates = get_group_candidates(queries, vectors)
+    bm25 = get_bm25_index()
+    if bm25 is None:
+        return vector_candidates
+    bm25_index, groups = bm25
+
+    by_id = {c['group_id']: c for c in vector_candidates}
+    vector_ranking = [c['group_id'] for c in sorted(vector_candidates, key=lambda c: -c['score'])]
+    lexical_ranking = [gid for gid, _ in bm25_index.search(keywords, top_k=BM25_TOP_K)] if keywords else []
+
+    fused = reciprocal_rank_fusion([vector_ranking, lexical_ranking], k=RRF_K)[:HYBRID_MAX_CANDIDATES]
+    return [by_id.get(gid) or dict(groups[gid]) for gid in fused]
+
 def get_claims_by_ids(claim_ids):
-    """Fetch specific claims by ID."""
+    """Fetch specific claims by ID (local claim store first when enabled, Pinecone for the rest)."""
     if not claim_ids:
         return []
-        
-    index = pc.Index("content-gen-claim-index")
-    # Using fetch for direct ID lookup (more efficient & accurate)
-    # Note: claim_ids is a list of strings
-    # We might need to batch this if there are many, but for a slide it's small.
-    # Pinecone fetch: index.fetch(ids=['id1', 'id2'])
-    
+
     try:
         # Some claim lists might be stored as stringified JSON in metadata, check type
         if isinstance(claim_ids, str):
             claim_ids = json.loads(claim_ids)
-            
-        response = index.fetch(ids=claim_ids)
-        # response is {'vectors': {'id1': {...}, 'id2': {...}}}
-        # We need the metadata from each
-        claims = []
-        for cid in claim_ids:
-            if cid in response['vectors']:
-                claims.append(response['vectors'][cid]['metadata'])
-        return claims
+        if shared_lookups is None:
+            return _fetch_claims(claim_ids)
+        # Other decks get the same claims, so hand each caller its own copy
+        return copy.deepcopy(shared_lookups.do(("claims", tuple(claim_ids)), lambda: _fetch_claims(claim_ids)))
     except Exception as e:
         print(f"Error fetching claims by ID: {e}")
         return []
 
+def _fetch_claims(claim_ids):
+    if claim_store is not None:
+        with span("claim_store.get_many", "store", ids=len(claim_ids)) as s:
+            records = claim_store.get_many(claim_ids)
+            s.set(cache_hit=len(records) == len(claim_ids), hits=len(records))
+        missing = [cid for cid in claim_ids if cid not in records]
+        if missing:
+            # Index() describes the index over the network, so only build it for a real miss
+            records.update(claim_store.fetch_from_index(get_pinecone().Index("content-gen-claim-index"), missing))
+        return [records[cid].to_dict() for cid in claim_ids if cid in records]
+
+    # Using fetch for direct ID lookup (more efficient & accurate)
+    response = get_pinecone().Index("content-gen-claim-index").fetch(ids=claim_ids)
+    # response is {'vectors': {'id1': {...}, 'id2': {...}}}
+    # We need the metadata from each
+    claims = []
+    for cid in claim_ids:
+        if cid in response['vectors']:
+            claims.append(response['vectors'][cid]['metadata'])
+    return claims
+
+def map_slides(fn, items, max_workers):
+    """Apply fn to every item, preserving order. Uses a thread pool when max_workers > 1."""
+    if max_workers <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(bind_context(fn), items))
+
+def search_slide(slide, vectors=None):
+    """Broad retrieval for one slide (no judging). Touches no shared state."""
+    queries = slide.get('candidate_queries', [])
+    result = {
+        "candidates": [], "selected_ids": [], "messages": [], "prejudge": None,
+        "timings": {"search": 0.0, "judge": 0.0, "judge_tokens": 0}
+    }
+
+    # 1. Broad Retrieval (optionally fused with BM25 over the planner's keywords)
+    t0 = time.perf_counter()
+    if RETRIEVAL_MODE == "hybrid":
+        candidates = get_hybrid_candidates(queries, slide.get('BM25_keywords', []), vectors)
+    else:
+        candidates = get_group_candidates(queries, vectors)
+    result['timings']['search'] = time.perf_counter() - t0
+    result['candidates'] = candidates
+    return result
+
+def search_and_judge(slide, vectors=None):
+    """Broad retrieval + LLM judge for one slide. Touches no shared state, so slides can run concurrently."""
+    result = search_slide(slide, vectors)
+    topic = slide['page_topic']
+    candidates = result['candidates']
+    if not candidates:
+        return result
+
+    # 2a. Deterministic pre-judge: few candidates or a clear score gap need no LLM
+    prejudged_ids, rule = prejudge(candidates) if PREJUDGE_MODE != "off" else (None, None)
+    if PREJUDGE_MODE == "on" and prejudged_ids is not None:
+        result['selected_ids'] = prejudged_ids
+        result['prejudge'] = rule
+        return result
+
+    # 2b. LLM Judge Reranking (ambiguous slides only)
+    candidate_text = "\n".join([f"ID: {c['group_id']} | Desc: {c['description']}" for c in candidates])
+    judge_msg = f"Topic: {topic}\n\nCandidates:\n{candidate_text}"
+
+    current_messages = [
+        SystemMessage(content=JUDGE_SYSTEM_PROMPT),
+        HumanMessage(content=judge_msg)
+    ]
+    result['timings']['judge_tokens'] = count_message_tokens(current_messages)
+
+    t0 = time.perf_counter()
+    try:
+        response = get_llm("judge").invoke(current_messages)
+        result['messages'] = current_messages + [response]
+        selected_ids = json.loads(response.content.replace("```json", "").replace("```", "").strip())
+    except Exception as e:
+        print(f"   -> Judge Error on '{topic}': {e}. Fallback to top score.")
+        selected_ids = [candidates[0]['group_id']]
+    result['timings']['judge'] = time.perf_counter() - t0
+    result['selected_ids'] = selected_ids
+    if judge_recorder is not None:
+        judge_recorder.record(topic, candidates, selected_ids, prejudged_ids, rule)
+    return result
+
+def deck_judge(slides, results):
+    """One judge call for the given slides. Returns (per-slide picks or None, messages, seconds, tokens)."""
+    groups = {}
+    lines = []
+    for n, (slide, result) in enumerate(zip(slides, results), 1):
+        ranked = sorted(result['candidates'], key=lambda c: -(c.get('score') or 0.0))
+        for c in ranked:
+            groups.setdefault(c['group_id'], c.get('description'))
+        scored = ", ".join(f"{c['group_id']} ({c['score']:.2f})" if c.get('score') is not None else c['group_id']
+                           for c in ranked)
+        lines.append(f"S{n}: {slide['page_topic']}\n   Candidates: {scored}")
+    group_text = "\n".join(f"ID: {gid} | Desc: {desc}" for gid, desc in groups.items())
+    messages = [
+        SystemMessage(content=DECK_JUDGE_SYSTEM_PROMPT),
+        HumanMessage(content=f"Groups:\n{group_text}\n\nSlides:\n" + "\n".join(lines))
+    ]
+    tokens = count_message_tokens(messages)
+
+    t0 = time.perf_counter()
+    try:
+        response = get_llm("judge").invoke(messages)
+        picks = json.loads(response.content.replace("```json", "").replace("```", "").strip())
+        if not isinstance(picks, dict):
+            raise ValueError("expected a JSON object keyed by slide")
+        preferred = [picks.get(f"S{n}") for n in range(1, len(slides) + 1)]
+        messages = messages + [response]
+    except Exception as e:
+        print(f"   -> Deck Judge Error: {e}. Falling back to retrieval scores.")
+        preferred = [None] * len(slides)
+    return preferred, messages, time.perf_counter() - t0, tokens
+
+def allocate_deck(slides, results, used_groups, used_claims):
+    """Deck-wide selection (ALLOCATION_MODE deck_judge / optimizer): fills result['selected_ids'] in place.
+
+    Clear slides keep their pre-judge picks, ambiguous ones share a single deck judge call
+    (deck_judge mode), and allocate() resolves overlaps across the whole deck.
+    Returns the judge messages and {"judge": seconds, "judge_tokens": n, "judged_slides": n}.
+    """
+    preferred = [None] * len(slides)
+    ambiguous = []
+    for i, result in enumerate(results):
+        if not result['candidates']:
+            continue
+        ids, rule = prejudge(result['candidates']) if PREJUDGE_MODE == "on" else (None, None)
+        if ids is not None:
+            preferred[i], result['prejudge'] = ids, rule
+        else:
+            ambiguous.append(i)
+
+    messages, stats = [], {"judge": 0.0, "judge_tokens": 0, "judged_slides": 0}
+    if ALLOCATION_MODE == "deck_judge" and ambiguous:
+        picks, messages, seconds, tokens = deck_judge([slides[i] for i in ambiguous], [results[i] for i in ambiguous])
+        for i, ids in zip(ambiguous, picks):
+            preferred[i] = ids if isinstance(ids, list) else None
+        stats = {"judge": seconds, "judge_tokens": tokens, "judged_slides": len(ambiguous)}
+
+    selections = allocate([r['candidates'] for r in results], used_groups, used_claims,
+                          per_slide=GROUPS_PER_SLIDE, preferred=preferred)
+    for result, selected in zip(results, selections):
+        result['selected_ids'] = selected
+    return messages, stats
+
+class SlidePrefetch:
+    """Retrieval started by the streaming planner for each slide as soon as it is planned.
+
+    Runs what retrieval can do per slide: embed + search, plus the judge in "slide"
+    allocation mode (deck modes judge once all slides are in). retriever_node picks the
+    results up by spec hash and retrieves anything missing as usual.
+    """
+
+    def __init__(self, max_workers, skip=()):
+        self.id = uuid.uuid4().hex
+        self.skip = set(skip)
+        self.started_at = time.perf_counter()
+        self.first_ready = None
+        self._futures = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, slide):
+        spec_hash = slide_spec_hash(slide)
+        if spec_hash not in self.skip and spec_hash not in self._futures:
+            self._futures[spec_hash] = self._pool.submit(bind_context(self._retrieve), slide)
+
+    def _retrieve(self, slide):
+        vectors = embed_queries(slide.get('candidate_queries', []))
+        result = search_and_judge(slide, vectors) if ALLOCATION_MODE == "slide" else search_slide(slide, vectors)
+        if self.first_ready is None:
+            self.first_ready = time.perf_counter() - self.started_at
+        return result
+
+    def covers(self, spec_hash):
+        """Whether the slide was submitted and not yet taken."""
+        return spec_hash in self._futures
+
+    def take(self, spec_hash):
+        """The slide's retrieval result (waiting for it if still running), or None if never submitted."""
+        future = self._futures.pop(spec_hash, None)
+        return future.result() if future is not None else None
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+_prefetches = {}
+_prefetch_lock = threading.Lock()
+
+def start_prefetch(skip=(), max_workers=None):
+    prefetch = SlidePrefetch(max_workers or RETRIEVER_MAX_WORKERS, skip)
+    with _prefetch_lock:
+        _prefetches[prefetch.id] = prefetch
+    return prefetch
+
+def take_prefetch(prefetch_id):
+    """Unregister and return the prefetch behind a state's prefetch_id (None after a resume or restart)."""
+    with _prefetch_lock:
+        return _prefetches.pop(prefetch_id, None) if prefetch_id else None
+
+def discard_prefetch(prefetch_id):
+    prefetch = take_prefetch(prefetch_id)
+    if prefetch is not None:
+        prefetch.close()
+
+def prefetch_claims(results, max_workers):
+    """Fetch claims for every judged group once, keyed by group id."""
+    claim_ids_by_gid = {}
+    for result in results:
+        for gid in result['selected_ids']:
+            candidate_obj = next((c for c in result['candidates'] if c['group_id'] == gid), None)
+            if candidate_obj and gid not in claim_ids_by_gid:
+                claim_ids_by_gid[gid] = candidate_obj.get('claim_ids', [])
+
+    def fetch(gid):
+        t0 = time.perf_counter()
+        claim_ids = claim_ids_by_gid[gid]
+        if isinstance(claim_ids, str):
+            claim_ids = json.loads(claim_ids)
+        claims = get_claims_by_ids(claim_ids)
+        return claims, time.perf_counter() - t0, claim_ids
+
+    gids = list(claim_ids_by_gid)
+    return dict(zip(gids, map_slides(fetch, gids, max_workers)))
+
+def reserve_reused(memo, hashes, global_used_claims):
+    """Reserve the groups and claims of slides reused from the memo (in order), appending new group IDs
+    to global_used_claims in place. Returns the (used_groups, used_claims) sets fresh slides dedup against."""
+    used_groups = set(global_used_claims)
+    used_claims = set()
+    for spec_hash in hashes:
+        for grp in memo[spec_hash]['selected_content'] or []:
+            used_claims.update(grp.claim_ids)
+            if grp.group_id not in used_groups:
+                used_groups.add(grp.group_id)
+                global_used_claims.append(grp.group_id)
+    return used_groups, used_claims
+
+def reserve_group(gid, claim_ids, claims, used_groups, used_claims):
+    """The (claim_ids, claims) of a group not already used on an earlier slide, reserving them.
+
+    None when the group or all of its claims are taken.
+    """
+    if gid in used_groups:
+        return None
+    if len(claims) == len(claim_ids):
+        # Claims line up with their IDs: drop only the ones already on another slide
+        kept = [(cid, c) for cid, c in zip(claim_ids, claims) if cid not in used_claims]
+        claim_ids, claims = [cid for cid, _ in kept], [c for _, c in kept]
+    elif set(claim_ids) <= used_claims:
+        claims = []
+    if not claims:
+        return None
+    used_groups.add(gid)
+    used_claims.update(claim_ids)
+    return claim_ids, claims
+
+def reserve_content(result, fetched, used_groups, used_claims):
+    """Deduplicate one slide's judged groups against the earlier slides and reserve what it keeps.
+
+    Returns (ContentRefs, claim fetch seconds, claim fetches).
+    """
+    selection, fetch_seconds, fetches = [], 0.0, 0
+    for gid in result['selected_ids']:
+        if gid in used_groups or gid not in fetched:
+            continue
+        claims, fetch_time, claim_ids = fetched[gid]
+        fetch_seconds += fetch_time
+        fetches += 1
+        kept = reserve_group(gid, claim_ids, claims, used_groups, used_claims)
+        if kept:
+            # State keeps the claim IDs; the claim metadata goes to the artifact store
+            selection.append(content_ref(gid, *kept))
+    return selection, fetch_seconds, fetches
+
+def print_timings(timings):
+    print("   Retrieval latency per slide (s):")
+    print("   slide | search |  judge |  fetch |  total | judge tokens")
+    for t in timings:
+        print(f"   {t['slide_id']!s:>5} | {t['search']:6.2f} | {t['judge']:6.2f} | {t['fetch']:6.2f} | {t['total']:6.2f} | {t['judge_tokens']:>12}")
+    judge_tokens = sum(t['judge_tokens'] for t in timings)
+    print(f"   Judge prompt tokens: {judge_tokens} total, {judge_tokens / max(len(timings), 1):.0f} per slide")
+    prejudged = [t for t in timings if t.get('prejudge')]
+    if prejudged:
+        print(f"   Judge calls avoided by pre-judge: {len(prejudged)} of {len(timings)} slides")
+
 def retriever_node(state: AgentState):
     print("--- RETRIEVER AGENT (Search & Judge) ---")
     plan = state['deck_plan']
     global_used_claims = state.get('global_used_claims', []) or []
-    
+    max_workers = state.get('retriever_max_workers') or RETRIEVER_MAX_WORKERS
+    memo = dict(state.get('slide_memo') or {})
+    savings = state.get('revision_savings') or {}
+
+    # Slides whose spec is unchanged since the last pass (and weren't flagged) reuse their content
+    hashes = [slide_spec_hash(slide) for slide in plan]
+    reused = {i for i, h in enumerate(hashes) if 'selected_content' in memo.get(h, {})}
+    fresh = [slide for i, slide in enumerate(plan) if i not in reused]
+    print(f"   Retrieving {len(fresh)} slides, reusing {len(reused)} (workers={max_workers})")
+
+    # Reused slides keep their groups, so reserve them (and their claims) before fresh slides deduplicate
+    used_groups, used_claims = reserve_reused(memo, [hashes[i] for i in sorted(reused)], global_used_claims)
+
+    # Slides the streaming planner already retrieved (none after a resume: everything runs here)
+    prefetched = {}
+    prefetch = take_prefetch(state.get('prefetch_id'))
+    if prefetch is not None:
+        for n, slide in enumerate(fresh):
+            result = prefetch.take(slide_spec_hash(slide))
+            if result is not None:
+                prefetched[n] = result
+        prefetch.close()
+        if prefetch.first_ready is not None:
+            print(f"   Streaming planner: {len(prefetched)} slides retrieved while planning "
+                  f"(first ready {prefetch.first_ready:.2f}s after planning started)")
+    pending = [slide for n, slide in enumerate(fresh) if n not in prefetched]
+
+    # 0. Embed every remaining candidate query up front, in batches
+    t0 = time.perf_counter()
+    all_queries = [q for slide in pending for q in slide.get('candidate_queries', [])]
+    vectors = embed_queries(all_queries)
+    print(f"   Embedded {len(vectors)} unique queries in {time.perf_counter() - t0:.2f}s")
+    embeddings = get_embeddings()
+    if hasattr(embeddings, "stats"):
+        stats = embeddings.stats()
+        print(f"   Embedding cache: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%})")
+
+    # 1-2. Search (and in "slide" mode judge) every remaining slide fanned out, or allocate across the deck
+    retrieve = search_and_judge if ALLOCATION_MODE == "slide" else search_slide
+    pending_results = iter(map_slides(partial(retrieve, vectors=vectors), pending, max_workers))
+    fresh_results = [prefetched[n] if n in prefetched else next(pending_results) for n in range(len(fresh))]
+    deck_stats = None
+    if ALLOCATION_MODE != "slide":
+        deck_messages, deck_stats = allocate_deck(fresh, fresh_results, used_groups, used_claims)
+    fetched = prefetch_claims(fresh_results, max_workers)
+    fresh_results = iter(fresh_results)
+
     updated_plan = []
-    retriever_history = []
-    
-    for slide in plan:
-        queries = slide.get('candidate_queries', [])
-        topic = slide['page_topic']
-        print(f"Processing Slide: {topic}")
-        
-        # 1. Broad Retrieval
-        candidates = get_group_candidates(queries)
+    retriever_history = list(deck_messages) if deck_stats else []
+    timings = []
+
+    # 3. Deduplicate in slide order so the result matches the serial run
+    for i, slide in enumerate(plan):
+        print(f"Processing Slide: {slide['page_topic']}")
+        slide['spec_hash'] = hashes[i]
+        if i in reused:
+            entry = memo[hashes[i]]
+            print("   -> Unchanged since last revision, reusing selection.")
+            slide['selected_content'] = entry['selected_content'] # immutable ContentRefs, safe to share
+            savings = add_savings(savings, slides_reused=1, **entry['calls'])
+            timings.append({"slide_id": slide.get('slide_id'), "search": 0.0, "judge": 0.0, "fetch": 0.0,
+                            "total": 0.0, "judge_tokens": 0, "reused": True})
+            updated_plan.append(slide)
+            continue
+
+        result = next(fresh_results)
+        retriever_history.extend(result['messages'])
+        slide_timing = {"slide_id": slide.get('slide_id'), "fetch": 0.0, "prejudge": result['prejudge'],
+                        **result['timings']}
+        calls = {"llm_calls": 0, "vector_calls": len(slide.get('candidate_queries', []))}
+
+        candidates = result['candidates']
         if not candidates:
             print("   -> No candidates found.")
+            slide_timing['total'] = slide_timing['search']
+            timings.append(slide_timing)
+            memo[hashes[i]] = {"selected_content": slide.get('selected_content'), "calls": calls}
             updated_plan.append(slide)
             continue
-            
-        print(f"   Found {len(candidates)} candidates. Running Judge...")
-        
-        # 2. LLM Judge Reranking
-        candidate_text = "\n".join([f"ID: {c['group_id']} | Desc: {c['description']}" for c in candidates])
-        judge_msg = f"Topic: {topic}\n\nCandidates:\n{candidate_text}"
-        
-        # Capture current interaction
-        current_messages = [
-            SystemMessage(content=JUDGE_SYSTEM_PROMPT),
-            HumanMessage(content=judge_msg)
-        ]
-        
-        try:
-            response = llm.invoke(current_messages)
-            retriever_history.extend(current_messages + [response]) # Accumulate history
-            
-            selected_ids = json.loads(response.content.replace("```json", "").replace("```", "").strip())
-        except Exception as e:
-            print(f"   -> Judge Error: {e}. Fallback to top score.")
-            selected_ids = [candidates[0]['group_id']]
-
-        # 3. Fetch Content & Deduplicate
-        final_selection = []
-        for gid in selected_ids:
-            if gid in global_used_claims:
-                continue
-            
-            # Find the candidate object to get claim_ids
-            candidate_obj = next((c for c in candidates if c['group_id'] == gid), None)
-            if not candidate_obj:
-                continue
-
-            claims = get_claims_by_ids(candidate_obj.get('claim_ids', []))
-            if claims:
-                final_selection.append({
-                    "group_id": gid,
-                    "claims": claims
-                })
-                global_used_claims.append(gid)
-        
+
+        if result['prejudge']:
+            print(f"   Found {len(candidates)} candidates, accepted by pre-judge ({result['prejudge']}).")
+        else:
+            print(f"   Found {len(candidates)} candidates.")
+            if deck_stats is None: # the deck judge call is counted once, below
+                calls['llm_calls'] += 1
+        final_selection, slide_timing['fetch'], fetches = reserve_content(result, fetched, used_groups, used_claims)
+        calls['vector_calls'] += fetches
+        global_used_claims.extend(grp.group_id for grp in final_selection)
+
         print(f"   -> Selected {len(final_selection)} Groups.")
+        slide_timing['total'] = slide_timing['search'] + slide_timing['judge'] + slide_timing['fetch']
+        timings.append(slide_timing)
         slide['selected_content'] = final_selection
+        memo[hashes[i]] = {"selected_content": final_selection, "calls": calls}
         updated_plan.append(slide)
-        
+
+    print_timings(timings)
+    if deck_stats is not None:
+        calls_made = 1 if deck_stats['judged_slides'] else 0
+        print(f"   Deck allocation ({ALLOCATION_MODE}): {calls_made} judge call for {deck_stats['judged_slides']} "
+              f"ambiguous slides, {deck_stats['judge']:.2f}s, {deck_stats['judge_tokens']} prompt tokens")
+
     return {
         "deck_plan": updated_plan,
         "global_used_claims": global_used_claims,
-        "retriever_messages": retriever_history
+        "retriever_messages_ref": put_messages(retriever_history),
+        "retriever_timings": timings,
+        "slide_memo": memo,
+        "revision_savings": savings
     }
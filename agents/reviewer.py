@@ -1,11 +1,18 @@
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from .state import AgentState
+from .providers import get_llm
+from .config import REVIEWER_INPUT, REVIEW_DIGEST_MAX_TOKENS
+from .digest import build_deck_digest, slides_from_html
+from .artifacts import load_html, load_structured, put_messages
+from .tokens import count_tokens
+from .tracing import span
+import re
 
-llm = ChatOpenAI(model="gpt-5.2", temperature=0)
 
 REVIEWER_SYSTEM_PROMPT = """You are a Quality Assurance reviewer for the Solstice Project.
-Review the generated HTML presentation against the User Query and the Plan.
+Review the generated presentation against the User Query and the Plan.
+The deck is given either as full HTML or as a per-slide digest (nav tab, headline, subhead,
+block layout, source claims with IDs, image URLs).
 
 Checklist:
 1. Does the presentation address the user's query?
@@ -13,16 +20,40 @@ Checklist:
 3. Is the content complementary of each other and visually cohesive?
 
 If APPROVED, output exactly: "APPROVED"
-If REJECTED, provide specific feedback.
+If REJECTED, provide specific feedback per slide, then end with one line listing the slide numbers that must be redone:
+FLAGGED_SLIDES: [2, 3]
 """
 
+def parse_flagged_slides(review, total_slides):
+    """Slide numbers (1-based) the reviewer wants redone. No parseable list means redo everything."""
+    match = re.search(r"FLAGGED_SLIDES:\s*\[([^\]]*)\]", review, re.IGNORECASE)
+    if not match:
+        return list(range(1, total_slides + 1))
+    flagged = sorted({int(n) for n in re.findall(r"\d+", match.group(1)) if 1 <= int(n) <= total_slides})
+    return flagged or list(range(1, total_slides + 1))
+
 def reviewer_node(state: AgentState):
     print("--- REVIEWER AGENT ---")
     query = state['query']
-    html = state['html_output']
+    html = load_html(state) # artifact store, or output_path in streaming mode
     plan = state['deck_plan'] # Updated key
     
-    msg = f"""
+    if REVIEWER_INPUT == "digest":
+        # Compact per-slide summary instead of the Tailwind-heavy HTML; capped so cost stays flat
+        with span("reviewer.digest", payload_bytes=len(html)) as s:
+            structured = load_structured(state) if state.get('structured_refs') else slides_from_html(html)
+            digest = build_deck_digest(plan, structured, REVIEW_DIGEST_MAX_TOKENS)
+            s.set(digest_bytes=len(digest))
+        print(f"   Reviewing digest: {count_tokens(digest)} tokens (full HTML: {count_tokens(html)})")
+        msg = f"""
+    User Query: {query}
+    Plan Count: {len(plan)} slides.
+    
+    DECK DIGEST:
+    {digest}
+    """
+    else:
+        msg = f"""
     User Query: {query}
     Plan Count: {len(plan)} slides.
     Generated HTML Length: {len(html)} chars
@@ -36,11 +67,23 @@ def reviewer_node(state: AgentState):
         HumanMessage(content=msg)
     ]
     
-    response = llm.invoke(messages)
+    response = get_llm("reviewer").invoke(messages)
     
     review_status = response.content.strip().upper()
     
     if "APPROVED" in review_status:
-        return {"feedback": "APPROVED", "reviewer_messages": messages + [response]}
+        return {"feedback": "APPROVED", "reviewer_messages_ref": put_messages(messages + [response])}
+
+    # Flagged slides lose their memoized retrieval/structuring so the next pass redoes them
+    flagged = parse_flagged_slides(review_status, len(plan))
+    memo = dict(state.get('slide_memo') or {})
+    for n in flagged:
+        memo.pop(plan[n - 1].get('spec_hash'), None)
+    print(f"   -> Rejected. Flagged slides: {flagged}")
         
-    return {"feedback": review_status, "reviewer_messages": messages + [response]}
+    return {
+        "feedback": review_status,
+        "flagged_slides": flagged,
+        "slide_memo": memo,
+        "reviewer_messages_ref": put_messages(messages + [response])
+    }
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one and keeps recent results.
+
+    Used by batch runs so decks asking for the same group search or claim fetch share a
+    single external call. Failed calls are not remembered; waiters see the same error.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._calls = {}
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            if key in self._results:
+                self.hits += 1
+                self._results.move_to_end(key)
+                return self._results[key]
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                if call.error is None:
+                    self._results[key] = call.result
+                    while len(self._results) > self.max_entries:
+                        self._results.popitem(last=False)
+            call.event.set()
+        return call.result
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
@@ -1,6 +1,23 @@
-from typing import TypedDict, List, Dict, Optional, Annotated
+from dataclasses import dataclass
+from typing import TypedDict, List, Dict, Optional, Tuple, Annotated
 import operator
-from langchain_core.messages import BaseMessage
+
+@dataclass(frozen=True, slots=True)
+class ContentRef:
+    """A selected content group: claim IDs inline, claim metadata in the artifact store (see artifacts.py)."""
+    group_id: str
+    claim_ids: Tuple[str, ...]
+    claims_key: str # artifact key of the claim metadata list, in claim_ids order
+
+    def __post_init__(self):
+        # Checkpoint serialization hands tuples back as lists
+        object.__setattr__(self, "claim_ids", tuple(self.claim_ids))
+
+def collect_slide_results(existing, new):
+    """Reducer for the per-slide fan-out: branches append their result, an empty list starts over."""
+    if not new:
+        return []
+    return (existing or []) + new
 
 class SlideMetadata(TypedDict):
     slide_id: int # Kept for backward compatibility
@@ -14,7 +31,8 @@ class SlideMetadata(TypedDict):
     retrieval_query: str 
     selected_claim_ids: List[str] 
     html_content: str
-    selected_content: List[Dict] # For Assembler content groups
+    selected_content: List[ContentRef] # For Assembler content groups
+    spec_hash: str # Hash of the fields retrieval/structuring depend on (see memo.py)
 
 class AgentState(TypedDict):
     query: str # Main user query
@@ -25,10 +43,28 @@ class AgentState(TypedDict):
     layout_spec: Dict[str, str] # Keep layout spec
     feedback: str
     revision_count: int
-    html_output: str # Final concatenated legacy output
+    html_ref: str # Artifact key of the rendered deck (see artifacts.load_html)
+    output_path: str # Streaming mode: assembler writes the deck here instead of the artifact store
+    structured_refs: List[str] # Per slide: artifact key of the structurer output (headline, subhead, blocks, nav_label)
+    prefetch_id: str # Streaming planner: retrieval already started for planned slides (see retriever.start_prefetch)
+    retriever_max_workers: int # Optional override of RETRIEVER_MAX_WORKERS
+    retriever_timings: List[Dict] # Per-slide latency breakdown (search / judge / fetch)
+    assembler_max_workers: int # Optional override of ASSEMBLER_MAX_WORKERS
+
+    # Per-slide fan-out (see fanout.py)
+    fanout_id: str # In-process SlideLedger coordinating the branches of this pass
+    vectors_refs: List[str] # Per slide: artifact key of its query vectors, embedded deck-wide ("" if not needed)
+    slide_candidates: Annotated[List[Dict], collect_slide_results] # Deck allocation modes: retrieval per slide
+    slide_results: Annotated[List[Dict], collect_slide_results] # One entry per finished slide branch
+    navbar_labels: List[str]
+
+    # Incremental revisions
+    flagged_slides: List[int] # 1-based slide numbers the reviewer rejected
+    slide_memo: Dict[str, Dict] # spec_hash -> {"selected_content", "calls", "structured" (artifact key)}
+    revision_savings: Dict[str, int] # LLM / vector calls skipped thanks to slide_memo
     
-    # Isolated Message Histories
-    planner_messages: List[BaseMessage]
-    retriever_messages: List[BaseMessage]
-    assembler_messages: List[BaseMessage]
-    reviewer_messages: List[BaseMessage]
+    # Isolated Message Histories (artifact keys, see artifacts.load_messages)
+    planner_messages_ref: str
+    retriever_messages_ref: str
+    assembler_messages_ref: str
+    reviewer_messages_ref: str
@@ -0,0 +1,25 @@
+from functools import lru_cache
+
+@lru_cache(maxsize=1)
+def _encoder():
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None # offline / not installed -> heuristic
+
+def count_tokens(text):
+    """Token count for prompt accounting (tiktoken when available, ~4 chars/token otherwise)."""
+    if not text:
+        return 0
+    encoder = _encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+def count_message_tokens(messages):
+    total = 0
+    for m in messages:
+        content = m.content if isinstance(m.content, str) else str(m.content)
+        total += count_tokens(content) + 4 # per-message framing overhead
+    return total
@@ -0,0 +1,228 @@
+"""Lightweight span tracing for graph nodes and external calls.
+
+Tracing is off unless start() was called; span() then costs one global lookup. While on,
+every span records wall-clock start / duration, thread, parent span and free-form
+attributes (tokens, payload bytes, cache hits). Export with write_jsonl() or
+write_chrome_trace(); the latter opens in chrome://tracing or https://ui.perfetto.dev.
+"""
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_tracer = None
+_current = contextvars.ContextVar("current_span", default=None)
+
+class Span:
+    __slots__ = ("id", "parent_id", "name", "category", "start", "duration", "thread", "attrs")
+
+    def __init__(self, span_id, parent_id, name, category, attrs):
+        self.id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.category = category
+        self.start = time.perf_counter()
+        self.duration = None
+        self.thread = threading.get_ident()
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+    def to_dict(self, origin):
+        return {"id": self.id, "parent_id": self.parent_id, "name": self.name, "category": self.category,
+                "start_ms": round((self.start - origin) * 1000, 3), "duration_ms": round(self.duration * 1000, 3),
+                "thread": self.thread, **self.attrs}
+
+class _NullSpan:
+    def set(self, **attrs):
+        pass
+
+NULL_SPAN = _NullSpan()
+
+class Tracer:
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def finish(self, span):
+        span.duration = time.perf_counter() - span.start
+        with self._lock:
+            self.spans.append(span)
+
+    def records(self):
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s.start)
+        return [s.to_dict(self.origin) for s in spans]
+
+def start():
+    """Begin collecting spans in this process (replaces any previous tracer)."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+def stop():
+    """Stop collecting and return the tracer with everything recorded so far."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def enabled():
+    return _tracer is not None
+
+@contextmanager
+def span(name, category="internal", **attrs):
+    tracer = _tracer
+    if tracer is None:
+        yield NULL_SPAN
+        return
+    parent = _current.get()
+    s = Span(next(tracer._ids), parent.id if parent else None, name, category, attrs)
+    token = _current.set(s)
+    try:
+        yield s
+    except Exception as e:
+        s.set(error=type(e).__name__)
+        raise
+    finally:
+        _current.reset(token)
+        tracer.finish(s)
+
+def traced_node(name, fn):
+    """Wrap a LangGraph node so each invocation is a "node" span."""
+    def node(state):
+        with span(name, "node", revision=state.get("revision_count", 0)):
+            return fn(state)
+    node.__name__ = getattr(fn, "__name__", name)
+    return node
+
+def bind_context(fn):
+    """Run fn in a copy of the caller's context, so spans opened in pool threads keep their parent."""
+    ctx = contextvars.copy_context()
+    return lambda *args, **kwargs: ctx.copy().run(fn, *args, **kwargs)
+
+def _payload_bytes(messages):
+    size = 0
+    for m in messages:
+        content = getattr(m, "content", m)
+        size += len(content.encode("utf-8")) if isinstance(content, str) else len(json.dumps(content, default=str))
+    return size
+
+class TracedLLM:
+    """Chat model proxy recording an "llm" span per call."""
+
+    def __init__(self, llm, agent):
+        self.llm = llm
+        self.agent = agent
+
+    def invoke(self, messages, **kwargs):
+        with span(f"llm.{self.agent}", "llm", agent=self.agent, payload_bytes=_payload_bytes(messages)) as s:
+            response = self.llm.invoke(messages, **kwargs)
+            usage = getattr(response, "usage_metadata", None) or {}
+            metadata = getattr(response, "response_metadata", None) or {}
+            s.set(input_tokens=usage.get("input_tokens", 0), output_tokens=usage.get("output_tokens", 0),
+                  response_bytes=len(str(getattr(response, "content", "")).encode("utf-8")),
+                  cache_hit=bool(metadata.get("cache_hit")))
+            return response
+
+    def stream(self, messages, **kwargs):
+        with span(f"llm.{self.agent}", "llm", agent=self.agent, payload_bytes=_payload_bytes(messages),
+                  streamed=True) as s:
+            t0 = time.perf_counter()
+            size = chunks = 0
+            for chunk in self.llm.stream(messages, **kwargs):
+                if chunks == 0:
+                    s.set(first_chunk_ms=round((time.perf_counter() - t0) * 1000, 3))
+                chunks += 1
+                size += len(str(chunk.content).encode("utf-8"))
+                yield chunk
+            s.set(chunks=chunks, response_bytes=size)
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+class TracedEmbeddings:
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts):
+        stats = getattr(self.embeddings, "stats", None)
+        hits_before = stats()["hits"] if stats else 0
+        with span("embeddings.embed_documents", "embedding", texts=len(texts),
+                  payload_bytes=sum(len(t.encode("utf-8")) for t in texts)) as s:
+            vectors = self.embeddings.embed_documents(texts)
+            if stats:
+                s.set(cache_hits=stats()["hits"] - hits_before) # approximate under concurrency
+            return vectors
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+    def __getattr__(self, name):
+        return getattr(self.embeddings, name)
+
+class TracedIndex:
+    """Vector index proxy (Pinecone or the local snapshot) recording query / fetch spans."""
+
+    def __init__(self, index, name):
+        self.index = index
+        self.name = name
+
+    def query(self, vector, **kwargs):
+        with span(f"{self.name}.query", "vector", index=self.name, top_k=kwargs.get("top_k"),
+                  payload_bytes=len(vector) * 4) as s:
+            results = self.index.query(vector=vector, **kwargs)
+            s.set(matches=len(getattr(results, "matches", None) or []))
+            return results
+
+    def fetch(self, ids, **kwargs):
+        with span(f"{self.name}.fetch", "vector", index=self.name, ids=len(ids)) as s:
+            response = self.index.fetch(ids=ids, **kwargs)
+            vectors = response["vectors"] if isinstance(response, dict) else getattr(response, "vectors", {})
+            s.set(found=len(vectors or {}))
+            return response
+
+    def __getattr__(self, name):
+        return getattr(self.index, name)
+
+class TracedPinecone:
+    def __init__(self, client):
+        self.client = client
+
+    def Index(self, name):
+        return TracedIndex(self.client.Index(name), name)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+def write_jsonl(tracer, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        for record in tracer.records():
+            f.write(json.dumps(record, default=str) + "\n")
+
+def write_chrome_trace(tracer, path):
+    """Chrome trace event format: one complete ("X") event per span, one lane per thread."""
+    events = []
+    for r in tracer.records():
+        args = {k: v for k, v in r.items() if k not in ("name", "category", "start_ms", "duration_ms", "thread")}
+        events.append({"name": r["name"], "cat": r["category"], "ph": "X", "pid": os.getpid(),
+                       "tid": r["thread"], "ts": r["start_ms"] * 1000, "dur": r["duration_ms"] * 1000,
+                       "args": args})
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+
+def summarize(tracer):
+    """{category: {name: {"count", "total_ms"}}} for a quick text report."""
+    summary = {}
+    for r in tracer.records():
+        entry = summary.setdefault(r["category"], {}).setdefault(r["name"], {"count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] += r["duration_ms"]
+    return summary
@@ -0,0 +1,57 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import urllib.request
+
+def image_content_hash(url, timeout=10):
+    """sha256 of the image bytes, or None if the image can't be downloaded."""
+    try:
+        request = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 (slide-builder image vetting)"})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return hashlib.sha256(response.read()).hexdigest()
+    except Exception:
+        return None
+
+class VerdictCache:
+    """Persistent image-vetting verdicts keyed by URL + content hash.
+
+    One row per URL: a verdict only counts while the stored hash matches the current bytes,
+    and storing a new hash replaces the stale verdict.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts "
+                "(url TEXT PRIMARY KEY, content_hash TEXT NOT NULL, useful INTEGER NOT NULL, checked_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, url, content_hash):
+        """Cached verdict (bool) or None when unknown / the image bytes changed."""
+        if not content_hash:
+            return None
+        with self._lock:
+            row = self._db().execute(
+                "SELECT content_hash, useful FROM verdicts WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or row[0] != content_hash:
+            return None
+        return bool(row[1])
+
+    def put(self, url, content_hash, useful):
+        if not content_hash:
+            return
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?)", (url, content_hash, int(useful), time.time()))
+            db.commit()
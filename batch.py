@@ -0,0 +1,164 @@
+"""Batch deck generation from a JSONL file of queries.
+
+Each line is a JSON string or an object {"query": "...", "id": "optional-name"}. Decks run
+concurrently on a thread pool (or --processes for a process pool). Group searches and
+claim fetches that repeat across decks in the same process share one call. Every deck is
+written to <out-dir>/<id>.html, node logs go to <out-dir>/batch.log, and the aggregate
+throughput / latency report is printed and saved to <out-dir>/report.json.
+
+    python batch.py queries.jsonl --out-dir decks --workers 4
+"""
+import argparse
+import contextlib
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from agents import retriever
+from agents.artifacts import get_store
+from agents.providers import llm_transport_stats
+from agents.singleflight import SingleFlight
+from graph import build_graph, make_initial_state, run_timed
+
+_app = None
+_app_lock = threading.Lock()
+
+def load_jobs(path):
+    """[{"id", "query"}] from a JSONL file; ids default to deck-001, deck-002, ...
+
+    Ids are file names, so after sanitizing a repeated one gets a -2, -3, ... suffix:
+    every deck is written to its own <id>.html.
+    """
+    jobs = []
+    seen = set()
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, str):
+                entry = {"query": entry}
+            base = re.sub(r"[^\w.-]+", "_", str(entry.get("id") or f"deck-{len(jobs) + 1:03d}"))
+            deck_id, n = base, 1
+            while deck_id in seen:
+                n += 1
+                deck_id = f"{base}-{n}"
+            seen.add(deck_id)
+            jobs.append({"id": deck_id, "query": entry["query"]})
+    return jobs
+
+def get_app():
+    global _app
+    with _app_lock:
+        if _app is None:
+            _app = build_graph()
+    return _app
+
+def init_worker(log_path=None):
+    """Per-process setup: share retrieval lookups across this process's decks, log to file."""
+    retriever.share_lookups(SingleFlight())
+    if log_path:
+        sys.stdout = open(log_path, "a", buffering=1)
+
+def run_deck(job, out_dir):
+    output_path = os.path.join(out_dir, f"{job['id']}.html")
+    t0 = time.perf_counter()
+    started_at = time.time()
+    try:
+        final_state, timings = run_timed(get_app(), make_initial_state(job["query"], output_path=output_path))
+        # A file left by an earlier batch does not count as this run's output
+        ok = os.path.exists(output_path) and os.path.getmtime(output_path) >= started_at
+        error = None if ok else "no output written"
+        feedback = final_state.get("feedback")
+    except Exception as e:
+        ok, error, feedback, timings = False, f"{type(e).__name__}: {e}", None, []
+    return {"id": job["id"], "query": job["query"], "output": output_path, "ok": ok, "error": error,
+            "feedback": feedback, "latency": round(time.perf_counter() - t0, 4), "timings": timings}
+
+def build_report(results, wall, workers, mode):
+    latencies = sorted(r["latency"] for r in results if r["ok"])
+    node_seconds = defaultdict(list)
+    for r in results:
+        for t in r["timings"]:
+            node_seconds[t["node"]].append(t["seconds"])
+    return {
+        "decks": len(results),
+        "succeeded": len(latencies),
+        "failed": [r["id"] for r in results if not r["ok"]],
+        "mode": mode,
+        "workers": workers,
+        "wall_time": round(wall, 3),
+        "decks_per_minute": round(len(latencies) / wall * 60, 2) if wall else 0.0,
+        "latency": {
+            "mean": round(statistics.mean(latencies), 3) if latencies else 0.0,
+            "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+            "p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "node_mean_seconds": {n: round(statistics.mean(v), 3) for n, v in node_seconds.items()},
+        # Only visible for the parent process, i.e. thread mode
+        "shared_lookups": retriever.shared_lookups.stats() if retriever.shared_lookups is not None else None,
+        "llm_transport": llm_transport_stats(),
+    }
+
+def run_batch(jobs, out_dir, workers=4, processes=False, log_path=None):
+    """Run every job, returning (per-deck results in input order, aggregate report)."""
+    os.makedirs(out_dir, exist_ok=True)
+    get_store().sweep()
+    t0 = time.perf_counter()
+    if processes:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(log_path,)) as pool:
+            results = list(pool.map(run_deck, jobs, [out_dir] * len(jobs)))
+    else:
+        retriever.share_lookups(SingleFlight())
+        log = open(log_path, "a", buffering=1) if log_path else None
+        try:
+            with contextlib.redirect_stdout(log or sys.stdout):
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(run_deck, jobs, [out_dir] * len(jobs)))
+        finally:
+            if log:
+                log.close()
+    report = build_report(results, time.perf_counter() - t0, workers, "processes" if processes else "threads")
+    retriever.share_lookups(None)
+    return results, report
+
+def print_report(results, report):
+    for r in results:
+        status = "ok" if r["ok"] else f"FAILED ({r['error']})"
+        print(f"   {r['id']:<24} {r['latency']:>7.2f}s  {status}")
+    lat = report["latency"]
+    print(f"\n{report['succeeded']}/{report['decks']} decks in {report['wall_time']:.1f}s "
+          f"({report['decks_per_minute']:.1f} decks/min, {report['workers']} {report['mode']})")
+    print(f"Latency: mean {lat['mean']:.2f}s | p50 {lat['p50']:.2f}s | p95 {lat['p95']:.2f}s | max {lat['max']:.2f}s")
+    if report["node_mean_seconds"]:
+        print("Mean per node: " + ", ".join(f"{n} {s:.2f}s" for n, s in report["node_mean_seconds"].items()))
+    shared = report["shared_lookups"]
+    if shared:
+        print(f"Shared retrieval lookups: {shared['hits']} reused / {shared['misses']} fetched ({shared['hit_rate']:.0%})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("queries", help="JSONL file of queries")
+    parser.add_argument("--out-dir", default="decks")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--processes", action="store_true", help="Process pool instead of threads "
+                        "(lookups are then only shared within each process)")
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.queries)
+    print(f"Generating {len(jobs)} decks into {args.out_dir}/ (logs: {args.out_dir}/batch.log)")
+    results, report = run_batch(jobs, args.out_dir, args.workers, args.processes,
+                                log_path=os.path.join(args.out_dir, "batch.log"))
+    print_report(results, report)
+    with open(os.path.join(args.out_dir, "report.json"), "w") as f:
+        json.dump({"report": report, "decks": results}, f, indent=2)
+    sys.exit(0 if not report["failed"] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Offline HTML bundle (DECK_RENDER_MODE=bundle) vs the Tailwind CDN template.
+
+Structures one deck against the offline fakes, then renders it in both modes. Reports the
+HTML size (raw and gzipped), the render-blocking external requests, the navbar copies in
+the markup, the render time and what the per-process template cache saves over building
+a new Jinja environment on every render. First paint is measured in headless Chromium
+when Playwright is installed (the CDN deck needs network access for it).
+
+    python -m benchmarks.bench_bundle [--slides 20] [--renders 50] [--no-browser]
+"""
+import argparse
+import contextlib
+import gzip
+import io
+import os
+import re
+import tempfile
+import time
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def structured_deck(slides):
+    from agents.artifacts import load_structured
+    from graph import build_graph, make_initial_state
+
+    install_fakes(slides=slides)
+    with contextlib.redirect_stdout(io.StringIO()):
+        state = build_graph().invoke(make_initial_state(f"Build a {slides} slide deck"))
+    return load_structured(state)
+
+def render(mode, slides):
+    from agents import assemble2
+
+    context = {"theme": assemble2.load_theme(),
+               "navbar_tabs": assemble2.unique_navbar_tabs([s["nav_label"] for s in slides])}
+    if mode == "bundle":
+        with contextlib.redirect_stdout(io.StringIO()):
+            return assemble2.render_bundle(slides, **context)
+    return assemble2.get_template("cdn").render(slides=slides, **context)
+
+def timed(fn, repeat):
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+def first_paint(html):
+    """First contentful paint of the page in headless Chromium (ms), or the reason it was skipped."""
+    try:
+        from playwright.sync_api import sync_playwright
+    except ImportError:
+        return "skipped (playwright not installed)"
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False) as f:
+        f.write(html)
+    try:
+        with sync_playwright() as p:
+            browser = p.chromium.launch()
+            page = browser.new_page()
+            page.goto(f"file://{f.name}", wait_until="load")
+            fcp = page.evaluate(
+                "performance.getEntriesByName('first-contentful-paint').map(e => e.startTime)[0] || null")
+            browser.close()
+    except Exception as e:
+        return f"skipped ({type(e).__name__})"
+    finally:
+        os.remove(f.name)
+    return f"{fcp:.0f}ms" if fcp is not None else "n/a"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--renders", type=int, default=50)
+    parser.add_argument("--no-browser", action="store_true", help="skip the first-paint measurement")
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # theme.json is repo-relative
+    from jinja2 import Environment, FileSystemLoader
+    from agents import assemble2
+
+    slides = structured_deck(args.slides)
+    print(f"{args.slides} slides, {args.renders} renders per mode")
+    print(f"{'mode':<6} | {'html':>9} | {'gzip':>8} | {'blocking reqs':>13} | {'navbars':>7} | "
+          f"{'render':>8} | first paint")
+    for mode in ("cdn", "bundle"):
+        html = render(mode, slides)
+        size = len(html.encode("utf-8"))
+        zipped = len(gzip.compress(html.encode("utf-8")))
+        blocking = len(re.findall(r'<script[^>]+src="https?://|<link[^>]+rel="stylesheet"[^>]+href="https?://', html))
+        navbars = html.count('alt="Brand Logo"')
+        render_time = timed(lambda: render(mode, slides), args.renders)
+        paint = "skipped (--no-browser)" if args.no_browser else first_paint(html)
+        print(f"{mode:<6} | {size:>8}B | {zipped:>7}B | {blocking:>13} | {navbars:>7} | "
+              f"{render_time * 1000:>6.2f}ms | {paint}")
+
+    name = assemble2.DECK_TEMPLATES["cdn"]
+    fresh = timed(lambda: Environment(loader=FileSystemLoader(ROOT)).get_template(name), args.renders)
+    cached = timed(lambda: assemble2.get_template("cdn"), args.renders)
+    print(f"get_template: {fresh * 1000:.2f}ms with a new Environment per call, {cached * 1000:.4f}ms cached")
+
+if __name__ == "__main__":
+    main()
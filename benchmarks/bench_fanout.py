@@ -0,0 +1,79 @@
+"""Per-slide fan-out (SLIDE_FANOUT) vs the deck-wide retriever -> assembler stages.
+
+Runs the same deck through both graphs against the offline fakes, with LLM latency spread
+per prompt (--jitter) so slides finish retrieval at different times, as they do against a
+real API. Reports the critical path from the end of planning to the rendered deck, when
+the first slide was structured, end-to-end latency and the external calls made.
+
+    python -m benchmarks.bench_fanout [--slides 10] [--llm-latency 0.5] [--jitter 0.8] [--allocation slide]
+"""
+import argparse
+import contextlib
+import io
+import os
+import threading
+import time
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_graph(fanout, slides, llm_latency, jitter, vector_latency):
+    from agents import assemble2, fanout as fanout_module
+    from graph import build_graph, make_initial_state
+
+    log = install_fakes(llm_latency=llm_latency, vector_latency=vector_latency, slides=slides, llm_jitter=jitter)
+    structure_slide = assemble2.structure_slide
+    structured = []
+    lock = threading.Lock()
+
+    def recorded_structure(index, slide):
+        result = structure_slide(index, slide)
+        with lock:
+            structured.append(time.perf_counter())
+        return result
+
+    assemble2.structure_slide = fanout_module.structure_slide = recorded_structure
+    try:
+        app = build_graph(fanout=fanout)
+        node_done = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            for update in app.stream(make_initial_state(f"Build a {slides} slide deck"), stream_mode="updates"):
+                for node in update:
+                    node_done[node] = time.perf_counter() - t0
+            total = time.perf_counter() - t0
+    finally:
+        assemble2.structure_slide = fanout_module.structure_slide = structure_slide
+    rendered = node_done["render" if fanout else "assembler"]
+    return {
+        "critical_path": rendered - node_done["planner"],
+        "first_structured": min(structured) - t0 - node_done["planner"],
+        "total": total,
+        "calls": sum(stats["calls"] for stats in log.snapshot().values()),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--jitter", type=float, default=0.8, help="LLM latency spread, as a fraction of --llm-latency")
+    parser.add_argument("--vector-latency", type=float, default=0.05)
+    parser.add_argument("--allocation", choices=["deck_judge", "optimizer", "slide"], action="append",
+                        help="ALLOCATION_MODE to compare (repeatable; default deck_judge and slide)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # templates/ and theme.json are repo-relative
+    from agents import fanout, retriever
+    print(f"{args.slides} slides, LLM latency {args.llm_latency}s +/- {args.jitter:.0%}, "
+          f"vector latency {args.vector_latency}s")
+    print(f"{'allocation':<10} | {'graph':<7} | {'critical path':>13} | {'1st slide structured':>20} | "
+          f"{'end-to-end':>10} | {'calls':>5}")
+    for mode in args.allocation or ["deck_judge", "slide"]:
+        retriever.ALLOCATION_MODE = fanout.ALLOCATION_MODE = mode
+        for graph in ("stages", "fanout"):
+            r = run_graph(graph == "fanout", args.slides, args.llm_latency, args.jitter, args.vector_latency)
+            print(f"{mode:<10} | {graph:<7} | {r['critical_path']:>12.3f}s | {r['first_structured']:>19.3f}s | "
+                  f"{r['total']:>9.3f}s | {r['calls']:>5}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Latency of the local group index vs. the Pinecone path.
+
+Usage:
+    python -m benchmarks.bench_group_index                  # synthetic corpus, simulated Pinecone RTT
+    python -m benchmarks.bench_group_index --live           # real snapshot vs. live Pinecone
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+import numpy as np
+from agents.local_index import LocalGroupIndex, write_snapshot
+
+class RemoteIndexStandIn:
+    """Pinecone stand-in: exact cosine search plus a simulated network round-trip."""
+
+    def __init__(self, vectors, metadata, rtt_ms):
+        self.vectors = [np.asarray(v, dtype=np.float32) for v in vectors]
+        self.metadata = metadata
+        self.rtt = rtt_ms / 1000.0
+
+    def query(self, vector, top_k=5, include_metadata=True):
+        time.sleep(self.rtt)
+        q = np.asarray(vector, dtype=np.float32)
+        scores = [float(v @ q / (np.linalg.norm(v) * np.linalg.norm(q))) for v in self.vectors]
+        order = sorted(range(len(scores)), key=lambda i: -scores[i])[:top_k]
+        return SimpleNamespace(matches=[
+            SimpleNamespace(id=self.metadata[i]["id"], score=scores[i], metadata=self.metadata[i]["metadata"])
+            for i in order
+        ])
+
+def time_queries(index, queries, top_k):
+    latencies = []
+    for q in queries:
+        t0 = time.perf_counter()
+        index.query(vector=q, top_k=top_k, include_metadata=True)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    return latencies
+
+def report(name, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(0.95 * (len(latencies) - 1))]
+    print(f"{name:>10}: mean {statistics.mean(latencies):8.3f} ms | p50 {statistics.median(latencies):8.3f} ms | p95 {p95:8.3f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--groups", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=3072)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--rtt-ms", type=float, default=40.0, help="Simulated Pinecone round-trip")
+    parser.add_argument("--live", action="store_true", help="Compare the real snapshot against live Pinecone")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+
+    if args.live:
+        from pinecone import Pinecone
+        from agents.config import GROUP_INDEX_SNAPSHOT
+        local = LocalGroupIndex(GROUP_INDEX_SNAPSHOT)
+        queries = rng.standard_normal((args.queries, local.vectors.shape[1])).astype(np.float32)
+        remote = Pinecone(api_key=os.getenv("PINECONE_API_KEY")).Index("content-gen-group-index")
+        report("local", time_queries(local, queries.tolist(), args.top_k))
+        report("pinecone", time_queries(remote, queries.tolist(), args.top_k))
+        return
+
+    vectors = rng.standard_normal((args.groups, args.dim)).astype(np.float32)
+    metadata = [{"id": f"g{i}", "metadata": {"group_id": f"g{i}", "group_description": f"group {i}", "claims": []}}
+                for i in range(args.groups)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "group_index")
+        write_snapshot(path, vectors, metadata)
+        local = LocalGroupIndex(path)
+        remote = RemoteIndexStandIn(vectors, metadata, args.rtt_ms)
+
+        # Both paths must return the same top-k
+        for q in queries[:5]:
+            assert [m.id for m in local.query(q, args.top_k).matches] == [m.id for m in remote.query(q, args.top_k).matches]
+
+        print(f"{args.groups} groups x {args.dim} dims, {args.queries} queries, top_k={args.top_k}")
+        report("local", time_queries(local, queries, args.top_k))
+        report("stand-in", time_queries(remote, queries, args.top_k))
+
+if __name__ == "__main__":
+    main()
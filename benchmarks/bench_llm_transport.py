@@ -0,0 +1,71 @@
+"""Burst of concurrent chat calls against a rate-limited local OpenAI stand-in.
+
+Compares per-agent ChatOpenAI clients relying on the SDK's own retries with the shared
+pooled transport (token bucket + adaptive concurrency), reporting 429s, wall time and
+queue-wait vs service-time.
+
+Usage:
+    python -m benchmarks.bench_llm_transport [--calls 60] [--threads 16] [--server-concurrency 4]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from agents.rate_limit import LLMRateLimiter, RateLimitedTransport
+from benchmarks.fakes import FakeOpenAIServer
+
+AGENTS = ("planner", "judge", "navbar", "structurer", "image_vetter", "reviewer")
+
+def burst(clients, calls, threads):
+    errors = 0
+    def call(i):
+        nonlocal errors
+        try:
+            clients[i % len(clients)].invoke([HumanMessage(content=f"call {i} " + "context " * 200)])
+        except Exception:
+            errors += 1
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(call, range(calls)))
+    return time.perf_counter() - t0, errors
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--server-concurrency", type=int, default=4)
+    parser.add_argument("--server-rpm", type=int, default=120, help="Per --window seconds")
+    parser.add_argument("--server-tpm", type=int, default=40000, help="Per --window seconds")
+    parser.add_argument("--window", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    limits = dict(rpm=args.server_rpm, tpm=args.server_tpm, max_concurrency=args.server_concurrency,
+                  latency=args.latency, window=args.window)
+    print(f"{args.calls} calls on {args.threads} threads; server allows {args.server_concurrency} in flight, "
+          f"{args.server_rpm} req / {args.server_tpm} tokens per {args.window}s")
+
+    with FakeOpenAIServer(**limits) as server:
+        clients = [ChatOpenAI(model="gpt-5.2", api_key="bench", base_url=server.base_url, max_retries=5)
+                   for _ in AGENTS]
+        wall, errors = burst(clients, args.calls, args.threads)
+        print(f"\nPer-agent clients, SDK retries: {wall:.2f}s, {server.rejected} x 429, {errors} failed calls")
+
+    with FakeOpenAIServer(**limits) as server:
+        limiter = LLMRateLimiter(args.server_rpm, args.server_tpm, max_concurrency=args.threads,
+                                 period=args.window, cooldown=args.latency)
+        http_client = httpx.Client(transport=RateLimitedTransport(httpx.HTTPTransport(), limiter, max_retries=10,
+                                                                  expected_output_tokens=50))
+        clients = [ChatOpenAI(model="gpt-5.2", api_key="bench", base_url=server.base_url,
+                              http_client=http_client, max_retries=0) for _ in AGENTS]
+        wall, errors = burst(clients, args.calls, args.threads)
+        m = limiter.metrics()
+        print(f"Shared limited transport:       {wall:.2f}s, {server.rejected} x 429, {errors} failed calls")
+        print(f"   concurrency limit {m['concurrency_limit']} after {m['backoffs']} backoffs, {m['tokens']} tokens")
+        print(f"   queue wait   mean {m['queue_wait']['mean'] * 1000:7.1f} ms | p95 {m['queue_wait']['p95'] * 1000:7.1f} ms")
+        print(f"   service time mean {m['service_time']['mean'] * 1000:7.1f} ms | p95 {m['service_time']['p95'] * 1000:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
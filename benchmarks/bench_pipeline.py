@@ -0,0 +1,150 @@
+"""End-to-end build_graph() benchmark against the offline stand-ins in benchmarks/fakes.py.
+
+Sweeps slides per deck, group candidates per query and claims per group one factor at a
+time around a base configuration, and reports wall time per node plus external call
+counts and prompt tokens. With --baseline, exits non-zero when a configuration regresses
+against the stored results.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--llm-latency 0.05] [--vector-latency 0.01]
+    python -m benchmarks.bench_pipeline --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench_pipeline --baseline benchmarks/baseline.json [--time-tolerance 0.25]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BASE = {"slides": 6, "candidates": 5, "claims": 3}
+SWEEPS = {"slides": [3, 6, 10], "candidates": [3, 5, 10], "claims": [1, 3, 6]}
+
+# Which graph node each fake client is called from
+NODE_OF = {
+    "planner": "planner",
+    "judge": "retriever", "deck_judge": "retriever", "embeddings": "retriever", "group_index": "retriever", "claim_index": "retriever",
+    "navbar": "assembler", "structurer": "assembler", "image_vetter": "assembler",
+    "reviewer": "reviewer",
+}
+
+def config_key(config):
+    return ",".join(f"{k}={config[k]}" for k in ("slides", "candidates", "claims"))
+
+def sweep_configs():
+    configs = {}
+    for factor, values in SWEEPS.items():
+        for value in values:
+            config = {**BASE, factor: value}
+            configs[config_key(config)] = config
+    return list(configs.values())
+
+def run_pipeline(config, llm_latency=0.0, vector_latency=0.0):
+    """One full deck through build_graph(); returns wall time, per-node seconds, calls and tokens."""
+    from agents import retriever
+    from graph import build_graph, make_initial_state
+
+    log = install_fakes(llm_latency=llm_latency, vector_latency=vector_latency,
+                        slides=config["slides"], claims_per_group=config["claims"])
+    retriever.GROUP_SEARCH_TOP_K = config["candidates"]
+    app = build_graph()
+    state = make_initial_state(f"Build a {config['slides']} slide deck on FRESCO-2 efficacy")
+
+    node_seconds = defaultdict(float)
+    with contextlib.redirect_stdout(io.StringIO()): # the nodes print progress
+        t0 = last = time.perf_counter()
+        for update in app.stream(state, stream_mode="updates"):
+            now = time.perf_counter()
+            for node in update:
+                node_seconds[node] += now - last
+            last = now
+        wall = time.perf_counter() - t0
+
+    calls, tokens = defaultdict(int), defaultdict(int)
+    for agent, stats in log.snapshot().items():
+        node = NODE_OF.get(agent, "other")
+        calls[f"{node}.{agent}"] = stats["calls"]
+        tokens[node] += stats["tokens"]
+    return {
+        "wall_time": round(wall, 4),
+        "node_seconds": {n: round(s, 4) for n, s in node_seconds.items()},
+        "calls": dict(calls),
+        "tokens": dict(tokens),
+    }
+
+def compare(results, baseline, time_tolerance=0.25, token_tolerance=0.10, min_time_delta=0.05):
+    """List of human-readable regressions of results against baseline (same config keys).
+
+    Wall time must exceed both the relative tolerance and min_time_delta seconds, so
+    scheduler noise on sub-second runs does not trip the check.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None:
+            continue
+        slower = current["wall_time"] - previous["wall_time"]
+        if slower > previous["wall_time"] * time_tolerance and slower > min_time_delta:
+            regressions.append(f"{key}: wall time {current['wall_time']:.3f}s > {previous['wall_time']:.3f}s")
+        for name, count in current["calls"].items():
+            if count > previous["calls"].get(name, 0):
+                regressions.append(f"{key}: {name} calls {count} > {previous['calls'].get(name, 0)}")
+        for node, count in current["tokens"].items():
+            if count > previous["tokens"].get(node, 0) * (1 + token_tolerance):
+                regressions.append(f"{key}: {node} tokens {count} > {previous['tokens'].get(node, 0)}")
+    return regressions
+
+def print_results(results):
+    nodes = ("planner", "retriever", "assembler", "reviewer")
+    print(f"{'config':<32} | {'wall s':>6} | " + " | ".join(f"{n:>9}" for n in nodes)
+          + f" | {'LLM calls':>9} | {'vec calls':>9} | {'tokens':>7}")
+    for key, r in results.items():
+        llm_calls = sum(c for name, c in r["calls"].items()
+                        if name.split(".")[1] not in ("embeddings", "group_index", "claim_index"))
+        vector_calls = sum(c for name, c in r["calls"].items()
+                           if name.split(".")[1] in ("embeddings", "group_index", "claim_index"))
+        print(f"{key:<32} | {r['wall_time']:>6.2f} | "
+              + " | ".join(f"{r['node_seconds'].get(n, 0.0):>9.3f}" for n in nodes)
+              + f" | {llm_calls:>9} | {vector_calls:>9} | {sum(r['tokens'].values()):>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.01)
+    parser.add_argument("--baseline", help="Fail on regression against this stored result file")
+    parser.add_argument("--save-baseline", help="Write this run's results to the given path")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed relative wall-time increase")
+    parser.add_argument("--token-tolerance", type=float, default=0.10, help="Allowed relative token increase")
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # templates/ and theme.json are repo-relative
+    results = {config_key(c): run_pipeline(c, args.llm_latency, args.vector_latency) for c in sweep_configs()}
+    print(f"LLM latency {args.llm_latency}s, vector latency {args.vector_latency}s")
+    print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"llm_latency": args.llm_latency, "vector_latency": args.vector_latency,
+                       "results": results}, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get("llm_latency"), baseline.get("vector_latency")) != (args.llm_latency, args.vector_latency):
+            print("\nWARNING: baseline was recorded with different injected latencies")
+        regressions = compare(results, baseline, args.time_tolerance, args.token_tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"   {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Streaming planner (retrieval starts per slide while the plan is still being written) vs the barrier.
+
+Runs the same deck twice against the offline fakes, with the planner response paced
+chunk by chunk like a real token stream: once waiting for the whole plan before the
+retriever starts (barrier), once with PLANNER_STREAMING. Reports the time until the first
+slide's retrieval is complete, when the retriever node finishes, and end-to-end latency.
+
+    python -m benchmarks.bench_planner_stream [--slides 10] [--chunk-latency 0.02] [--allocation slide]
+"""
+import argparse
+import contextlib
+import io
+import os
+import threading
+import time
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run_mode(streaming, slides, llm_latency, chunk_latency, vector_latency):
+    from agents import planner, retriever
+    from graph import build_graph, make_initial_state
+
+    log = install_fakes(llm_latency=llm_latency, vector_latency=vector_latency, slides=slides,
+                        chunk_latency=chunk_latency)
+    planner.PLANNER_STREAMING = streaming
+    search_slide = retriever.search_slide
+    ready = []
+    lock = threading.Lock()
+
+    def recorded_search(slide, vectors=None):
+        result = search_slide(slide, vectors)
+        with lock:
+            ready.append(time.perf_counter())
+        return result
+
+    retriever.search_slide = recorded_search
+    try:
+        app = build_graph()
+        node_done = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            t0 = time.perf_counter()
+            for update in app.stream(make_initial_state(f"Build a {slides} slide deck"), stream_mode="updates"):
+                for node in update:
+                    node_done.setdefault(node, time.perf_counter() - t0)
+            total = time.perf_counter() - t0
+    finally:
+        retriever.search_slide = search_slide
+    snapshot = log.snapshot()
+    return {
+        "first_slide_retrieved": min(ready) - t0,
+        "planner_done": node_done["planner"],
+        "retriever_done": node_done["retriever"],
+        "total": total,
+        "embedding_calls": snapshot.get("embeddings", {}).get("calls", 0),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="Time to first token / per non-streamed call")
+    parser.add_argument("--chunk-latency", type=float, default=0.02, help="Gap between 64-char planner chunks")
+    parser.add_argument("--vector-latency", type=float, default=0.05)
+    parser.add_argument("--allocation", choices=["deck_judge", "optimizer", "slide"], default=None,
+                        help="Override ALLOCATION_MODE ('slide' also pipelines the judge)")
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # templates/ and theme.json are repo-relative
+    if args.allocation:
+        from agents import retriever
+        retriever.ALLOCATION_MODE = args.allocation
+    results = {mode: run_mode(mode == "streaming", args.slides, args.llm_latency, args.chunk_latency,
+                              args.vector_latency)
+               for mode in ("barrier", "streaming")}
+
+    print(f"{args.slides} slides, LLM latency {args.llm_latency}s, {args.chunk_latency}s per planner chunk, "
+          f"vector latency {args.vector_latency}s")
+    print(f"{'mode':<10} | {'1st slide retrieved':>19} | {'planner done':>12} | {'retriever done':>14} | "
+          f"{'end-to-end':>10} | {'embed calls':>11}")
+    for mode, r in results.items():
+        print(f"{mode:<10} | {r['first_slide_retrieved']:>18.3f}s | {r['planner_done']:>11.3f}s | "
+              f"{r['retriever_done']:>13.3f}s | {r['total']:>9.3f}s | {r['embedding_calls']:>11}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Pre-judge thresholds replayed over recorded judge decisions.
+
+Record decisions by running the pipeline in shadow mode, where the judge is always called
+and each slide's candidates, judge picks and pre-judge picks are appended to a JSONL file:
+    PREJUDGE_MODE=shadow JUDGE_RECORD_PATH=.cache/judge_records.jsonl python main.py "..."
+
+Then sweep the thresholds to see how many judge calls each setting avoids and how often
+the deterministic pick matches the LLM judge on those slides:
+    python -m benchmarks.bench_prejudge [.cache/judge_records.jsonl]
+"""
+import argparse
+import json
+import statistics
+from agents.prejudge import agreement, prejudge
+
+def evaluate(records, max_candidates, pick, min_margin):
+    skipped = []
+    for r in records:
+        ids, _ = prejudge(r["candidates"], max_candidates, pick, min_margin)
+        if ids is not None:
+            skipped.append((ids, r["judge"]))
+    return {
+        "avoided": len(skipped),
+        "agreement": statistics.mean(agreement(a, b) for a, b in skipped) if skipped else 1.0,
+        "exact": sum(set(a) == set(b) for a, b in skipped) / len(skipped) if skipped else 1.0,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("records", nargs="?", default=".cache/judge_records.jsonl")
+    parser.add_argument("--pick", type=int, default=3)
+    parser.add_argument("--max-candidates", type=int, nargs="+", default=[0, 1, 2, 3])
+    parser.add_argument("--margins", type=float, nargs="+", default=[0.05, 0.1, 0.15, 0.2, 1.0])
+    args = parser.parse_args()
+
+    with open(args.records) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    print(f"{len(records)} recorded judge decisions from {args.records}")
+    print(f"{'max cands':>9} | {'margin':>6} | {'avoided':>12} | {'mean Jaccard':>12} | {'exact match':>11}")
+    for max_candidates in args.max_candidates:
+        for margin in args.margins:
+            r = evaluate(records, max_candidates, args.pick, margin)
+            print(f"{max_candidates:>9} | {margin:>6.2f} | {r['avoided']:>4} ({r['avoided'] / max(len(records), 1):>5.1%}) | "
+                  f"{r['agreement']:>12.2f} | {r['exact']:>11.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Cost of resuming a crashed run from its checkpoint versus rerunning it from scratch.
+
+Runs a deck against the offline fakes with the SQLite checkpointer, makes the reviewer
+call fail once (the last and most expensive place to lose a run), then compares
+resuming the run with a full rerun: wall time and the LLM / vector calls each one makes.
+Also reports the checkpointing overhead on an uninterrupted run.
+
+    python -m benchmarks.bench_resume [--slides 10] [--llm-latency 0.05] [--vector-latency 0.01]
+"""
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class FailOnce:
+    """Chat model proxy whose first call raises, like a reviewer timeout."""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.failed = False
+
+    def invoke(self, messages, **kwargs):
+        if not self.failed:
+            self.failed = True
+            raise TimeoutError("reviewer request timed out")
+        return self.llm.invoke(messages, **kwargs)
+
+def timed_run(app, state, config=None):
+    """(wall seconds, error or None) for one invoke with node output silenced."""
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            app.invoke(state, config)
+        return time.perf_counter() - t0, None
+    except Exception as e:
+        return time.perf_counter() - t0, e
+
+def calls_since(log, before):
+    return sum(stats["calls"] for stats in log.snapshot().values()) - before
+
+def total_calls(log):
+    return sum(stats["calls"] for stats in log.snapshot().values())
+
+def run(slides=10, llm_latency=0.05, vector_latency=0.01):
+    from agents import providers
+    from agents.checkpoint import SqliteCheckpointer, run_config
+    from graph import build_graph, make_initial_state
+
+    log = install_fakes(llm_latency=llm_latency, vector_latency=vector_latency, slides=slides)
+    query = f"Build a {slides} slide deck on FRESCO-2 efficacy"
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpointer = SqliteCheckpointer(os.path.join(tmp, "checkpoints.sqlite"))
+        plain, checkpointed = build_graph(), build_graph(checkpointer)
+        timed_run(plain, make_initial_state(query)) # warm-up: imports, templates
+
+        before = total_calls(log)
+        results["full_run"], _ = timed_run(plain, make_initial_state(query))
+        results["full_run_calls"] = calls_since(log, before)
+        results["checkpointed_run"], _ = timed_run(checkpointed, make_initial_state(query), run_config("clean"))
+
+        providers.overrides["reviewer"] = FailOnce(providers.overrides["llm"])
+        results["crashed_run"], error = timed_run(checkpointed, make_initial_state(query), run_config("crash"))
+        assert error is not None, "the injected reviewer failure did not surface"
+
+        before = total_calls(log)
+        results["resume"], error = timed_run(checkpointed, None, run_config("crash"))
+        assert error is None, f"resume failed: {error}"
+        results["resume_calls"] = calls_since(log, before)
+        del providers.overrides["reviewer"]
+        path = os.path.join(tmp, "checkpoints.sqlite")
+        results["checkpoint_kib"] = sum(os.path.getsize(p) for p in (path, path + "-wal") if os.path.exists(p)) / 1024
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--llm-latency", type=float, default=0.05)
+    parser.add_argument("--vector-latency", type=float, default=0.01)
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # templates/ and theme.json are repo-relative
+    r = run(args.slides, args.llm_latency, args.vector_latency)
+    print(f"{args.slides} slides, LLM latency {args.llm_latency}s, vector latency {args.vector_latency}s")
+    print(f"Full run:          {r['full_run']:.3f}s, {r['full_run_calls']} external calls")
+    print(f"Checkpointed run:  {r['checkpointed_run']:.3f}s "
+          f"(+{(r['checkpointed_run'] - r['full_run']) * 1000:.1f} ms checkpointing)")
+    print(f"Crash in reviewer after {r['crashed_run']:.3f}s")
+    print(f"Resume:            {r['resume']:.3f}s, {r['resume_calls']} external calls "
+          f"({r['resume'] / r['full_run']:.0%} of a full rerun)")
+    print(f"Checkpoint file:   {r['checkpoint_kib']:.0f} KiB for 2 runs")
+
+if __name__ == "__main__":
+    main()
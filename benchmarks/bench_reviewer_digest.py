@@ -0,0 +1,30 @@
+"""Reviewer prompt size: full HTML vs. the per-slide digest.
+
+Usage:
+    python -m benchmarks.bench_reviewer_digest [path/to/deck.html] [--max-tokens N]
+"""
+import argparse
+from agents.digest import build_deck_digest, slides_from_html
+from agents.tokens import count_tokens
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("html_path", nargs="?", default="output.html")
+    parser.add_argument("--max-tokens", type=int, default=4000)
+    args = parser.parse_args()
+
+    with open(args.html_path) as f:
+        html = f.read()
+    slides = slides_from_html(html)
+
+    print(f"{args.html_path}: {len(slides)} slides")
+    print(f"{'deck size':>10} | {'HTML tokens':>11} | {'digest tokens':>13} | {'ratio':>6}")
+    # Repeat the deck to show how each prompt grows with slide count
+    for factor in (1, 2, 4, 8):
+        deck_html = html.replace("<body>", "<body>" + "".join([html.split("<body>", 1)[1].rsplit("</body>", 1)[0]] * (factor - 1)), 1)
+        digest = build_deck_digest([], slides * factor, args.max_tokens)
+        html_tokens, digest_tokens = count_tokens(deck_html), count_tokens(digest)
+        print(f"{len(slides) * factor:>10} | {html_tokens:>11} | {digest_tokens:>13} | {digest_tokens / html_tokens:>6.1%}")
+
+if __name__ == "__main__":
+    main()
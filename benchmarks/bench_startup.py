@@ -0,0 +1,74 @@
+"""Cold-start cost: package imports, client construction and time to the first node.
+
+Every measurement runs in a fresh interpreter, so nothing is warm. "first node" imports
+graph.py, compiles the graph and streams until the planner's update arrives, with the
+clients routed to the offline fakes (zero latency) so only local start-up work is timed.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat 5] [--top 10]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBES = {
+    "import agents.state": "import agents.state",
+    "import agents": "import agents",
+    "import graph": "import graph",
+    "build_graph()": "import graph; graph.build_graph()",
+    "first chat client": "from agents import providers; providers.get_llm('planner')",
+    "first node (fakes)": (
+        "from benchmarks.fakes import install_fakes; install_fakes(); import graph; "
+        "app = graph.build_graph(); "
+        "next(u for u in app.stream(graph.make_initial_state('Build a 3 slide deck'), stream_mode='updates'))"
+    ),
+}
+
+def timed_probe(code):
+    script = f"import time; t0 = time.perf_counter()\n{code}\nprint('ELAPSED', time.perf_counter() - t0)"
+    env = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "x"),
+           "PINECONE_API_KEY": os.environ.get("PINECONE_API_KEY", "x")}
+    out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    return float(re.search(r"ELAPSED ([\d.e-]+)", out).group(1))
+
+def import_profile(module, top):
+    """Heaviest top-level packages by cumulative -X importtime (microseconds)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)", line)
+        if match and len(match.group(2)) <= 3: # direct imports of the probed module only
+            cumulative[match.group(3)] = int(match.group(1))
+    return sorted(cumulative.items(), key=lambda kv: -kv[1])[:top]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="Print medians as JSON")
+    args = parser.parse_args()
+
+    medians = {}
+    for name, code in PROBES.items():
+        runs = [timed_probe(code) for _ in range(args.repeat)]
+        medians[name] = statistics.median(runs)
+    if args.json:
+        print(json.dumps(medians, indent=2))
+        return
+
+    print(f"{'probe':<20} | {'median ms':>9}")
+    for name, seconds in medians.items():
+        print(f"{name:<20} | {seconds * 1000:>9.1f}")
+    print(f"\nHeaviest imports under `import graph` (cumulative ms):")
+    for module, micros in import_profile("graph", args.top):
+        print(f"   {module:<40} {micros / 1000:>8.1f}")
+
+if __name__ == "__main__":
+    main()
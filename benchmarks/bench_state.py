@@ -0,0 +1,88 @@
+"""Pipeline state footprint on a 10-slide deck (offline fakes).
+
+For every state transition (each "values" chunk LangGraph emits) reports the state's
+pickled size and the time to deep-copy it, which is what a checkpointer or a state
+snapshot pays per step. Also reports the process's peak RSS growth over the run and the
+tracemalloc peak.
+
+    python -m benchmarks.bench_state [--slides 10] [--claims 6] [--repeat 5]
+"""
+import argparse
+import contextlib
+import copy
+import io
+import os
+import pickle
+import resource
+import statistics
+import time
+import tracemalloc
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 # KiB on Linux
+
+def measure_transitions(app, state, repeat):
+    """[(step, pickled bytes, mean deepcopy seconds)] for each state the graph emits."""
+    transitions = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for step, chunk in enumerate(app.stream(state, stream_mode="values")):
+            size = len(pickle.dumps(chunk))
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                copy.deepcopy(chunk)
+            transitions.append((step, size, (time.perf_counter() - t0) / repeat))
+    return transitions
+
+def run(slides=10, claims=6, repeat=5):
+    from graph import build_graph, make_initial_state
+
+    install_fakes(slides=slides, claims_per_group=claims)
+    app = build_graph()
+    query = f"Build a {slides} slide deck on FRESCO-2 efficacy"
+
+    # Warm-up run so imports, templates and caches are not counted as state growth
+    with contextlib.redirect_stdout(io.StringIO()):
+        app.invoke(make_initial_state(query))
+
+    rss_before = peak_rss_mb()
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        final_state = app.invoke(make_initial_state(query))
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = peak_rss_mb() - rss_before
+
+    transitions = measure_transitions(app, make_initial_state(query), repeat)
+    return {
+        "transitions": transitions,
+        "final_state_bytes": len(pickle.dumps(final_state)),
+        "peak_rss_growth_mb": rss_growth,
+        "peak_rss_mb": peak_rss_mb(),
+        "traced_peak_mb": traced_peak / 2**20,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--claims", type=int, default=6, help="Claims per content group")
+    parser.add_argument("--repeat", type=int, default=5, help="Deep copies timed per transition")
+    args = parser.parse_args()
+
+    os.chdir(ROOT) # templates/ and theme.json are repo-relative
+    result = run(args.slides, args.claims, args.repeat)
+    print(f"{'step':>4} | {'state KiB':>9} | {'deepcopy ms':>11}")
+    for step, size, seconds in result["transitions"]:
+        print(f"{step:>4} | {size / 1024:>9.1f} | {seconds * 1000:>11.3f}")
+    sizes = [size for _, size, _ in result["transitions"]]
+    copies = [seconds for _, _, seconds in result["transitions"]]
+    print(f"\nPer transition: {statistics.mean(sizes) / 1024:.1f} KiB mean, {max(sizes) / 1024:.1f} KiB max; "
+          f"deepcopy {statistics.mean(copies) * 1000:.2f} ms mean, {sum(copies) * 1000:.1f} ms per deck")
+    print(f"Final state: {result['final_state_bytes'] / 1024:.1f} KiB pickled")
+    print(f"Peak RSS {result['peak_rss_mb']:.1f} MB (+{result['peak_rss_growth_mb']:.1f} MB during the run), "
+          f"tracemalloc peak {result['traced_peak_mb']:.2f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+"""Deterministic offline stand-ins for OpenAI (chat + embeddings) and Pinecone.
+
+Each fake sleeps for a configurable latency, counts calls per agent and reports
+approximate prompt tokens, so the pipeline can be timed without network access.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import numpy as np
+from langchain_core.messages import AIMessage
+from agents.tokens import count_message_tokens
+
+class CallLog:
+    """Thread-safe per-agent counters: calls, prompt tokens and time spent in the fake."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = defaultdict(int)
+        self.tokens = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    def record(self, agent, tokens=0, seconds=0.0):
+        with self._lock:
+            self.calls[agent] += 1
+            self.tokens[agent] += tokens
+            self.seconds[agent] += seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {a: {"calls": self.calls[a], "tokens": self.tokens[a], "seconds": round(self.seconds[a], 4)}
+                    for a in sorted(self.calls)}
+
+def _agent_for(system_prompt):
+    for marker, agent in (
+        ("Deck Architect", "planner"),
+        ("Deck Allocation Judge", "deck_judge"),
+        ("Content Relevance Judge", "judge"),
+        ("navigation tabs", "navbar"),
+        ("Presentation Layout Specialist", "structurer"),
+        ("Evaluate the following image", "image_vetter"),
+        ("Quality Assurance reviewer", "reviewer"),
+    ):
+        if marker in system_prompt:
+            return agent
+    return "other"
+
+class FakeChatModel:
+    """Answers every agent prompt in the pipeline with well-formed, deterministic output."""
+
+    def __init__(self, log, latency=0.0, slides=4, queries_per_slide=3, approve=True, chunk_latency=0.0, jitter=0.0):
+        self.log = log
+        self.latency = latency
+        self.jitter = jitter
+        self.chunk_latency = chunk_latency
+        self.slides = slides
+        self.queries_per_slide = queries_per_slide
+        self.approve = approve
+
+    def invoke(self, messages, **kwargs):
+        reply = self._reply(messages)
+        if self.chunk_latency:
+            # A non-streamed reply still takes the whole generation time
+            time.sleep(self.chunk_latency * ((len(reply.content) - 1) // 64))
+        return reply
+
+    def stream(self, messages, **kwargs):
+        # Reply in 64-character chunks; latency is time to first chunk, chunk_latency the gap between chunks
+        reply = self._reply(messages)
+        for i in range(0, len(reply.content), 64):
+            if i and self.chunk_latency:
+                time.sleep(self.chunk_latency)
+            yield AIMessage(content=reply.content[i:i + 64])
+
+    def _reply(self, messages):
+        t0 = time.perf_counter()
+        agent = _agent_for(messages[0].content)
+        if self.latency:
+            # jitter spreads latency by up to +/- that fraction, fixed per prompt so runs are repeatable
+            digest = hashlib.sha256(messages[-1].content.encode("utf-8")).digest()
+            time.sleep(self.latency * (1 + self.jitter * (digest[0] / 127.5 - 1)))
+        content = getattr(self, f"_{agent}", self._other)(messages)
+        tokens = count_message_tokens(messages)
+        self.log.record(agent, tokens, time.perf_counter() - t0)
+        return AIMessage(content=content, usage_metadata={
+            "input_tokens": tokens, "output_tokens": len(content) // 4, "total_tokens": tokens + len(content) // 4
+        })
+
+    def _planner(self, messages):
+        query = messages[-1].content
+        match = re.search(r"(\d+)\s*slide", query)
+        count = int(match.group(1)) if match else self.slides
+        tabs = ["MOA", "DESIGN", "EFFICACY", "SAFETY", "DOSING"]
+        slides = [
+            {
+                "slide_id": n,
+                "navigation_tab": tabs[(n - 1) % len(tabs)],
+                "action_headline": f"Headline {n}",
+                "page_topic": f"Topic {n} for {query[:40]}",
+                "retrieval_strategy": {
+                    "candidate_queries": [f"slide {n} pseudo-claim {q}" for q in range(self.queries_per_slide)],
+                    "BM25_keywords": ["FRESCO", f"topic{n}"]
+                }
+            }
+            for n in range(1, count + 1)
+        ]
+        plan = {"deck_metadata": {"total_slides": count}, "slides": slides}
+        return f"Analysis: synthetic plan.\n```json\n{json.dumps(plan, indent=2)}\n```"
+
+    def _judge(self, messages):
+        ids = [line.split("|")[0].replace("ID:", "").strip()
+               for line in messages[-1].content.splitlines() if line.startswith("ID:")]
+        return json.dumps(ids[:3])
+
+    def _deck_judge(self, messages):
+        picks = {}
+        for line in messages[-1].content.splitlines():
+            if re.match(r"S\d+:", line):
+                key = line.split(":")[0]
+            elif line.strip().startswith("Candidates:"):
+                ids = [c.strip().split(" ")[0] for c in line.split(":", 1)[1].split(",")]
+                picks[key] = ids[:3]
+        return json.dumps(picks)
+
+    def _navbar(self, messages):
+        topics = json.loads(messages[-1].content.split("Topics:\n", 1)[1])
+        return json.dumps([t.split(" for ")[0].upper()[:20] for t in topics])
+
+    def _structurer(self, messages):
+        topic = messages[-1].content.split("Topic:", 1)[1].split("\n", 1)[0].strip()
+        return json.dumps({
+            "headline": f"{topic.upper()} HEADLINE",
+            "subhead": "SUBHEAD",
+            "layout_class": "grid-cols-2",
+            "references": "1, 2",
+            "content_blocks": [
+                {"type": "text", "col_span_class": "col-span-1", "content": f"<p><b>{topic}</b> summary.</p>"},
+                {"type": "list", "col_span_class": "col-span-1", "items": ["Point A", "Point B"]}
+            ]
+        })
+
+    def _image_vetter(self, messages):
+        return json.dumps({"useful": True})
+
+    def _reviewer(self, messages):
+        return "APPROVED" if self.approve else "Slide 1 needs work.\nFLAGGED_SLIDES: [1]"
+
+    def _other(self, messages):
+        return ""
+
+def fake_vector(text, dim):
+    seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+    return np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+
+class FakeEmbeddings:
+    model = "fake-embedding"
+
+    def __init__(self, log, latency=0.0, dim=64):
+        self.log = log
+        self.latency = latency
+        self.dim = dim
+
+    def embed_documents(self, texts):
+        t0 = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = [fake_vector(t, self.dim).tolist() for t in texts]
+        self.log.record("embeddings", sum(len(t) // 4 for t in texts), time.perf_counter() - t0)
+        return vectors
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+class FakeGroupIndex:
+    """Returns top_k groups per query; scores are all above the 0.5 threshold."""
+
+    def __init__(self, log, latency=0.0, groups=200, claims_per_group=3, dim=64):
+        self.log = log
+        self.latency = latency
+        self.groups = groups
+        self.claims_per_group = claims_per_group
+        self.dim = dim
+
+    def query(self, vector, top_k=5, include_metadata=True):
+        t0 = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        seed = int(abs(vector[0]) * 1e6) % self.groups
+        matches = []
+        for rank in range(top_k):
+            g = (seed + rank * 7) % self.groups
+            matches.append(SimpleNamespace(
+                id=f"group-{g}",
+                score=0.9 - 0.05 * rank,
+                metadata={
+                    "group_id": f"group-{g}",
+                    "group_description": f"Approved content group {g} about FRESCO topic{g % 5}",
+                    "claims": [f"claim-{g}-{c}" for c in range(self.claims_per_group)]
+                }
+            ))
+        self.log.record("group_index", 0, time.perf_counter() - t0)
+        return SimpleNamespace(matches=matches)
+
+class FakeClaimIndex:
+    def __init__(self, log, latency=0.0):
+        self.log = log
+        self.latency = latency
+
+    def fetch(self, ids):
+        t0 = time.perf_counter()
+        if self.latency:
+            time.sleep(self.latency)
+        vectors = {cid: {"metadata": {"claim_text": f"Approved claim text for {cid}.", "claim_id": cid}} for cid in ids}
+        self.log.record("claim_index", 0, time.perf_counter() - t0)
+        return {"vectors": vectors}
+
+class FakePinecone:
+    def __init__(self, log, latency=0.0, groups=200, claims_per_group=3, dim=64):
+        self.group_index = FakeGroupIndex(log, latency, groups, claims_per_group, dim)
+        self.claim_index = FakeClaimIndex(log, latency)
+
+    def Index(self, name):
+        return self.claim_index if "claim" in name else self.group_index
+
+class FakeOpenAIServer:
+    """Local /v1/chat/completions endpoint that enforces RPM, TPM and concurrency limits.
+
+    Limits apply over a sliding `window` (60s like the real API; tests shrink it).
+    Over-limit requests get a 429 with a retry-after header, as the provider would send.
+    """
+
+    def __init__(self, rpm=60, tpm=100000, max_concurrency=4, latency=0.05, window=60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_concurrency = max_concurrency
+        self.latency = latency
+        self.window = window
+        self.accepted = 0
+        self.rejected = 0
+        self.peak_concurrency = 0
+        self._in_flight = 0
+        self._history = deque() # (timestamp, tokens) of accepted requests
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _admit(self, tokens):
+        with self._lock:
+            now = time.monotonic()
+            while self._history and now - self._history[0][0] > self.window:
+                self._history.popleft()
+            used = sum(t for _, t in self._history)
+            if (self._in_flight >= self.max_concurrency or len(self._history) >= self.rpm
+                    or used + tokens > self.tpm):
+                self.rejected += 1
+                return False
+            self._history.append((now, tokens))
+            self._in_flight += 1
+            self.peak_concurrency = max(self.peak_concurrency, self._in_flight)
+            self.accepted += 1
+            return True
+
+    def _done(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", []))
+                if not fake._admit(prompt + 20):
+                    self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}},
+                                {"retry-after": f"{fake.window / max(fake.rpm, 1):.3f}"})
+                    return
+                try:
+                    time.sleep(fake.latency)
+                    self._reply(200, {
+                        "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()),
+                        "model": body.get("model", "fake"),
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": "OK"}}],
+                        "usage": {"prompt_tokens": prompt, "completion_tokens": 20, "total_tokens": prompt + 20}
+                    })
+                finally:
+                    fake._done()
+
+            def _reply(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        return Handler
+
+def install_fakes(monkeypatch=None, llm_latency=0.0, vector_latency=0.0, slides=4, queries_per_slide=3,
+                  groups=200, claims_per_group=3, approve=True, chunk_latency=0.0, llm_jitter=0.0):
+    """Route every agent's OpenAI / Pinecone client to the fakes. Returns the shared CallLog.
+
+    Pass pytest's monkeypatch to have the previous overrides restored after the test.
+    """
+    from agents import providers
+
+    log = CallLog()
+    fakes = {
+        "llm": FakeChatModel(log, llm_latency, slides, queries_per_slide, approve, chunk_latency, llm_jitter),
+        "embeddings": FakeEmbeddings(log, vector_latency),
+        "pinecone": FakePinecone(log, vector_latency, groups, claims_per_group),
+    }
+    for name, value in fakes.items():
+        if monkeypatch is not None:
+            monkeypatch.setitem(providers.overrides, name, value)
+        else:
+            providers.overrides[name] = value
+    return log
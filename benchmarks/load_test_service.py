@@ -0,0 +1,86 @@
+"""Load test for service.py against the offline OpenAI / Pinecone stand-ins.
+
+Starts the HTTP service in-process on an ephemeral port with injected client latency,
+then fires concurrent POST /decks requests for each worker count.
+
+Usage:
+    python -m benchmarks.load_test_service [--requests 16] [--workers 1 2 4] [--llm-latency 0.2]
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.fakes import install_fakes
+from service import DeckService, serve
+
+def post_deck(url, query):
+    request = urllib.request.Request(url, data=json.dumps({"query": query}).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request) as response:
+            body = json.loads(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = {}, e.code
+    return status, time.perf_counter() - t0, body
+
+def run_level(workers, requests, clients, queue_size, slides):
+    service = DeckService(workers, queue_size)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/decks"
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        results = list(pool.map(lambda i: post_deck(url, f"Build a {slides} slide deck, request {i}"), range(requests)))
+    wall = time.perf_counter() - t0
+    server.shutdown()
+    service.shutdown()
+
+    ok = [(latency, body) for status, latency, body in results if status == 200]
+    rejected = sum(1 for status, _, _ in results if status == 503)
+    node_time = defaultdict(list)
+    for _, body in ok:
+        for t in body["timings"]:
+            node_time[t["node"]].append(t["seconds"])
+    latencies = sorted(latency for latency, _ in ok)
+    return {
+        "workers": workers,
+        "ok": len(ok),
+        "rejected": rejected,
+        "throughput": len(ok) / wall,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p95": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+        "queue_wait": statistics.mean(body["queue_wait"] for _, body in ok) if ok else 0.0,
+        "nodes": {node: statistics.mean(v) for node, v in node_time.items()}
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent HTTP clients")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--queue-size", type=int, default=32)
+    parser.add_argument("--slides", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--vector-latency", type=float, default=0.04)
+    args = parser.parse_args()
+
+    install_fakes(llm_latency=args.llm_latency, vector_latency=args.vector_latency, slides=args.slides)
+    print(f"{args.requests} requests from {args.clients} clients, {args.slides} slides/deck, "
+          f"LLM latency {args.llm_latency}s, vector latency {args.vector_latency}s")
+    print(f"{'workers':>7} | {'ok':>3} | {'503':>3} | {'decks/s':>7} | {'p50 s':>6} | {'p95 s':>6} | {'queue s':>7} | per-node mean s")
+    for workers in args.workers:
+        r = run_level(workers, args.requests, args.clients, args.queue_size, args.slides)
+        nodes = ", ".join(f"{n}={s:.2f}" for n, s in r["nodes"].items())
+        print(f"{r['workers']:>7} | {r['ok']:>3} | {r['rejected']:>3} | {r['throughput']:>7.2f} | "
+              f"{r['p50']:>6.2f} | {r['p95']:>6.2f} | {r['queue_wait']:>7.2f} | {nodes}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
+import time
 from langgraph.graph import StateGraph, END
 from agents import AgentState, planner_node, retriever_node, assembler_node, reviewer_node
+from agents import dispatch_node, fan_out_slides, retrieve_node, allocate_node, slide_node, navbar_node, render_node
+from agents.config import SLIDE_FANOUT, FANOUT_MAX_BRANCHES
+from agents.tracing import traced_node
 
 def should_continue(state: AgentState):
     feedback = state.get('feedback', "")
@@ -14,19 +18,69 @@ def should_continue(state: AgentState):
         
     return "planner"
 
-def build_graph():
+def make_initial_state(query, **overrides):
+    """Fresh pipeline state for one deck request."""
+    state = {
+        "query": query,
+        "revision_count": 0,
+        "global_used_claims": [],
+        "deck_plan": [],
+        "retrieved_docs": {},
+        "html_ref": ""
+    }
+    state.update(overrides)
+    return state
+
+def run_timed(app, state, config=None):
+    """Invoke the compiled graph, returning (final_state, [{"node", "seconds"}, ...]) in execution order.
+
+    With a checkpointed app, pass run_config(run_id) as config; state=None resumes that run.
+    """
+    last = time.perf_counter()
+    timings = []
+    final_state = {}
+    for mode, chunk in app.stream(state, config, stream_mode=["updates", "values"]):
+        if mode == "updates":
+            now = time.perf_counter()
+            for node in chunk:
+                timings.append({"node": node, "seconds": round(now - last, 4)})
+            last = now
+        else:
+            final_state = chunk
+    return final_state, timings
+
+def build_graph(checkpointer=None, fanout=None):
+    """Compile the pipeline. With a checkpointer (see agents/checkpoint.py) every node's result is persisted.
+
+    fanout (default SLIDE_FANOUT) replaces the deck-wide retriever -> assembler stages with one
+    retrieve -> dedup -> structure branch per slide, joined by the render node (see agents/fanout.py).
+    """
     workflow = StateGraph(AgentState)
     
-    workflow.add_node("planner", planner_node)
-    workflow.add_node("retriever", retriever_node)
-    workflow.add_node("assembler", assembler_node)
-    workflow.add_node("reviewer", reviewer_node)
+    workflow.add_node("planner", traced_node("planner", planner_node))
+    workflow.add_node("reviewer", traced_node("reviewer", reviewer_node))
     
     workflow.set_entry_point("planner")
     
-    workflow.add_edge("planner", "retriever")
-    workflow.add_edge("retriever", "assembler")
-    workflow.add_edge("assembler", "reviewer")
+    fanout = SLIDE_FANOUT if fanout is None else fanout
+    if fanout:
+        workflow.add_node("dispatch", traced_node("dispatch", dispatch_node))
+        workflow.add_node("retrieve", traced_node("retrieve", retrieve_node))
+        workflow.add_node("allocate", traced_node("allocate", allocate_node), destinations=("slide",))
+        workflow.add_node("slide", traced_node("slide", slide_node))
+        workflow.add_node("navbar", traced_node("navbar", navbar_node))
+        workflow.add_node("render", traced_node("render", render_node))
+        workflow.add_edge("planner", "dispatch")
+        workflow.add_conditional_edges("dispatch", fan_out_slides, ["retrieve", "slide", "navbar"])
+        workflow.add_edge("retrieve", "allocate")
+        workflow.add_edge(["slide", "navbar"], "render") # waits for every branch of the pass
+        workflow.add_edge("render", "reviewer")
+    else:
+        workflow.add_node("retriever", traced_node("retriever", retriever_node))
+        workflow.add_node("assembler", traced_node("assembler", assembler_node))
+        workflow.add_edge("planner", "retriever")
+        workflow.add_edge("retriever", "assembler")
+        workflow.add_edge("assembler", "reviewer")
     
     workflow.add_conditional_edges(
         "reviewer",
@@ -37,4 +91,6 @@ def build_graph():
         }
     )
     
-    return workflow.compile()
+    app = workflow.compile(checkpointer=checkpointer)
+    # Branches of one superstep share the graph's thread pool (default: cpu count + 4 threads)
+    return app.with_config(max_concurrency=FANOUT_MAX_BRANCHES) if fanout else app
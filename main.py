@@ -1,31 +1,69 @@
+import os
 import sys
+import time
 import argparse
-from graph import build_graph
+from graph import build_graph, make_initial_state
+from agents.llm_cache import llm_cache_stats
+from agents.providers import llm_transport_stats
+from agents.artifacts import get_store
+from agents.checkpoint import SqliteCheckpointer, live_artifact_keys, new_run_id, run_config
+from agents.config import CHECKPOINT_ENABLED, CHECKPOINT_PATH
+from agents import tracing
+
+def write_trace(tracer, trace_dir):
+    tracing.write_jsonl(tracer, os.path.join(trace_dir, "trace.jsonl"))
+    tracing.write_chrome_trace(tracer, os.path.join(trace_dir, "trace.json"))
+    print(f"\nTrace written to {trace_dir}/trace.jsonl and {trace_dir}/trace.json (open in chrome://tracing)")
+    for category, spans in tracing.summarize(tracer).items():
+        top = sorted(spans.items(), key=lambda kv: -kv[1]["total_ms"])[:5]
+        print(f"   {category:<9} " + ", ".join(f"{name} {s['total_ms'] / 1000:.2f}s x{s['count']}" for name, s in top))
 
 def main():
     parser = argparse.ArgumentParser(description="Solstice Slide Builder (Medical Architect)")
-    parser.add_argument("query", help="User prompt for the presentation")
+    parser.add_argument("query", nargs="?", help="User prompt for the presentation")
+    parser.add_argument("--stream", action="store_true", help="Stream slides to output.html as they are structured")
+    parser.add_argument("--trace", metavar="DIR", help="Write spans to DIR/trace.jsonl and DIR/trace.json (Chrome trace)")
+    parser.add_argument("--resume", metavar="RUN_ID", help="Continue an interrupted run from its last completed node")
     args = parser.parse_args()
+    if not args.query and not args.resume:
+        parser.error("a query is required unless --resume is given")
     
-    print(f"Starting pipeline for query: {args.query}")
-    
-    app = build_graph()
+    # Expire artifacts of old runs, but not those an interrupted run (or this resume) still needs
+    get_store().sweep(keep=live_artifact_keys(CHECKPOINT_PATH))
+    checkpointer = SqliteCheckpointer(CHECKPOINT_PATH) if CHECKPOINT_ENABLED or args.resume else None
+    app = build_graph(checkpointer)
+    run_id = args.resume or new_run_id()
+    config = run_config(run_id) if checkpointer else None
     
-    initial_state = {
-        "query": args.query,
-        "revision_count": 0,
-        "global_used_claims": [],
-        "deck_plan": [],
-        "retrieved_docs": {},
-        "html_output": ""
-    }
+    if args.resume:
+        snapshot = app.get_state(config)
+        if not snapshot.values:
+            print(f"No checkpoint found for run {run_id} in {CHECKPOINT_PATH}")
+            sys.exit(1)
+        print(f"Resuming run {run_id} ({snapshot.values.get('query')}) at: {', '.join(snapshot.next) or 'finished'}")
+        initial_state = None # continue from the stored checkpoint
+    else:
+        print(f"Starting pipeline for query: {args.query}")
+        if checkpointer:
+            print(f"Run id: {run_id} (resume with: python main.py --resume {run_id})")
+        initial_state = make_initial_state(args.query)
+        if args.stream:
+            initial_state["output_path"] = "output.html"
     
+    if args.trace:
+        tracing.start()
+    started_at = time.time()
     try:
-        final_state = app.invoke(initial_state)
+        final_state = app.invoke(initial_state, config)
+        if checkpointer:
+            checkpointer.delete_thread(run_id) # finished: nothing left to resume
         
-        output_html = final_state.get('html_output', "")
+        output_html = get_store().get_text(final_state['html_ref']) if final_state.get('html_ref') else ""
         
-        if output_html:
+        output_path = final_state.get('output_path')
+        if output_path and os.path.exists(output_path) and (args.resume or os.path.getmtime(output_path) >= started_at):
+            print(f"\nSUCCESS! Presentation streamed to '{output_path}'")
+        elif output_html:
             with open("output.html", "w") as f:
                 f.write(output_html)
             print("\nSUCCESS! Presentation saved to 'output.html'")
@@ -33,11 +71,29 @@ def main():
             print("\nFAILED. No HTML output generated.")
             
         print(f"Final Feedback: {final_state.get('feedback')}")
+        for agent, stats in llm_cache_stats().items():
+            print(f"LLM cache [{agent}]: {stats['hits']} hits / {stats['misses']} misses")
+        transport = llm_transport_stats()
+        if transport:
+            print(f"LLM transport: {transport['requests']} requests, {transport['throttled']} throttled (429), "
+                  f"queue wait {transport['queue_wait']['mean']:.2f}s vs service {transport['service_time']['mean']:.2f}s mean")
+        savings = final_state.get('revision_savings') or {}
+        if savings:
+            print(f"Revision reuse: {savings.get('slides_reused', 0)} slides, "
+                  f"{savings.get('llm_calls', 0)} LLM calls and {savings.get('vector_calls', 0)} vector calls saved")
         
+    except KeyboardInterrupt:
+        if checkpointer:
+            print(f"\nInterrupted. Resume with: python main.py --resume {run_id}")
     except Exception as e:
         print(f"\nCRITICAL ERROR: {e}")
         import traceback
         traceback.print_exc()
+        if checkpointer:
+            print(f"\nCompleted nodes are checkpointed. Resume with: python main.py --resume {run_id}")
+    finally:
+        if args.trace:
+            write_trace(tracing.stop(), args.trace)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,25 @@
+import os
+import sys
+from pinecone import Pinecone
+from dotenv import load_dotenv
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.config import GROUP_INDEX_SNAPSHOT, CLAIM_STORE_PATH
+from agents.local_index import snapshot_index
+from agents.claim_store import ClaimStore
+
+load_dotenv()
+
+def main():
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    print(f"Snapshotting content-gen-group-index -> {GROUP_INDEX_SNAPSHOT} ...")
+    count = snapshot_index(pc.Index("content-gen-group-index"), GROUP_INDEX_SNAPSHOT)
+    print(f"Saved {count} groups. Set GROUP_INDEX_BACKEND=local to use it.")
+
+    print(f"Syncing content-gen-claim-index -> {CLAIM_STORE_PATH} ...")
+    stats = ClaimStore(CLAIM_STORE_PATH).refresh(pc.Index("content-gen-claim-index"))
+    print(f"Fetched {stats['fetched']} new claims, removed {stats['removed']} ({stats['total']} total). "
+          "Set CLAIM_STORE_BACKEND=local to use it.")
+
+if __name__ == "__main__":
+    main()
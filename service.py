@@ -0,0 +1,161 @@
+"""Long-lived deck generation service.
+
+Keeps the compiled LangGraph, API clients, Jinja template and caches warm across requests
+and feeds deck requests through a bounded job queue.
+
+    python service.py --port 8000 --workers 2 --queue-size 16
+
+    POST /decks   {"query": "..."}  -> {"html", "feedback", "timings", "queue_wait", "total"}
+    GET  /health                    -> worker / queue stats
+"""
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from agents.artifacts import get_store, load_html
+from agents.providers import llm_transport_stats
+from graph import build_graph, make_initial_state, run_timed
+
+class DeckJob:
+    def __init__(self, query, overrides):
+        self.query = query
+        self.overrides = overrides
+        self.enqueued_at = time.perf_counter()
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class DeckService:
+    """Worker pool around one compiled graph. submit() raises queue.Full when the backlog is at capacity."""
+
+    def __init__(self, workers=2, queue_size=16):
+        self.app = build_graph()
+        self.jobs = queue.Queue(maxsize=queue_size)
+        self.completed = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._work, daemon=True) for _ in range(workers)]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, query, **overrides):
+        job = DeckJob(query, overrides)
+        self.jobs.put_nowait(job)
+        return job
+
+    def run(self, query, **overrides):
+        """Run one deck synchronously, returning the HTML plus per-node wall-clock timings."""
+        t0 = time.perf_counter()
+        final_state, timings = run_timed(self.app, make_initial_state(query, **overrides))
+        return {
+            "html": load_html(final_state),
+            "feedback": final_state.get("feedback"),
+            "timings": timings,
+            "total": round(time.perf_counter() - t0, 4)
+        }
+
+    def _work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            queue_wait = time.perf_counter() - job.enqueued_at
+            try:
+                job.result = {**self.run(job.query, **job.overrides), "queue_wait": round(queue_wait, 4)}
+                with self._lock:
+                    self.completed += 1
+            except Exception as e:
+                job.error = e
+                with self._lock:
+                    self.failed += 1
+            finally:
+                job.done.set()
+            get_store().maybe_sweep() # at most once per ARTIFACT_SWEEP_INTERVAL across the workers
+
+    def stats(self):
+        with self._lock:
+            stats = {"workers": len(self._threads), "queued": self.jobs.qsize(),
+                     "completed": self.completed, "failed": self.failed}
+        stats["llm_transport"] = llm_transport_stats()
+        return stats
+
+    def shutdown(self):
+        for _ in self._threads:
+            self.jobs.put(None)
+
+def make_handler(service, timeout):
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, status, body, headers=None):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._reply(200, service.stats())
+            else:
+                self._reply(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/decks":
+                self._reply(404, {"error": "not found"})
+                return
+            try:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                query = body["query"]
+            except (ValueError, KeyError):
+                self._reply(400, {"error": "expected JSON body with a 'query' field"})
+                return
+            try:
+                job = service.submit(query)
+            except queue.Full:
+                self._reply(503, {"error": "queue full"}, {"Retry-After": "5"})
+                return
+            if not job.done.wait(timeout):
+                self._reply(504, {"error": "deck generation timed out"})
+            elif job.error is not None:
+                self._reply(500, {"error": str(job.error)})
+            else:
+                self._reply(200, job.result)
+
+        def log_message(self, fmt, *args):
+            pass # pipeline nodes already log to stdout
+
+    return Handler
+
+def serve(service, host="127.0.0.1", port=8000, timeout=600):
+    server = ThreadingHTTPServer((host, port), make_handler(service, timeout))
+    server.daemon_threads = True
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--queue-size", type=int, default=16)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds a request waits for its deck")
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__))) # templates/ and theme.json are repo-relative
+    service = DeckService(args.workers, args.queue_size)
+    server = serve(service, args.host, args.port, args.timeout)
+    print(f"Deck service listening on http://{args.host}:{args.port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        service.shutdown()
+
+if __name__ == "__main__":
+    main()
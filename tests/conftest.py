@@ -0,0 +1,19 @@
+import os
+import sys
+
+# Agent modules build OpenAI / Pinecone clients at import time; offline tests only need dummy keys.
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("PINECONE_API_KEY", "test-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from agents import artifacts
+
+@pytest.fixture(autouse=True)
+def artifact_store(tmp_path):
+    """Every test writes artifacts to its own directory instead of ARTIFACT_DIR."""
+    store = artifacts.ArtifactStore(str(tmp_path / "artifacts"))
+    artifacts.use_store(store)
+    yield store
+    artifacts.use_store(None)
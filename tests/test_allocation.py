@@ -0,0 +1,54 @@
+import json
+from langchain_core.messages import AIMessage
+from agents import providers, retriever
+from agents.allocation import allocate
+
+def cand(gid, score, claims=()):
+    return {"group_id": gid, "description": gid, "claim_ids": list(claims), "score": score}
+
+def test_constrained_slide_is_not_starved():
+    # Slide 1 would greedily take g1, leaving slide 2 (whose only option is g1) empty
+    slides = [[cand("g1", 0.95), cand("g2", 0.9)], [cand("g1", 0.8)]]
+    assert allocate(slides, per_slide=1) == [["g2"], ["g1"]]
+
+def test_result_does_not_depend_on_slide_order():
+    slides = [[cand("g1", 0.9), cand("g2", 0.85), cand("g3", 0.6)], [cand("g1", 0.88), cand("g4", 0.7)]]
+    forward = allocate(slides, per_slide=2)
+    backward = allocate(slides[::-1], per_slide=2)[::-1]
+    assert forward == backward
+    assert not set(forward[0]) & set(forward[1])
+
+def test_overlap_is_tracked_per_claim():
+    slides = [[cand("g1", 0.9, ["c1", "c2"])], [cand("g2", 0.9, ["c1"]), cand("g3", 0.8, ["c1", "c3"])]]
+    assert allocate(slides, used_groups={"g9"}, per_slide=2) == [["g1"], ["g3"]]
+    assert allocate(slides, used_claims={"c1", "c2", "c3"}) == [[], []]
+
+def test_preferred_picks_limit_each_slide():
+    slides = [[cand("g1", 0.9), cand("g2", 0.8), cand("g3", 0.7)]]
+    assert allocate(slides, preferred=[["g3", "g1", "missing"]]) == [["g3", "g1"]]
+
+class DeckJudge:
+    calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        assert "S1: A" in messages[-1].content and "S2: B" in messages[-1].content
+        return AIMessage(content=json.dumps({"S1": ["g1", "g2"], "S2": ["g1", "g3"]}))
+
+def test_deck_judge_is_one_call_for_all_ambiguous_slides(monkeypatch):
+    judge = DeckJudge()
+    monkeypatch.setitem(providers.overrides, "judge", judge)
+    monkeypatch.setattr(retriever, "ALLOCATION_MODE", "deck_judge")
+    monkeypatch.setattr(retriever, "PREJUDGE_MODE", "on")
+    close = [cand("g1", 0.9, ["c1"]), cand("g2", 0.89, ["c2"]), cand("g3", 0.88, ["c3"]), cand("g4", 0.87, ["c4"])]
+    monkeypatch.setattr(retriever, "get_group_candidates", lambda queries, vectors=None: close)
+    monkeypatch.setattr(retriever, "embed_queries", lambda queries: {})
+    monkeypatch.setattr(retriever, "get_claims_by_ids", lambda ids: [{"claim_text": cid} for cid in ids])
+
+    plan = [{"slide_id": n, "page_topic": t, "candidate_queries": [t]} for n, t in ((1, "A"), (2, "B"))]
+    result = retriever.retriever_node({"deck_plan": plan, "global_used_claims": []})
+
+    assert judge.calls == 1
+    picked = [[g.group_id for g in s["selected_content"]] for s in result["deck_plan"]]
+    assert picked in ([["g1", "g2"], ["g3"]], [["g2"], ["g1", "g3"]])
+    assert sorted(result["global_used_claims"]) == ["g1", "g2", "g3"]
@@ -0,0 +1,52 @@
+import os
+import pickle
+import time
+from langchain_core.messages import AIMessage, HumanMessage
+from agents import artifacts
+from agents.artifacts import ArtifactStore
+from agents.state import ContentRef
+
+def test_identical_content_is_stored_once(tmp_path):
+    store = ArtifactStore(str(tmp_path), memory_entries=1)
+    key = store.put_json({"b": 1, "a": [1, 2]})
+    assert store.put_json({"a": [1, 2], "b": 1}) == key # canonical JSON
+    assert store.stats()["writes"] == 1 and store.stats()["dedup_writes"] == 1
+
+    store.put_text("evicts the first entry from memory")
+    assert store.get_json(key) == {"a": [1, 2], "b": 1}
+    assert store.stats()["disk_reads"] == 1
+
+def test_state_holds_only_references(artifact_store):
+    ids = [f"c{i}" for i in range(50)]
+    claims = [{"claim_text": f"Claim {i}: ORR 1.5% vs 0.4%", "image_url": f"https://example.com/{i}.png"} for i in range(50)]
+    ref = artifacts.content_ref("g1", ids, claims)
+    assert ref == ContentRef("g1", tuple(ids), ref.claims_key)
+    assert len(pickle.dumps(ref)) < len(pickle.dumps(claims)) / 5
+
+    [group] = artifacts.load_groups([ref])
+    assert group == {"group_id": "g1", "claim_ids": ids, "claims": claims}
+    group["claims"].clear() # callers get their own copy
+    assert artifacts.load_groups([ref])[0]["claims"] == claims
+
+    messages = [HumanMessage(content="hi"), AIMessage(content="hello")]
+    assert [m.content for m in artifacts.load_messages(artifacts.put_messages(messages))] == ["hi", "hello"]
+
+def test_load_html_falls_back_to_streamed_file(artifact_store, tmp_path):
+    path = tmp_path / "deck.html"
+    path.write_text("<html>streamed</html>")
+    assert artifacts.load_html({"html_ref": "", "output_path": str(path)}) == "<html>streamed</html>"
+    key = artifact_store.put_text("<html>stored</html>")
+    assert artifacts.load_html({"html_ref": key, "output_path": str(path)}) == "<html>stored</html>"
+
+def test_sweep_expires_unused_artifacts_then_caps_size(tmp_path):
+    store = ArtifactStore(str(tmp_path), ttl=3600, max_bytes=150, min_age=60)
+    now = time.time()
+    keys = [store.put_text(f"{i}" * 100) for i in range(4)]
+    for age, key in zip([7200, 7200, 600, 30], keys):
+        os.utime(store.path(key), (now - age, now - age))
+    store.put_text("0" * 100) # written again: in use, so no longer expired
+
+    assert store.sweep(now=now) == {"removed": 2, "kept": 2, "bytes": 200}
+    assert [os.path.exists(store.path(k)) for k in keys] == [True, False, False, True]
+    # keys[1] expired; keys[2] was the least recently used past the cap; keys[3] is too recent to evict
+    assert store.maybe_sweep() is None # swept just now
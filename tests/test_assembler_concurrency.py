@@ -0,0 +1,113 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.messages import AIMessage
+from agents import assemble2, providers
+from agents.artifacts import load_html, load_messages, load_structured
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class FakeLLM:
+    """Navbar and structurer stand-in; 'Broken' topics raise to exercise the fallback."""
+    def invoke(self, messages):
+        time.sleep(0.2)
+        prompt = messages[-1].content
+        if messages[0].content == assemble2.NAVBAR_GENERATOR_PROMPT:
+            topics = json.loads(prompt.split("Topics:\n", 1)[1])
+            return AIMessage(content=json.dumps([t.upper() for t in topics]))
+        if "Broken" in prompt:
+            raise RuntimeError("structurer timeout")
+        topic = prompt.split("Topic:", 1)[1].split("\n", 1)[0].strip()
+        return AIMessage(content=json.dumps({"headline": f"H {topic}", "subhead": topic,
+                                             "layout_class": "grid-cols-2", "content_blocks": []}))
+
+def make_plan():
+    claims = [{"group_id": "g", "claims": [{"claim_text": "x"}]}]
+    return [
+        {"page_topic": "Design", "selected_content": claims},
+        {"page_topic": "Efficacy", "selected_content": claims},
+        {"page_topic": "Broken", "selected_content": claims},
+        {"page_topic": "Empty", "selected_content": None},
+        {"page_topic": "Safety", "selected_content": claims},
+    ]
+
+def test_structuring_runs_concurrently_in_slide_order(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setitem(providers.overrides, "structurer", FakeLLM())
+    monkeypatch.setitem(providers.overrides, "navbar", FakeLLM())
+
+    t0 = time.perf_counter()
+    result = assemble2.assembler_node({"deck_plan": make_plan(), "assembler_max_workers": 8})
+    elapsed = time.perf_counter() - t0
+
+    assert elapsed < 0.6 # 5 calls of 0.2s each would take >= 1.0s serially
+    html = load_html(result)
+    positions = [html.index(h) for h in ["H Design", "H Efficacy", "Error Generating Slide", "No Content Available", "H Safety"]]
+    assert positions == sorted(positions)
+    assert "structurer timeout" in html
+    assert len(load_messages(result["assembler_messages_ref"])) == 9 # 3 successful structurer calls x 3 messages
+
+class NavbarLLM:
+    def invoke(self, messages):
+        topics = json.loads(messages[-1].content.split("Topics:\n", 1)[1])
+        return AIMessage(content=json.dumps([f"NAV {t}" for t in topics]))
+
+def test_navbar_labels_use_the_navbar_client(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setitem(providers.overrides, "structurer", FakeLLM())
+    monkeypatch.setitem(providers.overrides, "navbar", NavbarLLM())
+
+    result = assemble2.assembler_node({"deck_plan": make_plan()})
+
+    labels = [s["nav_label"] for s in load_structured(result)]
+    assert labels == ["NAV Design", "NAV Efficacy", "NAV Broken", "NAV Empty", "NAV Safety"]
+
+class SlowLastSlideLLM(FakeLLM):
+    """Records what is already on disk while the last slide is still being structured."""
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.seen_on_disk = None
+
+    def invoke(self, messages):
+        if "Topic: Safety" in messages[-1].content and self.seen_on_disk is None:
+            time.sleep(0.5)
+            partial_path, = glob.glob(os.path.join(self.out_dir, "*.partial"))
+            with open(partial_path) as f:
+                self.seen_on_disk = f.read()
+        return super().invoke(messages)
+
+def test_streaming_output_matches_render(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    output_path = str(tmp_path / "deck.html")
+    llm = SlowLastSlideLLM(str(tmp_path))
+    monkeypatch.setitem(providers.overrides, "structurer", llm)
+    monkeypatch.setitem(providers.overrides, "navbar", llm)
+
+    streamed = assemble2.assembler_node({"deck_plan": make_plan(), "output_path": output_path})
+    rendered = assemble2.assembler_node({"deck_plan": make_plan()})
+
+    assert streamed["html_ref"] == ""
+    assert len(streamed["structured_refs"]) == 5 # one artifact per slide; state holds no slide payloads
+    assert load_structured(streamed) == load_structured(rendered)
+    with open(output_path) as f:
+        assert f.read() == load_html(rendered)
+    assert not glob.glob(str(tmp_path / "*.partial"))
+    assert "H Design" in llm.seen_on_disk and "H Safety" not in llm.seen_on_disk
+
+def test_concurrent_renders_to_one_path_do_not_collide(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setitem(providers.overrides, "structurer", FakeLLM())
+    monkeypatch.setitem(providers.overrides, "navbar", FakeLLM())
+    output_path = str(tmp_path / "deck.html")
+
+    with ThreadPoolExecutor(3) as pool:
+        results = list(pool.map(lambda _: assemble2.assembler_node({"deck_plan": make_plan(),
+                                                                    "output_path": output_path}), range(3)))
+
+    rendered = assemble2.assembler_node({"deck_plan": make_plan()})
+    assert all(r["html_ref"] == "" for r in results)
+    with open(output_path) as f:
+        assert f.read() == load_html(rendered)
+    assert not glob.glob(str(tmp_path / "*.partial"))
@@ -0,0 +1,51 @@
+import json
+import os
+from agents import retriever
+from batch import load_jobs, run_batch
+from benchmarks.fakes import install_fakes
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_batch_writes_one_deck_per_query_and_shares_lookups(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    log = install_fakes(monkeypatch, slides=2)
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text("\n".join([
+        json.dumps({"id": "efficacy", "query": "Build a 2 slide deck on efficacy"}),
+        json.dumps("Build a 2 slide deck on efficacy"),
+        "",
+        json.dumps({"query": "Build a 3 slide deck on safety"}),
+    ]))
+
+    jobs = load_jobs(str(queries))
+    assert [j["id"] for j in jobs] == ["efficacy", "deck-002", "deck-003"]
+
+    results, report = run_batch(jobs, str(tmp_path / "decks"), workers=3, log_path=str(tmp_path / "batch.log"))
+
+    assert [r["ok"] for r in results] == [True, True, True]
+    for r in results:
+        assert os.path.exists(r["output"])
+    assert report["succeeded"] == 3 and report["decks_per_minute"] > 0
+    # The two identical decks share every group search and claim fetch
+    assert report["shared_lookups"]["hits"] >= 6
+    assert log.calls["group_index"] == report["shared_lookups"]["misses"] - log.calls["claim_index"]
+    assert retriever.shared_lookups is None
+
+def test_colliding_ids_get_their_own_output(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    install_fakes(monkeypatch, slides=2)
+    queries = tmp_path / "queries.jsonl"
+    queries.write_text("\n".join(json.dumps({"id": deck_id, "query": f"Build a {n} slide deck"})
+                                 for deck_id, n in [("brand a", 2), ("brand_a", 3), ("brand_a", 4), ("brand_a-2", 2)]))
+    out_dir = tmp_path / "decks"
+    out_dir.mkdir()
+    (out_dir / "brand_a.html").write_text("<html>previous batch</html>")
+
+    jobs = load_jobs(str(queries))
+    assert [j["id"] for j in jobs] == ["brand_a", "brand_a-2", "brand_a-3", "brand_a-2-2"]
+
+    results, _ = run_batch(jobs, str(out_dir), workers=4, log_path=str(tmp_path / "batch.log"))
+
+    assert all(r["ok"] for r in results)
+    slides = [open(r["output"]).read().count('class="slide-container"') for r in results]
+    assert slides == [2, 3, 4, 2]
@@ -0,0 +1,30 @@
+import os
+from agents import providers, retriever
+from benchmarks.bench_pipeline import compare, run_pipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_offline_pipeline_counts_calls_per_node(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(providers, "overrides", {})
+    monkeypatch.setattr(retriever, "GROUP_SEARCH_TOP_K", retriever.GROUP_SEARCH_TOP_K)
+
+    result = run_pipeline({"slides": 2, "candidates": 4, "claims": 2})
+
+    assert result["calls"]["planner.planner"] == 1
+    assert result["calls"]["retriever.deck_judge"] == 1 # one call for the whole deck
+    assert "retriever.judge" not in result["calls"]
+    assert result["calls"]["assembler.structurer"] == 2
+    assert result["calls"]["reviewer.reviewer"] == 1
+    assert set(result["node_seconds"]) == {"planner", "retriever", "assembler", "reviewer"}
+    assert result["tokens"]["retriever"] > 0
+
+def test_compare_flags_extra_calls_and_slowdowns():
+    previous = {"wall_time": 1.0, "calls": {"retriever.judge": 6}, "tokens": {"retriever": 1000}}
+    baseline = {"results": {"k": previous}}
+
+    assert compare({"k": previous}, baseline) == []
+    regressions = compare({"k": {"wall_time": 1.5, "calls": {"retriever.judge": 7},
+                                 "tokens": {"retriever": 1050}}}, baseline)
+    assert len(regressions) == 2
+    assert any("judge calls 7 > 6" in r for r in regressions)
@@ -0,0 +1,37 @@
+from types import SimpleNamespace
+from agents import retriever
+from agents.bm25 import BM25Index, build_group_bm25, reciprocal_rank_fusion, tokenize
+
+def test_tokenize_keeps_trial_names_distinct():
+    assert tokenize("FRESCO-2 (global) vs FRESCO; Grade 3 ARs") == ["fresco-2", "global", "vs", "fresco", "grade", "3", "ars"]
+
+def test_bm25_prefers_exact_entity():
+    index = BM25Index({
+        "a": "FRESCO-2 global multiregional study overall survival",
+        "b": "FRESCO China pivotal study overall survival",
+        "c": "Dosing and administration",
+    })
+    assert [doc for doc, _ in index.search(["FRESCO"])] == ["b"]
+    assert [doc for doc, _ in index.search(["FRESCO-2", "survival"])][0] == "a"
+
+def test_rrf_rewards_agreement():
+    assert reciprocal_rank_fusion([["x", "y", "z"], ["y", "w"]]) == ["y", "x", "w", "z"]
+
+def test_hybrid_candidates_are_fused_and_capped(monkeypatch):
+    group_index = SimpleNamespace(metadata=[
+        {"group_id": f"g{i}", "group_description": desc, "claims": [f"c{i}"]}
+        for i, desc in enumerate([
+            "FRESCO-2 overall survival", "FRESCO overall survival", "Safety overview",
+            "Dosing schedule", "Mechanism of action", "Patient support", "FRESCO study design",
+        ])
+    ])
+    vector_hits = [{"group_id": f"g{i}", "description": "", "claim_ids": [], "score": 0.9 - 0.05 * i} for i in range(6)]
+    monkeypatch.setattr(retriever, "get_group_candidates", lambda queries, vectors=None: vector_hits)
+    monkeypatch.setattr(retriever, "_bm25", build_group_bm25(group_index))
+    monkeypatch.setattr(retriever, "HYBRID_MAX_CANDIDATES", 3)
+
+    candidates = retriever.get_hybrid_candidates(["q"], ["FRESCO"])
+
+    # g1 and g6 contain the exact "FRESCO" token; g6 is a lexical-only hit
+    assert [c["group_id"] for c in candidates] == ["g1", "g0", "g6"]
+    assert candidates[2]["claim_ids"] == ["c6"]
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import pytest
+import main
+from agents import artifacts, providers
+from agents.checkpoint import SqliteCheckpointer, run_config
+from agents.state import ContentRef
+from benchmarks.bench_resume import FailOnce
+from benchmarks.fakes import install_fakes
+from graph import build_graph, make_initial_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_crashed_run_resumes_at_the_failed_node(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    log = install_fakes(monkeypatch, slides=3)
+    monkeypatch.setitem(providers.overrides, "reviewer", FailOnce(providers.overrides["llm"]))
+    path = str(tmp_path / "checkpoints.sqlite")
+
+    with pytest.raises(TimeoutError):
+        build_graph(SqliteCheckpointer(path)).invoke(make_initial_state("Build a 3 slide deck"), run_config("r1"))
+    before = log.snapshot()
+
+    # A fresh process would only have the file: reopen it and continue with no input
+    app = build_graph(SqliteCheckpointer(path))
+    snapshot = app.get_state(run_config("r1"))
+    assert snapshot.next == ("reviewer",)
+    assert all(isinstance(g, ContentRef) for s in snapshot.values["deck_plan"] for g in s["selected_content"])
+
+    final_state = app.invoke(None, run_config("r1"))
+    after = log.snapshot()
+    assert final_state["feedback"] == "APPROVED"
+    assert {a: after[a]["calls"] - before.get(a, {"calls": 0})["calls"] for a in after} == {
+        a: int(a == "reviewer") for a in after} # only the failed node ran again
+    assert app.get_state(run_config("r1")).next == ()
+    assert app.get_state(run_config("unknown")).values == {}
+
+def test_finished_runs_leave_no_checkpoints(monkeypatch, tmp_path):
+    install_fakes(monkeypatch, slides=2)
+    path = str(tmp_path / "checkpoints.sqlite")
+    monkeypatch.setattr(main, "CHECKPOINT_PATH", path)
+    monkeypatch.setattr(main, "CHECKPOINT_ENABLED", True)
+    monkeypatch.setattr(sys, "argv", ["main.py", "Build a 2 slide deck"])
+    monkeypatch.chdir(tmp_path) # output.html
+
+    main.main()
+
+    assert (tmp_path / "output.html").exists()
+    assert list(SqliteCheckpointer(path).list(None)) == []
+
+def test_resume_survives_the_artifact_sweep(monkeypatch, tmp_path, capsys):
+    monkeypatch.chdir(ROOT)
+    install_fakes(monkeypatch, slides=3)
+    monkeypatch.setitem(providers.overrides, "reviewer", FailOnce(providers.overrides["llm"]))
+    path = str(tmp_path / "checkpoints.sqlite")
+    with pytest.raises(TimeoutError):
+        build_graph(SqliteCheckpointer(path)).invoke(make_initial_state("Build a 3 slide deck"), run_config("r1"))
+
+    # Days later, in a new process: every artifact is past the TTL, one belongs to no run
+    store = artifacts.get_store()
+    stale = store.put_text("left over from a finished run")
+    aged = time.time() - store.ttl - 60
+    for dirpath, _, names in os.walk(store.root):
+        for name in names:
+            os.utime(os.path.join(dirpath, name), (aged, aged))
+    artifacts.use_store(artifacts.ArtifactStore(store.root))
+    monkeypatch.setattr(main, "CHECKPOINT_PATH", path)
+    monkeypatch.setattr(sys, "argv", ["main.py", "--resume", "r1"])
+    monkeypatch.chdir(tmp_path) # output.html
+
+    main.main()
+
+    assert "Final Feedback: APPROVED" in capsys.readouterr().out
+    assert not os.path.exists(store.path(stale))
+    assert list(SqliteCheckpointer(path).list(None)) == []
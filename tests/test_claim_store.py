@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+from agents import retriever, providers
+from agents.claim_store import ClaimStore
+
+class FakeClaimIndex:
+    def __init__(self, claims):
+        self.claims = claims
+        self.fetches = []
+
+    def fetch(self, ids):
+        self.fetches.append(list(ids))
+        return {"vectors": {cid: {"metadata": self.claims[cid]} for cid in ids if cid in self.claims}}
+
+    def list(self):
+        yield list(self.claims)
+
+CLAIMS = {
+    "c1": {"claim_text": "mOS 7.4 vs 4.8 months", "image_url": "https://x/fig1.png", "page": 3},
+    "c2": {"claim_text": "Grade 3 ARs", "image_url": "https://x/fig1.png"},
+    "c3": {"claim_text": "Placebo-controlled"},
+}
+
+def test_lookup_falls_back_to_pinecone_once(tmp_path, monkeypatch):
+    index = FakeClaimIndex(CLAIMS)
+    monkeypatch.setitem(providers.overrides, "pinecone", SimpleNamespace(Index=lambda name: index))
+    monkeypatch.setattr(retriever, "claim_store", ClaimStore(str(tmp_path / "claims.sqlite")))
+
+    first = retriever.get_claims_by_ids(["c2", "c1", "missing"])
+    second = retriever.get_claims_by_ids(["c1", "c2"])
+
+    assert index.fetches == [["c2", "c1", "missing"]]
+    assert first == [CLAIMS["c2"], CLAIMS["c1"]]
+    assert second == [CLAIMS["c1"], CLAIMS["c2"]]
+    second[0]["image_url"] = None # callers may mutate their copy
+    assert retriever.get_claims_by_ids(["c1"]) == [CLAIMS["c1"]]
+
+def test_local_hits_never_build_the_claim_index(tmp_path, monkeypatch):
+    store = ClaimStore(str(tmp_path / "claims.sqlite"))
+    store.refresh(FakeClaimIndex(CLAIMS))
+
+    def offline(name):
+        raise OSError("Name or service not known")
+
+    monkeypatch.setitem(providers.overrides, "pinecone", SimpleNamespace(Index=offline))
+    monkeypatch.setattr(retriever, "claim_store", store)
+
+    assert retriever.get_claims_by_ids(["c1", "c3"]) == [CLAIMS["c1"], CLAIMS["c3"]]
+
+def test_refresh_is_incremental_and_persistent(tmp_path):
+    path = str(tmp_path / "claims.sqlite")
+    index = FakeClaimIndex(dict(CLAIMS))
+    assert ClaimStore(path).refresh(index) == {"fetched": 3, "removed": 0, "total": 3}
+
+    del index.claims["c3"]
+    index.claims["c4"] = {"claim_text": "new"}
+    index.fetches.clear()
+    store = ClaimStore(path)
+    assert store.refresh(index) == {"fetched": 1, "removed": 1, "total": 3}
+    assert index.fetches == [["c4"]]
+
+    records = ClaimStore(path).get_many(["c1", "c2", "c3"])
+    assert set(records) == {"c1", "c2"}
+    assert records["c1"].image_url is records["c2"].image_url # interned
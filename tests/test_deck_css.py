@@ -0,0 +1,52 @@
+import os
+from agents import assemble2, deck_css
+from agents.artifacts import get_store, load_structured
+from agents.digest import slides_from_html
+from benchmarks.fakes import install_fakes
+from graph import build_graph, make_initial_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_css_is_built_only_for_the_classes_used():
+    html = ('<style>.slide-container{width:1280px}</style>'
+            '<div class="slide-container p-4 w-3/4 text-[10px] hover:opacity-100 space-y-3 prose fancy-thing"></div>')
+    css, unknown = deck_css.build_css(deck_css.used_classes(html), deck_css.styled_classes(html))
+
+    assert ".p-4{padding:1rem}" in css
+    assert r".w-3\/4{width:75%}" in css
+    assert r".text-\[10px\]{font-size:10px}" in css
+    assert r".hover\:opacity-100:hover{opacity:1}" in css
+    assert ".space-y-3>:not([hidden])~:not([hidden]){margin-top:0.75rem}" in css
+    assert ".grid{" not in css and ".mt-4" not in css
+    assert unknown == ["fancy-thing"] # slide-container has its own rule, prose is unstyled with the CDN too
+
+def test_bundle_is_offline_with_one_navbar(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(assemble2, "DECK_RENDER_MODE", "bundle")
+    install_fakes(monkeypatch, slides=4)
+    state = build_graph().invoke(make_initial_state("Build a 4 slide deck"))
+    html = get_store().get_text(state["html_ref"])
+    structured = load_structured(state)
+
+    assert "cdn.tailwindcss.com" not in html and deck_css.CSS_MARKER not in html
+    assert html.count('alt="Brand Logo"') == 1
+    assert ".text-primary{color:var(--primary)}" in html
+    assert html.count('class="slide-container"') == 4
+    parsed = slides_from_html(html)
+    assert [s["nav_label"] for s in parsed] == [s["nav_label"] for s in structured]
+    assert [s["headline"] for s in parsed] == [s["headline"] for s in structured]
+
+def test_bundle_writes_output_path_atomically(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(assemble2, "DECK_RENDER_MODE", "bundle")
+    install_fakes(monkeypatch, slides=2)
+    output_path = tmp_path / "deck.html"
+    state = build_graph().invoke({**make_initial_state("Build a 2 slide deck"), "output_path": str(output_path)})
+
+    assert state["html_ref"] == ""
+    assert "<style>*,::before,::after{" in output_path.read_text()
+    assert not list(tmp_path.glob("*.partial"))
+
+def test_templates_are_compiled_once_per_process():
+    assert assemble2.get_template("cdn") is assemble2.get_template("cdn")
+    assert assemble2.get_template("bundle") is not assemble2.get_template("cdn")
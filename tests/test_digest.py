@@ -0,0 +1,32 @@
+import os
+from agents.digest import build_deck_digest, slides_from_html
+from agents.tokens import count_tokens
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_sample_slides():
+    with open(os.path.join(ROOT, "output.html")) as f:
+        return slides_from_html(f.read())
+
+def test_slides_recovered_from_rendered_deck():
+    slides = load_sample_slides()
+    assert len(slides) == 5
+    first = slides[0]
+    assert first["nav_label"] == "MOA"
+    assert first["headline"].startswith("SELECTIVE VEGFR-1/2/3 INHIBITION")
+    assert first["layout_class"] == "grid-cols-2"
+    assert [b["type"] for b in first["content_blocks"]][:3] == ["text", "list", "image"]
+    assert first["content_blocks"][2]["url"].endswith(".png")
+
+def test_digest_includes_claims_and_respects_budget():
+    slides = load_sample_slides()
+    plan = [{"page_topic": "MoA", "selected_content": [
+        {"group_id": "g1", "claim_ids": ["c1", "c2"], "claims": [{"claim_text": "VEGFR-1/2/3"}, {"claim_text": "Oral"}]}
+    ]}]
+    digest = build_deck_digest(plan, slides, max_tokens=3000)
+    assert "- [c1] VEGFR-1/2/3" in digest
+    assert "Headline: SELECTIVE VEGFR-1/2/3" in digest
+    assert "class=" not in digest
+
+    # 8x the deck still fits the cap (headline-level summary at worst)
+    assert count_tokens(build_deck_digest([], slides * 8, max_tokens=1500)) <= 1500 + 10
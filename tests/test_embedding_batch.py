@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+from agents import retriever, providers
+
+class FakeEmbedder:
+    def __init__(self):
+        self.document_calls = []
+        self.query_calls = 0
+
+    def embed_documents(self, texts):
+        self.document_calls.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts]
+
+    def embed_query(self, text):
+        self.query_calls += 1
+        return [float(len(text)), 1.0]
+
+class FakeIndex:
+    def __init__(self):
+        self.vectors = []
+
+    def query(self, vector, top_k, include_metadata):
+        self.vectors.append(vector)
+        return SimpleNamespace(matches=[])
+
+def test_embed_queries_batches_whole_deck():
+    embedder = FakeEmbedder()
+    plan = [{"candidate_queries": [f"slide {s} claim {c}" for c in range(4)]} for s in range(5)]
+    queries = [q for slide in plan for q in slide["candidate_queries"]]
+
+    vectors = retriever.embed_queries(queries + queries[:3], embedder=embedder, batch_size=8)
+
+    assert len(embedder.document_calls) == 3 # 20 unique queries / batch of 8
+    assert [len(b) for b in embedder.document_calls] == [8, 8, 4]
+    assert embedder.query_calls == 0
+    assert set(vectors) == set(queries)
+    assert vectors["slide 0 claim 0"] == [15.0, 1.0]
+
+def test_group_search_uses_precomputed_vectors(monkeypatch):
+    embedder = FakeEmbedder()
+    index = FakeIndex()
+    monkeypatch.setitem(providers.overrides, "embeddings", embedder)
+    monkeypatch.setitem(providers.overrides, "pinecone", SimpleNamespace(Index=lambda name: index))
+
+    vectors = retriever.embed_queries(["a", "bb"], embedder=embedder)
+    retriever.get_group_candidates(["a", "bb", "ccc"], vectors)
+
+    assert embedder.query_calls == 1 # only the query missing from the batch
+    assert index.vectors == [[1.0, 1.0], [2.0, 1.0], [3.0, 1.0]]
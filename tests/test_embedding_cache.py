@@ -0,0 +1,37 @@
+import numpy as np
+from agents.embedding_cache import CachedEmbeddings
+
+class FakeEmbedder:
+    model = "fake-embedding"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[0.1 * len(t), -0.5, 0.25] for t in texts]
+
+def test_hits_survive_reopen_and_normalize_whitespace(tmp_path):
+    path = str(tmp_path / "emb.sqlite")
+    first = CachedEmbeddings(FakeEmbedder(), path)
+    vectors = first.embed_documents(["FRESCO  mOS", "FRESCO-2 mOS"])
+    assert first.stats() == {"hits": 0, "misses": 2, "hit_rate": 0.0}
+
+    embedder = FakeEmbedder()
+    second = CachedEmbeddings(embedder, path)
+    again = second.embed_documents([" FRESCO mOS\n", "FRESCO-2 mOS", "fresco mOS"])
+
+    assert embedder.embedded == ["fresco mOS"] # case is significant
+    assert np.allclose(again[:2], vectors, atol=1e-3) # float16 storage
+    assert second.stats()["hits"] == 2
+
+def test_lru_eviction(tmp_path):
+    cache = CachedEmbeddings(FakeEmbedder(), str(tmp_path / "emb.sqlite"), max_entries=2)
+    cache.embed_query("a")
+    cache.embed_query("bb")
+    cache.embed_query("a") # refresh "a"
+    cache.embed_query("ccc") # evicts "bb"
+
+    cache.embedder = FakeEmbedder()
+    cache.embed_documents(["a", "bb", "ccc"])
+    assert cache.embedder.embedded == ["bb"]
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import pytest
+from agents import assemble2, fanout, retriever
+from agents.artifacts import load_structured
+from benchmarks.fakes import install_fakes
+from graph import build_graph, make_initial_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def selection(state):
+    return [[(ref.group_id, ref.claim_ids) for ref in slide["selected_content"] or []] for slide in state["deck_plan"]]
+
+def run(fanout_graph):
+    state = build_graph(fanout=fanout_graph).invoke(make_initial_state("Build a 6 slide deck"))
+    return state, load_structured(state)
+
+@pytest.mark.parametrize("mode", ["deck_judge", "slide"])
+def test_fanout_builds_the_same_deck_as_the_stages(monkeypatch, mode):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(retriever, "ALLOCATION_MODE", mode)
+    monkeypatch.setattr(fanout, "ALLOCATION_MODE", mode)
+    log = install_fakes(monkeypatch, slides=6, groups=40, claims_per_group=2)
+    staged, staged_slides = run(False)
+    staged_calls = log.snapshot()
+    fanned, fanned_slides = run(True)
+
+    assert selection(fanned) == selection(staged)
+    assert fanned_slides == staged_slides
+    assert fanned["global_used_claims"] == staged["global_used_claims"]
+    assert fanned["feedback"] == "APPROVED"
+    groups = [gid for slide in selection(fanned) for gid, _ in slide]
+    assert len(groups) == len(set(groups))
+    judge = "deck_judge" if mode == "deck_judge" else "judge"
+    judge_calls = staged_calls.get(judge, {"calls": 0})["calls"]
+    assert log.snapshot().get(judge, {"calls": 0})["calls"] == 2 * judge_calls # same judge calls in both graphs
+    assert log.snapshot()["embeddings"]["calls"] == 2 * staged_calls["embeddings"]["calls"] == 2 # one batch per deck
+    assert fanout._ledgers == {}
+
+def test_early_slides_are_structured_while_later_ones_are_still_retrieving(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(fanout, "ALLOCATION_MODE", "slide")
+    install_fakes(monkeypatch, slides=4)
+    events = []
+    lock = threading.Lock()
+
+    def slow_last_slide(slide, vectors=None):
+        if slide["slide_id"] == 4:
+            time.sleep(0.3)
+        result = retriever.search_and_judge(slide, vectors)
+        with lock:
+            events.append(("retrieved", slide["slide_id"]))
+        return result
+
+    def structure(index, slide):
+        with lock:
+            events.append(("structuring", index + 1))
+        return assemble2.structure_slide(index, slide)
+
+    monkeypatch.setattr(fanout, "search_and_judge", slow_last_slide)
+    monkeypatch.setattr(fanout, "structure_slide", structure)
+    build_graph(fanout=True).invoke(make_initial_state("Build a 4 slide deck"))
+
+    assert events.index(("structuring", 1)) < events.index(("retrieved", 4))
+    assert events[-1] == ("structuring", 4) # the slow slide still dedups after the earlier ones
+
+def test_render_deduplicates_branches_that_ran_without_their_ledger(monkeypatch, capsys):
+    monkeypatch.chdir(ROOT)
+    monkeypatch.setattr(retriever, "ALLOCATION_MODE", "slide")
+    monkeypatch.setattr(fanout, "ALLOCATION_MODE", "slide")
+    install_fakes(monkeypatch, slides=6, groups=12, claims_per_group=2)
+    staged, _ = run(False)
+
+    monkeypatch.setattr(fanout, "get_ledger", lambda fanout_id: None) # as after a resume in a new process
+    capsys.readouterr()
+    fanned, fanned_slides = run(True)
+
+    assert "Re-structuring" in capsys.readouterr().out # branches overlapped, the join trimmed them
+    assert selection(fanned) == selection(staged)
+    assert len(fanned_slides) == 6
+
+def test_a_failed_branch_releases_the_slides_waiting_on_it():
+    ledger = fanout.open_ledger([0, 1], set(), set())
+    errors = []
+    waiter = threading.Thread(target=lambda: errors.append(
+        pytest.raises(RuntimeError, ledger.reserve, 1, lambda groups, claims: None)))
+    waiter.start()
+    time.sleep(0.05)
+    ledger.abort(0)
+    waiter.join(timeout=1)
+
+    assert not waiter.is_alive() and errors
+    assert fanout.get_ledger(ledger.id) is None
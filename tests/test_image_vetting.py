@@ -0,0 +1,48 @@
+import json
+import threading
+from langchain_core.messages import AIMessage
+from agents import assembler, providers
+from agents.verdict_cache import VerdictCache
+
+class FakeVisionLLM:
+    def __init__(self):
+        self.urls = []
+        self.lock = threading.Lock()
+
+    def invoke(self, messages):
+        url = messages[-1].content[1]["image_url"]["url"]
+        with self.lock:
+            self.urls.append(url)
+        return AIMessage(content=json.dumps({"useful": "banner" not in url}))
+
+def make_groups():
+    return [
+        {"group_id": "g1", "claims": [{"image_url": "https://x/chart.png"}, {"image_url": "https://x/banner.png"}]},
+        {"group_id": "g2", "claims": [{"image_url": "https://x/chart.png"}, {"claim_text": "no image"}]},
+    ]
+
+def test_verdicts_persist_until_image_bytes_change(tmp_path, monkeypatch):
+    hashes = {"https://x/chart.png": "h1", "https://x/banner.png": "h2"}
+    llm = FakeVisionLLM()
+    monkeypatch.setitem(providers.overrides, "image_vetter", llm)
+    monkeypatch.setattr(assembler, "image_content_hash", lambda url: hashes[url])
+    monkeypatch.setattr(assembler, "verdict_cache", VerdictCache(str(tmp_path / "verdicts.sqlite")))
+
+    groups = make_groups()
+    assembler.filter_images(groups)
+    assert sorted(llm.urls) == ["https://x/banner.png", "https://x/chart.png"] # chart vetted once
+    assert groups[0]["claims"][1]["image_url"] is None
+    assert groups[1]["claims"][0]["image_url"] == "https://x/chart.png"
+
+    # New run / new process: answered from disk
+    llm.urls.clear()
+    monkeypatch.setattr(assembler, "verdict_cache", VerdictCache(str(tmp_path / "verdicts.sqlite")))
+    groups = make_groups()
+    assembler.filter_images(groups)
+    assert llm.urls == []
+    assert groups[0]["claims"][1]["image_url"] is None
+
+    # Chart was re-exported: only it is re-vetted
+    hashes["https://x/chart.png"] = "h1-new"
+    assembler.filter_images(make_groups())
+    assert llm.urls == ["https://x/chart.png"]
@@ -0,0 +1,65 @@
+import json
+import os
+from langchain_core.messages import AIMessage
+from agents import assemble2, retriever, reviewer, providers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class CountingLLM:
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=self.reply(messages))
+
+def judge_reply(messages):
+    ids = [line.split("|")[0].replace("ID:", "").strip()
+           for line in messages[-1].content.splitlines() if line.startswith("ID:")]
+    return json.dumps(ids)
+
+def assembler_reply(messages):
+    if messages[0].content == assemble2.NAVBAR_GENERATOR_PROMPT:
+        return json.dumps(json.loads(messages[-1].content.split("Topics:\n", 1)[1]))
+    return json.dumps({"headline": "H", "subhead": "S", "layout_class": "grid-cols-2", "content_blocks": []})
+
+class FakeEmbedder:
+    def embed_documents(self, texts):
+        return [[1.0] for _ in texts]
+
+def make_plan():
+    return [
+        {"slide_id": n, "page_topic": f"Topic {n}", "candidate_queries": [f"g{n}"], "BM25_keywords": []}
+        for n in (1, 2, 3)
+    ]
+
+def test_revision_only_redoes_flagged_slides(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    judge, structurer = CountingLLM(judge_reply), CountingLLM(assembler_reply)
+    review = CountingLLM(lambda m: "Slide 2 repeats slide 1.\nFLAGGED_SLIDES: [2]")
+    monkeypatch.setitem(providers.overrides, "judge", judge)
+    monkeypatch.setattr(retriever, "PREJUDGE_MODE", "off") # count every retrieval as a judge call
+    monkeypatch.setattr(retriever, "ALLOCATION_MODE", "slide")
+    monkeypatch.setitem(providers.overrides, "embeddings", FakeEmbedder())
+    monkeypatch.setattr(retriever, "get_group_candidates", lambda queries, vectors=None: [
+        {"group_id": q, "description": q, "claim_ids": [q + "-c"], "score": 0.9} for q in queries])
+    monkeypatch.setattr(retriever, "get_claims_by_ids", lambda ids: [{"claim_text": cid} for cid in ids])
+    monkeypatch.setitem(providers.overrides, "structurer", structurer)
+    monkeypatch.setitem(providers.overrides, "navbar", structurer)
+    monkeypatch.setitem(providers.overrides, "reviewer", review)
+
+    state = {"query": "q", "deck_plan": make_plan(), "global_used_claims": []}
+    for node in (retriever.retriever_node, assemble2.assembler_node, reviewer.reviewer_node):
+        state.update(node(state))
+    assert (judge.calls, structurer.calls) == (3, 4)
+    assert state["flagged_slides"] == [2]
+
+    # Planner resets the plan; slides 1 and 3 come back with identical specs
+    state.update({"deck_plan": make_plan(), "global_used_claims": []})
+    for node in (retriever.retriever_node, assemble2.assembler_node):
+        state.update(node(state))
+
+    assert (judge.calls, structurer.calls) == (4, 5) # slide 2 only
+    assert [s["selected_content"][0].group_id for s in state["deck_plan"]] == ["g1", "g2", "g3"]
+    assert state["revision_savings"] == {"slides_reused": 2, "llm_calls": 5, "vector_calls": 4}
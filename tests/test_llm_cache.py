@@ -0,0 +1,43 @@
+from langchain_core.language_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from agents import llm_cache
+from agents.llm_cache import AgentResponseCache, ResponseStore
+
+def make_llm(store, agent="judge"):
+    return FakeListChatModel(responses=["first", "second", "third"], cache=AgentResponseCache(store, agent))
+
+def test_identical_prompts_hit_across_instances(tmp_path):
+    store = ResponseStore(str(tmp_path / "llm.sqlite"))
+    messages = [SystemMessage(content="judge"), HumanMessage(content="Topic: FRESCO")]
+
+    llm = make_llm(store)
+    assert llm.invoke(messages).content == "first"
+    assert llm.invoke(messages).content == "first"
+    assert llm.invoke(messages[:1]).content == "second"
+    assert (llm.cache.hits, llm.cache.misses) == (1, 2)
+
+    fresh = make_llm(ResponseStore(str(tmp_path / "llm.sqlite")))
+    response = fresh.invoke(messages)
+    assert response.content == "first"
+    assert response.response_metadata["cache_hit"] is True
+
+def test_ttl_and_size_eviction(tmp_path):
+    store = ResponseStore(str(tmp_path / "llm.sqlite"), ttl=60, max_entries=2)
+    store.put("a", "planner", "[]")
+    store.put("b", "planner", "[]")
+    store.get("a")
+    store.put("c", "planner", "[]") # evicts least recently used "b"
+    assert store.get("b") is None and store.get("a") == "[]"
+
+    store._db().execute("UPDATE responses SET created_at = created_at - 120 WHERE key = 'a'")
+    assert store.get("a") is None
+    assert store.get("c") == "[]"
+
+def test_image_vetter_replies_are_not_cached_by_url(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_PATH", str(tmp_path / "llm.sqlite"))
+    monkeypatch.setattr(llm_cache, "LLM_CACHE_AGENTS", {"all"})
+    monkeypatch.setattr(llm_cache, "_store", None)
+    monkeypatch.setattr(llm_cache, "_caches", {})
+
+    assert llm_cache.get_llm_cache("image_vetter") is None
+    assert llm_cache.get_llm_cache("judge") is not None
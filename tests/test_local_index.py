@@ -0,0 +1,30 @@
+import numpy as np
+from agents import retriever
+from agents.local_index import LocalGroupIndex, write_snapshot
+
+def make_snapshot(path):
+    vectors = np.array([[1.0, 0.0, 0.0], [0.8, 0.6, 0.0], [0.0, 0.0, 1.0]])
+    metadata = [
+        {"id": f"v{i}", "metadata": {"group_id": f"g{i}", "group_description": f"desc {i}", "claims": [f"c{i}"]}}
+        for i in range(3)
+    ]
+    write_snapshot(path, vectors * 3.0, metadata) # unnormalized on purpose
+    return LocalGroupIndex(path)
+
+def test_query_matches_cosine_ranking(tmp_path):
+    index = make_snapshot(str(tmp_path / "groups"))
+    result = index.query(vector=[2.0, 0.0, 0.0], top_k=2, include_metadata=True)
+
+    assert [m.metadata["group_id"] for m in result.matches] == ["g0", "g1"]
+    assert np.isclose(result.matches[0].score, 1.0)
+    assert np.isclose(result.matches[1].score, 0.8)
+
+def test_local_backend_returns_candidate_dicts(tmp_path, monkeypatch):
+    index = make_snapshot(str(tmp_path / "groups"))
+    monkeypatch.setattr(retriever, "get_group_index", lambda: index)
+
+    candidates = retriever.get_group_candidates(["q"], {"q": [1.0, 0.1, 0.0]})
+
+    assert [c["group_id"] for c in candidates] == ["g0", "g1"] # g2 is below the 0.5 threshold
+    assert candidates[0]["description"] == "desc 0"
+    assert candidates[0]["claim_ids"] == ["c0"]
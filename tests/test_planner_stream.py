@@ -0,0 +1,54 @@
+import json
+import os
+import time
+from agents import planner, retriever
+from agents.json_stream import JsonArrayStream
+from benchmarks.fakes import install_fakes
+from graph import build_graph, make_initial_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_array_items_come_out_as_soon_as_they_close():
+    slides = [{"slide_id": 1, "page_topic": 'Braces } and "quotes" [ in text'},
+              {"slide_id": 2, "page_topic": "B", "retrieval_strategy": {"candidate_queries": ["q1", "q2"]}}]
+    text = ("Analysis: the slides array {comes} last.\n```json\n"
+            + json.dumps({"deck_metadata": {"total_slides": 2}, "slides": slides}, indent=2) + "\n```")
+    first_closes = text.index("}", text.index("in text")) + 1
+
+    for size in (1, 7, 64, len(text)):
+        stream = JsonArrayStream("slides")
+        seen = []
+        for i in range(0, len(text), size):
+            seen += stream.feed(text[i:i + size])
+            if i + size >= first_closes and not stream.done:
+                assert seen[:1] == slides[:1] # out with the chunk that closes it, before the array ends
+        assert seen == slides
+        assert stream.done and stream.items == 2 and stream.buffer == text
+
+def test_streaming_planner_starts_retrieval_before_the_plan_is_finished(monkeypatch):
+    monkeypatch.chdir(ROOT)
+    install_fakes(monkeypatch, slides=4, chunk_latency=0.01)
+    search_slide = retriever.search_slide
+    started = []
+    monkeypatch.setattr(retriever, "search_slide",
+                        lambda slide, vectors=None: started.append(time.perf_counter()) or search_slide(slide, vectors))
+
+    results = {}
+    for streaming in (False, True):
+        monkeypatch.setattr(planner, "PLANNER_STREAMING", streaming)
+        started.clear()
+        planned = None
+        for state in build_graph().stream(make_initial_state("Build a 4 slide deck"), stream_mode="values"):
+            if planned is None and state.get("deck_plan"):
+                planned = time.perf_counter()
+        results[streaming] = (planned, list(started), state)
+
+    barrier_planned, barrier_started, barrier_state = results[False]
+    stream_planned, stream_started, stream_state = results[True]
+    assert min(barrier_started) > barrier_planned
+    assert min(stream_started) < stream_planned # first slide searched while the planner was still streaming
+    assert len(stream_started) == len(barrier_started) == 4
+    assert retriever._prefetches == {}
+    selection = lambda state: [[(ref.group_id, ref.claim_ids) for ref in slide["selected_content"]]
+                               for slide in state["deck_plan"]]
+    assert selection(stream_state) == selection(barrier_state)
@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+from langchain_core.messages import AIMessage
+from agents import providers, retriever
+from agents.bm25 import build_group_bm25
+from agents.prejudge import JudgeRecorder, agreement, prejudge
+
+def cands(*scores):
+    return [{"group_id": f"g{i}", "description": f"g{i}", "claim_ids": [], "score": s} for i, s in enumerate(scores)]
+
+def test_rules():
+    assert prejudge(cands(0.6, 0.9)) == (["g1", "g0"], "count")
+    assert prejudge(cands(0.9, 0.88, 0.86, 0.6, 0.55)) == (["g0", "g1", "g2"], "margin")
+    assert prejudge(cands(0.9, 0.88, 0.86, 0.84)) == (None, None)
+    assert prejudge(cands(0.9, 0.88, 0.86, 0.84), min_margin=0.01) == (["g0", "g1", "g2"], "margin")
+    assert prejudge(cands(0.9, 0.8), max_candidates=1) == (None, None) # pick 3 needs a 4th score
+    assert prejudge(cands(0.8, 0.79, 0.78, None, None)) == (None, None) # lexical-only hits need the judge
+    assert agreement(["a", "b"], ["b", "c"]) == 1 / 3
+
+class CountingJudge:
+    calls = 0
+
+    def invoke(self, messages):
+        self.calls += 1
+        return AIMessage(content=json.dumps(["g0"]))
+
+def test_only_ambiguous_slides_reach_the_judge(monkeypatch, tmp_path):
+    judge = CountingJudge()
+    monkeypatch.setitem(providers.overrides, "judge", judge)
+    monkeypatch.setattr(retriever, "PREJUDGE_MODE", "on")
+    scores = {"clear": cands(0.9, 0.7), "close": cands(0.9, 0.89, 0.88, 0.87)}
+    monkeypatch.setattr(retriever, "get_group_candidates", lambda queries, vectors=None: scores[queries[0]])
+
+    clear = retriever.search_and_judge({"page_topic": "A", "candidate_queries": ["clear"]})
+    close = retriever.search_and_judge({"page_topic": "B", "candidate_queries": ["close"]})
+    assert (clear["prejudge"], clear["selected_ids"]) == ("count", ["g0", "g1"])
+    assert (close["prejudge"], close["selected_ids"]) == (None, ["g0"])
+    assert judge.calls == 1
+
+    # Shadow mode still asks the judge, and records both answers for comparison
+    monkeypatch.setattr(retriever, "PREJUDGE_MODE", "shadow")
+    monkeypatch.setattr(retriever, "judge_recorder", JudgeRecorder(str(tmp_path / "judge.jsonl")))
+    shadow = retriever.search_and_judge({"page_topic": "A", "candidate_queries": ["clear"]})
+    assert shadow["selected_ids"] == ["g0"] and judge.calls == 2
+    record = json.loads((tmp_path / "judge.jsonl").read_text())
+    assert (record["judge"], record["prejudge"], record["rule"]) == (["g0"], ["g0", "g1"], "count")
+
+def test_hybrid_lexical_only_hits_reach_the_judge(monkeypatch):
+    judge = CountingJudge()
+    monkeypatch.setitem(providers.overrides, "judge", judge)
+    monkeypatch.setattr(retriever, "PREJUDGE_MODE", "on")
+    monkeypatch.setattr(retriever, "RETRIEVAL_MODE", "hybrid")
+    group_index = SimpleNamespace(metadata=[
+        {"group_id": f"g{i}", "group_description": desc, "claims": []}
+        for i, desc in enumerate(["Overall survival", "Safety", "Dosing", "FRESCO-2 design", "FRESCO-2 endpoints"])
+    ])
+    monkeypatch.setattr(retriever, "_bm25", build_group_bm25(group_index))
+    monkeypatch.setattr(retriever, "get_group_candidates", lambda queries, vectors=None: cands(0.8, 0.79, 0.78))
+
+    result = retriever.search_and_judge({"page_topic": "A", "candidate_queries": ["q"], "BM25_keywords": ["FRESCO-2"]})
+
+    assert {"g3", "g4"} <= {c["group_id"] for c in result["candidates"]}
+    assert result["prejudge"] is None and judge.calls == 1
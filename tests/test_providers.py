@@ -0,0 +1,25 @@
+import os
+import subprocess
+import sys
+from agents import providers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_importing_graph_does_not_build_clients():
+    code = "import sys, graph; print('langchain_openai' in sys.modules, 'pinecone' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    assert out.split() == ["False", "False"]
+
+def test_clients_are_shared_and_overridable(monkeypatch):
+    built = []
+    monkeypatch.setattr(providers, "_instances", {})
+    monkeypatch.setattr(providers, "_pinecone_client", lambda: built.append(1) or object())
+    assert providers.get_pinecone() is providers.get_pinecone()
+    assert len(built) == 1
+
+    fake = object()
+    monkeypatch.setitem(providers.overrides, "llm", fake)
+    assert providers.get_llm("judge") is fake
+    monkeypatch.setitem(providers.overrides, "judge", "judge-only")
+    assert providers.get_llm("judge") == "judge-only"
+    assert providers.get_llm("planner") is fake
@@ -0,0 +1,48 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from langchain_core.messages import HumanMessage
+from langchain_openai import ChatOpenAI
+from agents import rate_limit
+from agents.rate_limit import LLMRateLimiter, RateLimitedTransport
+from benchmarks.fakes import FakeOpenAIServer
+
+def test_token_budget_paces_requests():
+    limiter = LLMRateLimiter(rpm=1000, tpm=100, period=1.0)
+    limiter.acquire(60)
+    limiter.release(0.0, 60, used_tokens=60)
+    t0 = time.perf_counter()
+    limiter.acquire(60) # needs 20 more tokens at 100/s
+    assert time.perf_counter() - t0 >= 0.15
+
+def test_backs_off_on_429_and_completes_every_call():
+    with FakeOpenAIServer(rpm=1000, max_concurrency=2, latency=0.03, window=1.0) as server:
+        limiter = LLMRateLimiter(1000, 10 ** 6, max_concurrency=8, period=1.0, cooldown=0.1)
+        client = httpx.Client(transport=RateLimitedTransport(httpx.HTTPTransport(), limiter, max_retries=10))
+        llm = ChatOpenAI(model="gpt-5.2", api_key="test", base_url=server.base_url, http_client=client, max_retries=0)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            replies = list(pool.map(lambda i: llm.invoke([HumanMessage(content=f"call {i}")]).content, range(24)))
+
+    metrics = limiter.metrics()
+    assert replies == ["OK"] * 24
+    assert server.accepted == 24
+    assert metrics["throttled"] == server.rejected > 0
+    assert metrics["backoffs"] >= 1
+    assert metrics["service_time"]["mean"] > 0
+
+def test_retries_server_and_connection_errors(monkeypatch):
+    monkeypatch.setattr(rate_limit, "retry_delay", lambda response, attempt: 0.0)
+    replies = [httpx.Response(503), httpx.ConnectError("reset"), httpx.Response(200, json={"ok": True})]
+
+    def flaky(request):
+        reply = replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    limiter = LLMRateLimiter(1000, 10 ** 6, period=1.0)
+    client = httpx.Client(transport=RateLimitedTransport(httpx.MockTransport(flaky), limiter))
+    response = client.post("https://api.test/v1/chat/completions", json={"messages": []})
+
+    assert response.status_code == 200 and replies == []
+    assert limiter.metrics()["errors"] == 2 and limiter.metrics()["backoffs"] == 0
@@ -0,0 +1,61 @@
+import copy
+import json
+import time
+from langchain_core.messages import AIMessage
+from agents import retriever, providers
+from agents.artifacts import load_messages
+
+GROUPS = {
+    "g1": ["c1", "c2"],
+    "g2": ["c3"],
+    "g3": ["c4"],
+    "g4": [],
+}
+
+class FakeJudge:
+    """Always picks g1 + the slide's own group, so slides compete for g1."""
+    def invoke(self, messages):
+        time.sleep(0.01)
+        ids = [line.split("|")[0].replace("ID:", "").strip()
+               for line in messages[-1].content.splitlines() if line.startswith("ID:")]
+        return AIMessage(content=json.dumps(ids))
+
+class FakeEmbedder:
+    def embed_documents(self, texts):
+        return [[float(len(t))] for t in texts]
+
+def fake_candidates(queries, vectors=None):
+    time.sleep(0.01)
+    return [{"group_id": gid, "description": gid, "claim_ids": GROUPS[gid], "score": 0.9}
+            for gid in queries]
+
+def fake_claims(claim_ids):
+    return [{"claim_text": cid} for cid in claim_ids]
+
+def make_state():
+    plan = [
+        {"slide_id": 1, "page_topic": "A", "candidate_queries": ["g1", "g2"]},
+        {"slide_id": 2, "page_topic": "B", "candidate_queries": ["g1", "g3"]},
+        {"slide_id": 3, "page_topic": "C", "candidate_queries": ["g4"]},
+        {"slide_id": 4, "page_topic": "D", "candidate_queries": []},
+    ]
+    return {"deck_plan": plan, "global_used_claims": ["g3"]}
+
+def test_concurrent_matches_serial(monkeypatch):
+    monkeypatch.setitem(providers.overrides, "judge", FakeJudge())
+    monkeypatch.setitem(providers.overrides, "embeddings", FakeEmbedder())
+    monkeypatch.setattr(retriever, "get_group_candidates", fake_candidates)
+    monkeypatch.setattr(retriever, "get_claims_by_ids", fake_claims)
+    monkeypatch.setattr(retriever, "ALLOCATION_MODE", "slide") # first-come dedup is what slide order pins
+
+    serial = retriever.retriever_node({**make_state(), "retriever_max_workers": 1})
+    concurrent = retriever.retriever_node({**make_state(), "retriever_max_workers": 4})
+
+    assert concurrent["deck_plan"] == serial["deck_plan"]
+    assert concurrent["global_used_claims"] == serial["global_used_claims"] == ["g3", "g1", "g2"]
+    assert [m.content for m in load_messages(concurrent["retriever_messages_ref"])] == \
+        [m.content for m in load_messages(serial["retriever_messages_ref"])]
+
+    timings = concurrent["retriever_timings"]
+    assert [t["slide_id"] for t in timings] == [1, 2, 3, 4]
+    assert all(t["total"] >= t["search"] for t in timings)
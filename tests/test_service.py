@@ -0,0 +1,36 @@
+import json
+import queue
+import threading
+import urllib.error
+import urllib.request
+import pytest
+from benchmarks.fakes import install_fakes
+from service import DeckService, serve
+
+def test_service_returns_html_and_node_timings(monkeypatch):
+    log = install_fakes(monkeypatch, slides=3)
+    service = DeckService(workers=1, queue_size=2)
+    server = serve(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_address[1]}/decks",
+            data=json.dumps({"query": "Build a 3 slide deck"}).encode("utf-8")
+        )
+        with urllib.request.urlopen(request) as response:
+            body = json.loads(response.read())
+    finally:
+        server.shutdown()
+        service.shutdown()
+
+    assert body["html"].count('class="slide-container"') == 3
+    assert [t["node"] for t in body["timings"]] == ["planner", "retriever", "assembler", "reviewer"]
+    assert body["queue_wait"] >= 0
+    assert log.calls["planner"] == 1
+    assert service.stats()["completed"] == 1
+
+def test_full_queue_rejects_submissions():
+    service = DeckService(workers=0, queue_size=1) # no workers, so nothing drains
+    service.submit("first")
+    with pytest.raises(queue.Full):
+        service.submit("second")
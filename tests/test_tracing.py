@@ -0,0 +1,41 @@
+import json
+import os
+from agents import tracing
+from benchmarks.fakes import install_fakes
+from graph import build_graph, make_initial_state
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_spans_cover_nodes_and_external_calls(monkeypatch, tmp_path):
+    monkeypatch.chdir(ROOT)
+    install_fakes(monkeypatch, slides=2)
+    tracing.start()
+    try:
+        build_graph().invoke(make_initial_state("Build a 2 slide deck"))
+    finally:
+        tracer = tracing.stop()
+
+    records = tracer.records()
+    by_name = {r["name"]: r for r in records}
+    nodes = [r["name"] for r in records if r["category"] == "node"]
+    assert nodes == ["planner", "retriever", "assembler", "reviewer"]
+    assert {"llm.planner", "llm.judge", "llm.structurer", "llm.reviewer",
+            "embeddings.embed_documents", "content-gen-group-index.query", "assembler.render"} <= set(by_name)
+
+    judge = by_name["llm.judge"]
+    assert judge["input_tokens"] > 0 and judge["payload_bytes"] > 0 and judge["cache_hit"] is False
+    retriever_id = by_name["retriever"]["id"]
+    assert all(r["parent_id"] == retriever_id for r in records if r["name"] == "llm.judge") # across pool threads
+
+    tracing.write_jsonl(tracer, str(tmp_path / "trace.jsonl"))
+    tracing.write_chrome_trace(tracer, str(tmp_path / "trace.json"))
+    lines = (tmp_path / "trace.jsonl").read_text().splitlines()
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    assert len(lines) == len(events) == len(records)
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+def test_span_is_a_no_op_when_tracing_is_off():
+    assert not tracing.enabled()
+    with tracing.span("anything") as s:
+        s.set(tokens=1)
+    assert s is tracing.NULL_SPAN